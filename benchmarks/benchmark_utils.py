@@ -0,0 +1,15 @@
+import pybamm
+
+
+def get_var_pts(npts):
+    """Number of points in each spatial variable, with `npts` in the main domains"""
+    var = pybamm.standard_spatial_vars
+    return {
+        var.x_n: npts,
+        var.x_s: npts,
+        var.x_p: npts,
+        var.r_n: npts,
+        var.r_p: npts,
+        var.y: 10,
+        var.z: 10,
+    }
@@ -0,0 +1,62 @@
+import pybamm
+
+from benchmarks.benchmark_utils import get_var_pts
+
+
+def get_experiment(n_cycles):
+    return pybamm.Experiment(
+        [
+            (
+                "Discharge at 1C until 3.3 V",
+                "Charge at 0.5C until 4.1 V",
+                "Hold at 4.1 V until 50 mA",
+            )
+        ]
+        * n_cycles
+    )
+
+
+class MemSolveLongExperiment:
+    # number of cycles, number of points in each domain
+    params = [[10, 50], [10, 20]]
+    param_names = ["n_cycles", "npts"]
+
+    def setup(self, n_cycles, npts):
+        self.sim = pybamm.Simulation(
+            pybamm.lithium_ion.SPMe(),
+            experiment=get_experiment(n_cycles),
+            parameter_values=pybamm.ParameterValues(
+                chemistry=pybamm.parameter_sets.Chen2020
+            ),
+            var_pts=get_var_pts(npts),
+        )
+        self.sim.build_for_experiment()
+
+    def peakmem_solve_long_experiment(self, n_cycles, npts):
+        self.sim.solve(calc_esoh=False)
+
+
+class MemProcessLongSolution:
+    # number of cycles, number of points in each domain
+    params = [[10, 50], [10, 20]]
+    param_names = ["n_cycles", "npts"]
+
+    def setup(self, n_cycles, npts):
+        sim = pybamm.Simulation(
+            pybamm.lithium_ion.SPMe(),
+            experiment=get_experiment(n_cycles),
+            parameter_values=pybamm.ParameterValues(
+                chemistry=pybamm.parameter_sets.Chen2020
+            ),
+            var_pts=get_var_pts(npts),
+        )
+        self.solution = sim.solve(calc_esoh=False)
+
+    def peakmem_process_variables(self, n_cycles, npts):
+        for name in [
+            "Terminal voltage [V]",
+            "Electrolyte concentration [mol.m-3]",
+            "Negative particle surface concentration [mol.m-3]",
+        ]:
+            self.solution._variables.pop(name, None)
+            self.solution[name]
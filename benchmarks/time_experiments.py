@@ -0,0 +1,63 @@
+import pybamm
+
+from benchmarks.benchmark_utils import get_var_pts
+
+
+class TimeRunExperiment:
+    # model, number of points in each domain
+    params = [["SPM", "DFN"], [10, 20, 40]]
+    param_names = ["model", "npts"]
+
+    def setup(self, model, npts):
+        self.model = getattr(pybamm.lithium_ion, model)()
+        self.param = pybamm.ParameterValues(chemistry=pybamm.parameter_sets.Chen2020)
+        self.experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C until 2.5 V",
+                    "Rest for 10 minutes",
+                    "Charge at 1C until 4.2 V",
+                    "Hold at 4.2 V until C/20",
+                    "Rest for 10 minutes",
+                )
+            ]
+            * 5
+        )
+        self.var_pts = get_var_pts(npts)
+
+    def time_run_experiment(self, model, npts):
+        sim = pybamm.Simulation(
+            self.model,
+            parameter_values=self.param,
+            experiment=self.experiment,
+            var_pts=self.var_pts,
+        )
+        sim.solve(calc_esoh=False)
+
+    def time_run_experiment_with_esoh(self, model, npts):
+        sim = pybamm.Simulation(
+            self.model,
+            parameter_values=self.param,
+            experiment=self.experiment,
+            var_pts=self.var_pts,
+        )
+        sim.solve()
+
+
+class TimeSolveExperiment:
+    # number of points in each domain
+    params = [10, 20, 40]
+    param_names = ["npts"]
+
+    def setup(self, npts):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C until 3.3 V", "Charge at C/3 until 4.1 V")] * 10
+        )
+        self.sim = pybamm.Simulation(
+            pybamm.lithium_ion.SPMe(), experiment=experiment, var_pts=get_var_pts(npts)
+        )
+        # build the models and set up the solver before timing
+        self.sim.solve(calc_esoh=False)
+
+    def time_solve_experiment(self, npts):
+        self.sim.solve(calc_esoh=False)
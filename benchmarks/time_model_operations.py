@@ -0,0 +1,66 @@
+import casadi
+import numpy as np
+import pybamm
+
+from benchmarks.benchmark_utils import get_var_pts
+
+
+class TimeProcessModel:
+    # model
+    params = ["SPM", "SPMe", "DFN"]
+    param_names = ["model"]
+
+    def setup(self, model):
+        self.model = getattr(pybamm.lithium_ion, model)()
+        self.param = pybamm.ParameterValues(chemistry=pybamm.parameter_sets.Marquis2019)
+
+    def time_process_model(self, model):
+        # Use a copy, so that the processed symbols are not cached between runs
+        self.param.copy().process_model(self.model, inplace=False)
+
+
+class TimeDiscretiseModel:
+    # model, number of points in each domain
+    params = [["SPM", "SPMe", "DFN"], [10, 20, 40, 80]]
+    param_names = ["model", "npts"]
+
+    def setup(self, model, npts):
+        self.model = getattr(pybamm.lithium_ion, model)()
+        param = pybamm.ParameterValues(chemistry=pybamm.parameter_sets.Marquis2019)
+        self.model_with_set_params = param.process_model(self.model, inplace=False)
+        geometry = self.model.default_geometry
+        param.process_geometry(geometry)
+        self.mesh = pybamm.Mesh(
+            geometry, self.model.default_submesh_types, get_var_pts(npts)
+        )
+
+    def time_discretise_model(self, model, npts):
+        disc = pybamm.Discretisation(self.mesh, self.model.default_spatial_methods)
+        disc.process_model(self.model_with_set_params, inplace=False)
+
+
+class TimeJacobian:
+    # model, number of points in each domain
+    params = [["SPM", "SPMe", "DFN"], [10, 20, 40, 80]]
+    param_names = ["model", "npts"]
+
+    def setup(self, model, npts):
+        sim = pybamm.Simulation(
+            getattr(pybamm.lithium_ion, model)(), var_pts=get_var_pts(npts)
+        )
+        sim.build()
+        self.model = sim.built_model
+        n = np.size(self.model.concatenated_initial_conditions)
+        self.y = pybamm.StateVector(slice(0, n))
+        self.t_casadi = casadi.MX.sym("t")
+        self.y_casadi = casadi.MX.sym("y", n)
+
+    def time_jacobian(self, model, npts):
+        jacobian = pybamm.Jacobian()
+        jacobian.jac(self.model.concatenated_rhs, self.y)
+        jacobian.jac(self.model.concatenated_algebraic, self.y)
+
+    def time_jacobian_and_convert_to_casadi(self, model, npts):
+        jacobian = pybamm.Jacobian()
+        jac = jacobian.jac(self.model.concatenated_rhs, self.y)
+        jac.to_casadi(self.t_casadi, self.y_casadi)
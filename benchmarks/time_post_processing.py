@@ -0,0 +1,47 @@
+import pybamm
+import numpy as np
+
+from benchmarks.benchmark_utils import get_var_pts
+
+
+class TimeProcessVariable:
+    # number of points in each domain
+    params = [10, 20, 40]
+    param_names = ["npts"]
+
+    def setup(self, npts):
+        sim = pybamm.Simulation(pybamm.lithium_ion.DFN(), var_pts=get_var_pts(npts))
+        self.solution = sim.solve(np.linspace(0, 3600, 1000))
+
+    def _process(self, name):
+        # Clear the cache, so that the variable is processed every time
+        self.solution._variables.pop(name, None)
+        return self.solution[name]
+
+    def time_process_0D_variable(self, npts):
+        self._process("Terminal voltage [V]")
+
+    def time_process_1D_variable(self, npts):
+        self._process("Electrolyte concentration [mol.m-3]")
+
+    def time_process_2D_variable(self, npts):
+        self._process("Negative particle concentration [mol.m-3]")
+
+
+class TimeProcessVariableExperiment:
+    # number of points in each domain
+    params = [10, 20, 40]
+    param_names = ["npts"]
+
+    def setup(self, npts):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C until 3.3 V", "Charge at C/3 until 4.1 V")] * 20
+        )
+        sim = pybamm.Simulation(
+            pybamm.lithium_ion.SPMe(), experiment=experiment, var_pts=get_var_pts(npts)
+        )
+        self.solution = sim.solve(calc_esoh=False)
+
+    def time_process_variable_many_sub_solutions(self, npts):
+        self.solution._variables.pop("Electrolyte concentration [mol.m-3]", None)
+        self.solution["Electrolyte concentration [mol.m-3]"]
@@ -0,0 +1,78 @@
+import pybamm
+import numpy as np
+
+from benchmarks.benchmark_utils import get_var_pts
+
+
+def build_model(model, npts, convert_to_format="casadi"):
+    model = getattr(pybamm.lithium_ion, model)()
+    model.convert_to_format = convert_to_format
+    param = model.default_parameter_values
+    param["Current function [A]"] = "[input]"
+    sim = pybamm.Simulation(model, parameter_values=param, var_pts=get_var_pts(npts))
+    sim.build()
+    return sim.built_model
+
+
+class TimeSolveIDAKLU:
+    # model, number of points in each domain
+    params = [["SPM", "SPMe", "DFN"], [10, 20, 40]]
+    param_names = ["model", "npts"]
+
+    def setup(self, model, npts):
+        if not pybamm.have_idaklu():
+            raise NotImplementedError
+        self.model = build_model(model, npts)
+        self.solver = pybamm.IDAKLUSolver()
+        self.t_eval = np.linspace(0, 3600, 100)
+        self.inputs = {"Current function [A]": 0.68}
+        # set up the model before timing
+        self.solver.solve(self.model, self.t_eval, inputs=self.inputs)
+
+    def time_solve(self, model, npts):
+        self.solver.solve(self.model, self.t_eval, inputs=self.inputs)
+
+
+class TimeSolveJax:
+    # model, number of points in each domain
+    params = [["SPM", "SPMe"], [10, 20, 40]]
+    param_names = ["model", "npts"]
+
+    def setup(self, model, npts):
+        if not hasattr(pybamm, "JaxSolver"):
+            raise NotImplementedError
+        self.model = build_model(model, npts, convert_to_format="jax")
+        # The jax solver does not support events
+        self.model.events = []
+        self.solver = pybamm.JaxSolver(method="BDF")
+        self.t_eval = np.linspace(0, 3600, 100)
+        self.inputs = {"Current function [A]": 0.68}
+        # compile before timing
+        self.solver.solve(self.model, self.t_eval, inputs=self.inputs)
+
+    def time_solve(self, model, npts):
+        self.solver.solve(self.model, self.t_eval, inputs=self.inputs)
+
+
+class TimeSolveMultipleInputs:
+    # solver, number of points in each domain
+    params = [["casadi", "casadi batched"], [10, 20, 40]]
+    param_names = ["solver", "npts"]
+
+    def setup(self, solver, npts):
+        self.model = build_model("SPMe", npts)
+        if solver == "casadi":
+            self.solver = pybamm.CasadiSolver(mode="fast")
+        else:
+            self.solver = pybamm.CasadiSolver(
+                mode="fast", batch_parallelisation="serial"
+            )
+        self.t_eval = np.linspace(0, 3600, 100)
+        self.inputs = [
+            {"Current function [A]": current} for current in np.linspace(0.1, 1, 20)
+        ]
+        # set up the model before timing
+        self.solver.solve(self.model, self.t_eval, inputs=self.inputs[0])
+
+    def time_solve_multiple_inputs(self, solver, npts):
+        self.solver.solve(self.model, self.t_eval, inputs=self.inputs, nproc=1)
@@ -64,10 +64,11 @@ PARAMETER_PATH = [
 #
 # Utility classes and methods
 #
-from .util import Timer, TimerTime, FuzzyDict
+from .util import Timer, TimerTime, FuzzyDict, LazyFuzzyDict
 from .util import root_dir, load_function, rmse, get_infinite_nested_dict, load
 from .util import get_parameters_filepath
 from .logger import logger, set_logging_level
+from .profiler import Profiler, Span, profiler
 from .settings import settings
 from .citations import Citations, citations, print_citations
 
@@ -101,6 +102,11 @@ from .expression_tree.operations.evaluate_python import (
     to_python,
     EvaluatorPython,
 )
+from .expression_tree.operations.evaluate_numba import (
+    NumbaCodeGenerator,
+    EvaluatorNumba,
+    have_numba,
+)
 
 if not (
     platform.system() == "Windows"
@@ -113,6 +119,7 @@ from .expression_tree.operations.jacobian import Jacobian
 from .expression_tree.operations.convert_to_casadi import CasadiConverter
 from .expression_tree.operations.unpack_symbols import SymbolUnpacker
 from .expression_tree.operations.replace_symbols import SymbolReplacer
+from .expression_tree.operations.symbol_table import SymbolTable, symbol_table
 
 #
 # Model classes
@@ -214,10 +221,19 @@ from .spatial_methods.scikit_finite_element import ScikitFiniteElement
 #
 # Solver classes
 #
-from .solvers.solution import Solution, make_cycle_solution
+from .solvers.solution import (
+    Solution,
+    make_cycle_solution,
+    make_cycle_solutions,
+    get_batched_cycle_summary_variables,
+    load_compact,
+)
+from .solvers.solution_builder import SolutionBuilder
+from .solvers.solution_store import SolutionStore
 from .solvers.processed_variable import ProcessedVariable
 from .solvers.processed_symbolic_variable import ProcessedSymbolicVariable
 from .solvers.base_solver import BaseSolver
+from .solvers.casadi_compiler import CasadiCompiler, casadi_compiler
 from .solvers.dummy_solver import DummySolver
 from .solvers.algebraic_solver import AlgebraicSolver
 from .solvers.casadi_solver import CasadiSolver
@@ -235,6 +251,8 @@ if not (
     from .solvers.jax_bdf_solver import jax_bdf_integrate
 
 from .solvers.idaklu_solver import IDAKLUSolver, have_idaklu
+from .solvers.solver_pool import SolverPool
+from .solvers.batch_stepper import BatchStepper
 
 #
 # Experiments
@@ -268,6 +286,11 @@ from .simulation import Simulation, load_sim, is_notebook
 #
 from .batch_study import BatchStudy
 
+#
+# Model cache
+#
+from .model_cache import ModelCache
+
 #
 # Remove any imported modules, so we don't expose them as part of pybamm
 #
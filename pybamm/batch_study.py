@@ -1,9 +1,13 @@
 #
 # BatchStudy class
 #
-import pybamm
+import concurrent.futures
+import os
+import tempfile
 from itertools import product
 
+import pybamm
+
 
 class BatchStudy:
     """
@@ -106,13 +110,67 @@ class BatchStudy:
         calc_esoh=True,
         starting_solution=None,
         initial_soc=None,
+        executor=None,
+        max_workers=None,
+        checkpoint_dir=None,
         **kwargs,
     ):
         """
         For more information on the parameters used in the solve,
         See :meth:`pybamm.Simulation.solve`
+
+        If a list of inputs is passed (as the `inputs` keyword argument), each
+        simulation returns a list of solutions. These can be solved in parallel by
+        also passing a :class:`pybamm.SolverPool` as the `pool` keyword argument; the
+        same pool is reused for all the simulations.
+
+        Combinations that only differ in their solver or output variables share the
+        same built model, which is only built once. The simulations are stored in
+        `self.sims`, in the same order as the combinations.
+
+        Parameters
+        ----------
+        executor : str, optional
+            How to run the combinations: "serial" (default, one after the other in
+            this process), "thread" (in a pool of threads) or "process" (in a pool of
+            worker processes). Combinations that share a built model are always run
+            by the same worker, one after the other. Simulations are pickled to be
+            sent back from the worker processes, so the "process" executor cannot be
+            used with models in the "python" format.
+        max_workers : int, optional
+            Number of workers for the "thread" and "process" executors. Default is
+            the number of CPUs. (`nproc` is passed on to
+            :meth:`pybamm.BaseSolver.solve`, to solve a list of inputs in parallel.)
+        checkpoint_dir : str, optional
+            If given, each simulation is saved to this directory (with
+            :meth:`pybamm.Simulation.save`) as soon as it has been solved, under a
+            key calculated from the content of its combination and of the solve
+            arguments (see :meth:`pybamm.ModelCache.key`). Simulations that are
+            already in the directory are loaded instead of being solved again, so
+            that an interrupted batch can be resumed by calling `solve` again with
+            the same arguments.
         """
-        self.sims = []
+        if executor is None:
+            executor = "serial"
+        if executor not in ["serial", "thread", "process"]:
+            raise ValueError(
+                "executor must be 'serial', 'thread' or 'process', not "
+                "'{}'".format(executor)
+            )
+        if executor != "serial" and kwargs.get("pool") is not None:
+            raise ValueError("A pool can only be used with the 'serial' executor")
+        if executor == "process":
+            for model in self.models.values():
+                if model.convert_to_format == "python":
+                    # Simulations with models in the 'python' format can't be pickled
+                    raise ValueError(
+                        "The 'process' executor cannot be used with models in the "
+                        "'python' format (model '{}'). Set model.convert_to_format "
+                        "= 'casadi' or use the 'thread' executor instead.".format(
+                            model.name
+                        )
+                    )
+
         iter_func = product if self.permutations else zip
 
         # Instantiate items in INPUT_LIST based on the value of self.permutations
@@ -126,49 +184,80 @@ class BatchStudy:
                 inp_value = [None] * len(self.models)
             inp_values.append(inp_value)
 
-        for (
-            model,
-            experiment,
-            geometry,
-            parameter_value,
-            submesh_type,
-            var_pt,
-            spatial_method,
-            solver,
-            output_variable,
-            C_rate,
-        ) in iter_func(self.models.values(), *inp_values):
-            sim = pybamm.Simulation(
-                model,
-                experiment=experiment,
-                geometry=geometry,
-                parameter_values=parameter_value,
-                submesh_types=submesh_type,
-                var_pts=var_pt,
-                spatial_methods=spatial_method,
-                solver=solver,
-                output_variables=output_variable,
-                C_rate=C_rate,
+        combinations = [
+            dict(zip(["model"] + self.INPUT_LIST, combination))
+            for combination in iter_func(self.models.values(), *inp_values)
+        ]
+        solve_args = {
+            "t_eval": t_eval,
+            "solver": solver,
+            "check_model": check_model,
+            "save_at_cycles": save_at_cycles,
+            "calc_esoh": calc_esoh,
+            "starting_solution": starting_solution,
+            "initial_soc": initial_soc,
+            **kwargs,
+        }
+
+        sims = [None] * len(combinations)
+        paths = [None] * len(combinations)
+        if checkpoint_dir is not None:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            cache = pybamm.ModelCache(checkpoint_dir)
+            args_key = cache.key(
+                {k: v for k, v in solve_args.items() if k != "pool"}, self.repeats
             )
-            # Repeat to get average solve time and integration time
-            solve_time = 0
-            integration_time = 0
-            for _ in range(self.repeats):
-                sol = sim.solve(
-                    t_eval,
-                    solver,
-                    check_model,
-                    save_at_cycles,
-                    calc_esoh,
-                    starting_solution,
-                    initial_soc,
-                    **kwargs,
+            # Objects are shared between combinations, so only calculate the key of
+            # each object once
+            object_keys = {}
+            for i, combination in enumerate(combinations):
+                keys = []
+                for value in combination.values():
+                    if id(value) not in object_keys:
+                        object_keys[id(value)] = cache.key(value)
+                    keys.append(object_keys[id(value)])
+                key = cache.key(keys, args_key)
+                paths[i] = os.path.join(checkpoint_dir, key + ".pkl")
+                sims[i] = _load_checkpoint(paths[i])
+
+        # Group the combinations that can share a built model
+        groups = {}
+        for i, combination in enumerate(combinations):
+            if sims[i] is None:
+                build_key = tuple(
+                    id(value)
+                    for name, value in combination.items()
+                    if name not in ["solvers", "output_variables"]
                 )
-                solve_time += sol.solve_time
-                integration_time += sol.integration_time
-            sim.solution.solve_time = solve_time / self.repeats
-            sim.solution.integration_time = integration_time / self.repeats
-            self.sims.append(sim)
+                groups.setdefault(build_key, []).append(
+                    (i, combination, paths[i])
+                )
+        pybamm.logger.info(
+            "Solving {} of {} combinations ({} to build)".format(
+                sum(sim is None for sim in sims), len(sims), len(groups)
+            )
+        )
+
+        tasks = [
+            (group, self.repeats, solve_args, executor) for group in groups.values()
+        ]
+        if executor == "serial" or len(tasks) <= 1:
+            for task in tasks:
+                for i, sim in _solve_group(*task):
+                    sims[i] = sim
+        else:
+            if executor == "thread":
+                pool_executor = concurrent.futures.ThreadPoolExecutor
+            else:
+                pool_executor = concurrent.futures.ProcessPoolExecutor
+            max_workers = min(max_workers or os.cpu_count(), len(tasks))
+            with pool_executor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_solve_group, *task) for task in tasks]
+                for future in concurrent.futures.as_completed(futures):
+                    for i, sim in future.result():
+                        sims[i] = sim
+
+        self.sims = sims
 
     def plot(self, output_variables=None, **kwargs):
         """
@@ -179,3 +268,98 @@ class BatchStudy:
             self.sims, output_variables=output_variables, **kwargs
         )
         return self.quick_plot
+
+
+def _solve_group(group, repeats, solve_args, executor):
+    """
+    Solve the combinations in `group` one after the other, building the model only
+    for the first one. Returns a list of (index, simulation) pairs.
+    """
+    results = []
+    built_sim = None
+    for i, combination, path in group:
+        solver = combination["solvers"]
+        args = solve_args.copy()
+        if executor == "thread":
+            # Solvers store the models that they have set up, so each thread
+            # needs its own copies
+            if solver is not None:
+                solver = solver.copy()
+            if args["solver"] is not None:
+                args["solver"] = args["solver"].copy()
+        sim = pybamm.Simulation(
+            combination["model"],
+            experiment=combination["experiments"],
+            geometry=combination["geometries"],
+            parameter_values=combination["parameter_values"],
+            submesh_types=combination["submesh_types"],
+            var_pts=combination["var_pts"],
+            spatial_methods=combination["spatial_methods"],
+            solver=solver,
+            output_variables=combination["output_variables"],
+            C_rate=combination["C_rates"],
+        )
+        if built_sim is not None:
+            _share_built_model(built_sim, sim)
+
+        # Repeat to get average solve time and integration time
+        solve_time = 0
+        integration_time = 0
+        for _ in range(repeats):
+            sol = sim.solve(**args)
+            sols = sol if isinstance(sol, list) else [sol]
+            solve_time += sum(s.solve_time for s in sols) / len(sols)
+            integration_time += sum(s.integration_time for s in sols) / len(sols)
+        sols = sim.solution if isinstance(sim.solution, list) else [sim.solution]
+        for sol in sols:
+            sol.solve_time = solve_time / repeats
+            sol.integration_time = integration_time / repeats
+
+        if path is not None:
+            _save_checkpoint(sim, path)
+        if executor == "process":
+            # The simulation is pickled to be sent back to the main process
+            sim._clear_unpicklable_attributes()
+        built_sim = built_sim or sim
+        results.append((i, sim))
+    return results
+
+
+def _share_built_model(built_sim, sim):
+    """Use the model (or models, for an experiment) built by `built_sim` in `sim`"""
+    sim._model_with_set_params = built_sim._model_with_set_params
+    sim._built_model = built_sim._built_model
+    sim._built_initial_soc = built_sim._built_initial_soc
+    sim.op_conds_to_built_models = built_sim.op_conds_to_built_models
+    sim._built_initial_conditions = built_sim._built_initial_conditions
+    sim._mesh = built_sim._mesh
+    sim._disc = built_sim._disc
+
+
+def _save_checkpoint(sim, path):
+    """Save `sim` to `path`, replacing the file in one step once it is written"""
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        sim.save(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        pybamm.logger.warning("Could not save checkpoint '{}' ({})".format(path, e))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_checkpoint(path):
+    """Load the simulation saved at `path`, or return None if it cannot be loaded"""
+    if not os.path.exists(path):
+        return None
+    try:
+        sim = pybamm.load(path)
+    except Exception as e:
+        pybamm.logger.warning(
+            "Ignoring unreadable checkpoint '{}' ({})".format(path, e)
+        )
+        return None
+    pybamm.logger.info("Loaded simulation from checkpoint '{}'".format(path))
+    return sim
@@ -1,6 +1,7 @@
 #
 # Interface for discretisation
 #
+import copy
 import pybamm
 import numpy as np
 from collections import defaultdict, OrderedDict
@@ -64,6 +65,8 @@ class Discretisation(object):
         self.y_slices = {}
         self._discretised_symbols = {}
         self.external_variables = {}
+        self._bcs_key = None
+        self._mass_matrices = None
 
     @property
     def mesh(self):
@@ -127,6 +130,15 @@ class Discretisation(object):
             `model.variables = {}`)
 
         """
+        with pybamm.profiler.span(
+            "Discretisation.process_model", model=model.name
+        ) as span:
+            model_disc = self._process_model(model, inplace, check_model)
+            span.set(states=model_disc.len_rhs_and_alg)
+        return model_disc
+
+    def _process_model(self, model, inplace, check_model):
+        """ See :meth:`Discretisation.process_model()`. """
         if model.is_discretised is True:
             raise pybamm.ModelError(
                 "Cannot re-discretise a model. "
@@ -159,6 +171,7 @@ class Discretisation(object):
 
         # Set the y split for variables
         pybamm.logger.verbose("Set variable slices for {}".format(model.name))
+        y_slices = self.y_slices
         self.set_variable_slices(variables)
 
         # now add extrapolated external variables to the boundary conditions
@@ -166,11 +179,32 @@ class Discretisation(object):
         self._preprocess_external_variables(model)
         self.set_external_variables(model)
 
+        # Discretised symbols only depend on the slices, boundary conditions and
+        # external variables, so they can be reused if this model has the same ones
+        # as the last model discretised (e.g. after updating parameter values that
+        # do not appear in the boundary conditions)
+        bcs_key = {
+            var.id: {side: (bc.id, typ) for side, (bc, typ) in bcs.items()}
+            for var, bcs in model.boundary_conditions.items()
+        }
+        reuse_symbols = (
+            self.y_slices == y_slices
+            and self._bcs_key == bcs_key
+            and not self.external_variables
+        )
+        self._bcs_key = bcs_key
+        if not reuse_symbols:
+            self._discretised_symbols = {}
+            self._mass_matrices = None
+
         # set boundary conditions (only need key ids for boundary_conditions)
         pybamm.logger.verbose(
             "Discretise boundary conditions for {}".format(model.name)
         )
-        self.bcs = self.process_boundary_conditions(model)
+        if reuse_symbols:
+            self._bcs = self.process_boundary_conditions(model)
+        else:
+            self.bcs = self.process_boundary_conditions(model)
         pybamm.logger.verbose(
             "Set internal boundary conditions for {}".format(model.name)
         )
@@ -200,8 +234,12 @@ class Discretisation(object):
         # Discretise variables (applying boundary conditions)
         # Note that we **do not** discretise the keys of model.rhs,
         # model.initial_conditions and model.boundary_conditions
-        pybamm.logger.verbose("Discretise variables for {}".format(model.name))
-        model_disc.variables = self.process_dict(model.variables)
+        # Variables are only discretised when they are first accessed, with a copy of
+        # the discretisation (with the current boundary conditions and slices) that
+        # shares the cache of discretised symbols
+        model_disc.variables = pybamm.LazyFuzzyDict.from_processed(
+            model.variables, self._shallow_copy().process_symbol
+        )
 
         # Process parabolic and elliptic equations
         pybamm.logger.verbose("Discretise model equations for {}".format(model.name))
@@ -230,11 +268,16 @@ class Discretisation(object):
             self.process_symbol(var) for var in model.external_variables
         ]
 
-        # Create mass matrix
+        # Create mass matrix (the mass matrices only depend on the variables, slices
+        # and boundary conditions)
         pybamm.logger.verbose("Create mass matrix for {}".format(model.name))
-        model_disc.mass_matrix, model_disc.mass_matrix_inv = self.create_mass_matrix(
-            model_disc
+        variable_ids = (
+            [var.id for var in model.rhs.keys()],
+            [var.id for var in model.algebraic.keys()],
         )
+        if self._mass_matrices is None or self._mass_matrices[0] != variable_ids:
+            self._mass_matrices = (variable_ids, *self.create_mass_matrix(model_disc))
+        model_disc.mass_matrix, model_disc.mass_matrix_inv = self._mass_matrices[1:]
 
         # Check that resulting model makes sense
         if check_model:
@@ -248,6 +291,15 @@ class Discretisation(object):
 
         return model_disc
 
+    def _shallow_copy(self):
+        """
+        Returns a copy of the discretisation that shares the cache of discretised
+        symbols, but is not affected by discretising other models
+        """
+        new_copy = copy.copy(self)
+        new_copy.external_variables = self.external_variables.copy()
+        return new_copy
+
     def set_variable_slices(self, variables):
         """
         Sets the slicing for variables.
@@ -298,17 +350,20 @@ class Discretisation(object):
             # Increment start
             start = end
 
+        # reset discretised_symbols, unless the slices have not changed
+        y_slices = dict(y_slices)
+        if y_slices != self.y_slices:
+            self._discretised_symbols = {}
+            self._mass_matrices = None
+
         # Convert y_slices back to normal dictionary
-        self.y_slices = dict(y_slices)
+        self.y_slices = y_slices
         # Also keep a record of what the y_slices are, to be stored in the model
         self.y_slices_explicit = dict(y_slices_explicit)
 
         # Also keep a record of bounds
         self.bounds = (np.array(lower_bounds), np.array(upper_bounds))
 
-        # reset discretised_symbols
-        self._discretised_symbols = {}
-
     def _get_variable_size(self, variable):
         """Helper function to determine what size a variable should be"""
         # If domain is empty then variable has size 1
@@ -790,7 +845,12 @@ class Discretisation(object):
             # keep calling .id
             pybamm.logger.debug("Discretise {!r}".format(eqn_key))
 
-            processed_eqn = self.process_symbol(eqn)
+            with pybamm.profiler.span(
+                "Discretisation.process_symbol", equation="{!r}".format(eqn_key)
+            ) as span:
+                processed_eqn = self.process_symbol(eqn)
+                if pybamm.profiler.enabled:
+                    span.set(size=processed_eqn.size)
 
             new_var_eqn_dict[eqn_key] = processed_eqn
 
@@ -815,21 +875,24 @@ class Discretisation(object):
             return self._discretised_symbols[symbol.id]
         except KeyError:
             discretised_symbol = self._process_symbol(symbol)
-            self._discretised_symbols[symbol.id] = discretised_symbol
             discretised_symbol.test_shape()
 
             # Assign mesh as an attribute to the processed variable
             if symbol.domain != []:
-                discretised_symbol.mesh = self.mesh.combine_submeshes(*symbol.domain)
+                mesh = self.mesh.combine_submeshes(*symbol.domain)
             else:
-                discretised_symbol.mesh = None
+                mesh = None
             # Assign secondary mesh
             if "secondary" in symbol.auxiliary_domains:
-                discretised_symbol.secondary_mesh = self.mesh.combine_submeshes(
+                secondary_mesh = self.mesh.combine_submeshes(
                     *symbol.auxiliary_domains["secondary"]
                 )
             else:
-                discretised_symbol.secondary_mesh = None
+                secondary_mesh = None
+            discretised_symbol = pybamm.symbol_table.intern(
+                discretised_symbol, mesh=mesh, secondary_mesh=secondary_mesh
+            )
+            self._discretised_symbols[symbol.id] = discretised_symbol
             return discretised_symbol
 
     def _process_symbol(self, symbol):
@@ -904,9 +967,11 @@ class Discretisation(object):
                 return out
 
             elif isinstance(symbol, pybamm.DefiniteIntegralVector):
+                # Operator matrices can be shared with other discretisations (see
+                # `pybamm.Mesh.get_operator`), so copy before adding the mesh
                 return child_spatial_method.definite_integral_matrix(
                     child, vector_type=symbol.vector_type
-                )
+                ).new_copy()
 
             elif isinstance(symbol, pybamm.BoundaryIntegral):
                 return child_spatial_method.boundary_integral(
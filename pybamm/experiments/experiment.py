@@ -77,57 +77,36 @@ class Experiment:
         self.cccv_handling = cccv_handling
 
         self.period = self.convert_time_to_seconds(period.split())
+        # Long protocols repeat the same few cycles many times, so each distinct cycle
+        # is only processed once, and each distinct step is only read once
+        processed_cycles = {}
         operating_conditions_cycles = []
         for cycle in operating_conditions:
-            # Check types and convert strings to 1-tuples
-            if (isinstance(cycle, tuple) or isinstance(cycle, str)) and all(
-                [isinstance(cond, str) for cond in cycle]
-            ):
-                if isinstance(cycle, str):
-                    processed_cycle = (cycle,)
-                else:
-                    processed_cycle = []
-                    idx = 0
-                    finished = False
-                    while not finished:
-                        step = cycle[idx]
-                        if idx < len(cycle) - 1:
-                            next_step = cycle[idx + 1]
-                        else:
-                            next_step = None
-                            finished = True
-                        if self.is_cccv(step, next_step):
-                            processed_cycle.append(step + " then " + next_step)
-                            idx += 2
-                        else:
-                            processed_cycle.append(step)
-                            idx += 1
-                        if idx >= len(cycle):
-                            finished = True
-                operating_conditions_cycles.append(tuple(processed_cycle))
-            else:
-                try:
-                    # Condition is not a string
-                    badly_typed_conditions = [
-                        cond for cond in cycle if not isinstance(cond, str)
-                    ]
-                except TypeError:
-                    # Cycle is not a tuple or string
-                    badly_typed_conditions = []
-                badly_typed_conditions = badly_typed_conditions or [cycle]
-                raise TypeError(
-                    """Operating conditions should be strings or tuples of strings, not {}. For example: {}
-                """.format(
-                        type(badly_typed_conditions[0]), examples
-                    )
-                )
+            try:
+                processed_cycle = processed_cycles.get(cycle)
+            except TypeError:
+                # Cycle is not hashable, so cannot be a string or tuple of strings
+                processed_cycle = None
+            if processed_cycle is None:
+                processed_cycle = self.process_cycle(cycle)
+                processed_cycles[cycle] = processed_cycle
+            operating_conditions_cycles.append(processed_cycle)
         self.cycle_lengths = [len(cycle) for cycle in operating_conditions_cycles]
-        operating_conditions = [
-            cond for cycle in operating_conditions_cycles for cond in cycle
-        ]
-        self.operating_conditions_strings = operating_conditions
-        self.operating_conditions, self.events = self.read_operating_conditions(
-            operating_conditions, drive_cycles
+
+        # Store each unique step once, together with the index of the unique step
+        # to run at each step of the experiment
+        step_indices = {}
+        schedule = []
+        for cycle in operating_conditions_cycles:
+            for cond in cycle:
+                schedule.append(step_indices.setdefault(cond, len(step_indices)))
+        self.schedule = np.array(schedule, dtype=int)
+        self.unique_operating_conditions_strings = list(step_indices)
+        (
+            self.unique_operating_conditions,
+            self.unique_events,
+        ) = self.read_operating_conditions(
+            self.unique_operating_conditions_strings, drive_cycles
         )
         parameters = parameters or {}
         if isinstance(parameters, dict):
@@ -138,6 +117,80 @@ class Experiment:
         self.termination = self.read_termination(termination)
         self.use_simulation_setup_type = use_simulation_setup_type
 
+    @property
+    def operating_conditions_strings(self):
+        """The operating condition string of each step of the experiment"""
+        return [self.unique_operating_conditions_strings[i] for i in self.schedule]
+
+    @property
+    def operating_conditions(self):
+        """
+        The operating conditions of each step of the experiment. Steps that are
+        repeated share the same dictionary.
+        """
+        return [self.unique_operating_conditions[i] for i in self.schedule]
+
+    @property
+    def events(self):
+        """The events of each step of the experiment"""
+        return [self.unique_events[i] for i in self.schedule]
+
+    def process_cycle(self, cycle):
+        """
+        Check the type of a cycle and convert it to a tuple of strings, merging
+        CCCV steps if `cccv_handling` is "ode"
+
+        Parameters
+        ----------
+        cycle : str or tuple of str
+            The cycle to process
+
+        Returns
+        -------
+        tuple of str
+            The steps in the cycle
+        """
+        if (isinstance(cycle, tuple) or isinstance(cycle, str)) and all(
+            [isinstance(cond, str) for cond in cycle]
+        ):
+            if isinstance(cycle, str):
+                return (cycle,)
+            processed_cycle = []
+            idx = 0
+            finished = False
+            while not finished:
+                step = cycle[idx]
+                if idx < len(cycle) - 1:
+                    next_step = cycle[idx + 1]
+                else:
+                    next_step = None
+                    finished = True
+                if self.is_cccv(step, next_step):
+                    processed_cycle.append(step + " then " + next_step)
+                    idx += 2
+                else:
+                    processed_cycle.append(step)
+                    idx += 1
+                if idx >= len(cycle):
+                    finished = True
+            return tuple(processed_cycle)
+        else:
+            try:
+                # Condition is not a string
+                badly_typed_conditions = [
+                    cond for cond in cycle if not isinstance(cond, str)
+                ]
+            except TypeError:
+                # Cycle is not a tuple or string
+                badly_typed_conditions = []
+            badly_typed_conditions = badly_typed_conditions or [cycle]
+            raise TypeError(
+                """Operating conditions should be strings or tuples of strings, not {}. For example: {}
+                """.format(
+                    type(badly_typed_conditions[0]), examples
+                )
+            )
+
     def __str__(self):
         return str(self.operating_conditions_strings)
 
@@ -0,0 +1,525 @@
+#
+# Write a symbol to numba-compiled code
+#
+import hashlib
+import importlib.util
+import numbers
+import os
+import sys
+import tempfile
+
+import numpy as np
+import scipy.sparse
+
+import pybamm
+
+numba_spec = importlib.util.find_spec("numba")
+
+
+def have_numba():
+    return numba_spec is not None
+
+
+# Functions called by the generated code, which are written at the top of each
+# generated module so that numba can cache the module on its own
+_helpers = '''
+@numba.njit(cache=True)
+def csr_matvec(data, indices, indptr, x, out):
+    for i in range(out.shape[0]):
+        value = 0.0
+        for k in range(indptr[i], indptr[i + 1]):
+            value += data[k] * x[indices[k], 0]
+        out[i, 0] = value
+    return out
+
+
+@numba.njit(cache=True)
+def dense_matvec(matrix, x, out):
+    for i in range(out.shape[0]):
+        value = 0.0
+        for j in range(matrix.shape[1]):
+            value += matrix[i, j] * x[j, 0]
+        out[i, 0] = value
+    return out
+
+
+@numba.njit(cache=True)
+def interp_linear(x, xp, fp, extrapolate):
+    out = np.empty((x.shape[0], 1))
+    n = xp.shape[0]
+    for i in range(x.shape[0]):
+        xi = x[i, 0]
+        if not extrapolate and (xi < xp[0] or xi > xp[n - 1]):
+            out[i, 0] = np.nan
+            continue
+        # index of the right end of the interval, clipped so that points outside
+        # the data are extrapolated from the first or last interval
+        k = min(max(np.searchsorted(xp, xi), 1), n - 1)
+        slope = (fp[k] - fp[k - 1]) / (xp[k] - xp[k - 1])
+        out[i, 0] = fp[k - 1] + slope * (xi - xp[k - 1])
+    return out
+
+
+@numba.njit(cache=True)
+def erf(x):
+    out = np.empty(x.shape)
+    for i in range(x.shape[0]):
+        out[i, 0] = math.erf(x[i, 0])
+    return out
+'''
+
+
+class NumbaCodeGenerator(object):
+    """
+    Converts an expression tree into the source of a function
+    `evaluate(constants, t, y, p)` that numba can compile, where `p` is the vector of
+    stacked input parameters.
+
+    Unlike :func:`pybamm.to_python`, every line only uses operations that numba
+    supports: sparse matrices are stored as CSR arrays and multiplied by vectors with
+    explicit loops, matrix-vector products write into output arrays that are
+    allocated once (and passed in with the constants), and identical subexpressions
+    and constants (even from different nodes) are only computed and stored once.
+
+    Raises `NotImplementedError` for expression trees that cannot be compiled by
+    numba (e.g. with interpolants other than 1D linear interpolants, or user-defined
+    python functions).
+    """
+
+    def __init__(self):
+        self.constants = []
+        self.lines = []
+        self.input_sizes = {}
+        self.input_starts = {}
+        self._constant_names = {}
+        self._names = {}
+        self._expressions = {}
+        # variables whose values are stored in (or are views of) preallocated arrays
+        self._buffers = set()
+
+    def generate(self, symbol):
+        """
+        Generate the source of the function evaluating `symbol`
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The (non-constant) symbol to convert
+
+        Returns
+        -------
+        str
+            The source code of the function
+        """
+        result = self.convert(symbol)
+        if result in self._buffers:
+            # don't return a preallocated array (or a view of one), which the next
+            # call would modify
+            result += ".copy()"
+        body = [
+            "{} = constants[{}]".format(self._constant_name(i), i)
+            for i in range(len(self.constants))
+        ]
+        body += self.lines + ["return " + result]
+        return (
+            "@numba.njit(cache=True)\n"
+            "def evaluate(constants, t, y, p):\n    " + "\n    ".join(body) + "\n"
+        )
+
+    def _constant_name(self, idx):
+        return "c{}".format(idx)
+
+    def constant(self, value):
+        """Store a constant array, reusing any identical constant already stored"""
+        value = np.ascontiguousarray(value)
+        key = (value.dtype.str, value.shape, value.tobytes())
+        if key not in self._constant_names:
+            self._constant_names[key] = self._constant_name(len(self.constants))
+            self.constants.append(value)
+        return self._constant_names[key]
+
+    def buffer(self, size):
+        """Create a preallocated output array"""
+        name = self._constant_name(len(self.constants))
+        self.constants.append(np.zeros((size, 1)))
+        return name
+
+    def emit(self, expression, key=None, buffer=None):
+        """
+        Add a line computing `expression`, unless an identical expression (or one
+        with the same `key`) has already been computed
+        """
+        key = key or expression
+        if key not in self._expressions:
+            name = "v{}".format(len(self.lines))
+            if buffer is not None:
+                expression = expression.format(buffer=buffer)
+                self._buffers.add(name)
+            self.lines.append("{} = {}".format(name, expression))
+            self._expressions[key] = name
+        return self._expressions[key]
+
+    def as_array(self, child):
+        """Convert a child to a variable that is always a 2D array"""
+        name = self.convert(child)
+        if isinstance(child.evaluate_for_shape(), numbers.Number):
+            return self.emit("np.full((1, 1), {})".format(name))
+        return name
+
+    def convert(self, symbol):
+        """
+        Add the lines computing `symbol` and return the name of the variable (or the
+        literal) holding its value
+        """
+        if symbol.id in self._names:
+            return self._names[symbol.id]
+
+        if symbol.is_constant():
+            value = symbol.evaluate()
+            if isinstance(value, numbers.Number):
+                value = float(value)
+                if np.isnan(value):
+                    name = "np.nan"
+                elif np.isinf(value):
+                    name = "np.inf" if value > 0 else "-np.inf"
+                else:
+                    name = repr(value)
+            else:
+                if scipy.sparse.issparse(value):
+                    value = value.toarray()
+                name = self.constant(np.asarray(value, dtype=float))
+            self._names[symbol.id] = name
+            return name
+
+        if isinstance(symbol, pybamm.MatrixMultiplication):
+            name = self._convert_matrix_multiplication(symbol)
+        elif isinstance(symbol, pybamm.BinaryOperator):
+            left, right = [self.convert(child) for child in symbol.children]
+            if isinstance(symbol, (pybamm.Multiplication, pybamm.Inner)):
+                name = self.emit("{} * {}".format(left, right))
+            elif isinstance(symbol, (pybamm.EqualHeaviside, pybamm.NotEqualHeaviside)):
+                name = self.emit("1.0 * ({} {} {})".format(left, symbol.name, right))
+            elif isinstance(symbol, pybamm.Modulo):
+                name = self.emit("np.mod({}, {})".format(left, right))
+            elif isinstance(symbol, pybamm.Minimum):
+                name = self.emit("np.minimum({}, {})".format(left, right))
+            elif isinstance(symbol, pybamm.Maximum):
+                name = self.emit("np.maximum({}, {})".format(left, right))
+            elif isinstance(
+                symbol,
+                (pybamm.Addition, pybamm.Subtraction, pybamm.Division, pybamm.Power),
+            ):
+                name = self.emit("{} {} {}".format(left, symbol.name, right))
+            else:
+                raise NotImplementedError(
+                    "Conversion to numba not implemented for a symbol of type "
+                    "'{}'".format(type(symbol))
+                )
+
+        elif isinstance(symbol, pybamm.UnaryOperator):
+            child = self.convert(symbol.child)
+            if isinstance(symbol, pybamm.Index):
+                name = self.emit(
+                    "{}[{}:{}]".format(child, symbol.slice.start, symbol.slice.stop)
+                )
+                if child in self._buffers:
+                    # a slice of a preallocated array is a view of it
+                    self._buffers.add(name)
+            elif isinstance(symbol, pybamm.Negate):
+                name = self.emit("-{}".format(child))
+            elif isinstance(
+                symbol,
+                (pybamm.AbsoluteValue, pybamm.Sign, pybamm.Floor, pybamm.Ceiling),
+            ):
+                name = self.emit("np.{}({})".format(symbol.name, child))
+            elif isinstance(symbol, pybamm.NotConstant):
+                name = child
+            else:
+                raise NotImplementedError(
+                    "Conversion to numba not implemented for a symbol of type "
+                    "'{}'".format(type(symbol))
+                )
+
+        elif isinstance(symbol, pybamm.Function):
+            name = self._convert_function(symbol)
+
+        elif isinstance(symbol, pybamm.NumpyConcatenation):
+            children = [self.as_array(child) for child in symbol.children]
+            if len(children) == 1:
+                name = children[0]
+            else:
+                name = self.emit("np.concatenate(({},))".format(", ".join(children)))
+
+        elif isinstance(symbol, pybamm.DomainConcatenation):
+            # DomainConcatenation specifies a particular ordering for the
+            # concatenation, which we must follow
+            children = [self.as_array(child) for child in symbol.children]
+            slice_starts = []
+            all_child_vectors = []
+            for i in range(symbol.secondary_dimensions_npts):
+                child_vectors = []
+                for child, slices in zip(children, symbol._children_slices):
+                    for child_dom, child_slice in slices.items():
+                        slice_starts.append(symbol._slices[child_dom][i].start)
+                        child_vectors.append(
+                            "{}[{}:{}]".format(
+                                child, child_slice[i].start, child_slice[i].stop
+                            )
+                        )
+                all_child_vectors.extend(
+                    [v for _, v in sorted(zip(slice_starts, child_vectors))]
+                )
+            if len(children) > 1 or symbol.secondary_dimensions_npts > 1:
+                name = self.emit(
+                    "np.concatenate(({},))".format(", ".join(all_child_vectors))
+                )
+            else:
+                name = children[0]
+
+        # Note: y is passed as a column vector
+        elif isinstance(symbol, pybamm.StateVector):
+            indices = np.argwhere(symbol.evaluation_array).reshape(-1)
+            consecutive = np.all(indices[1:] - indices[:-1] == 1)
+            if len(indices) == 1 or consecutive:
+                name = self.emit("y[{}:{}]".format(indices[0], indices[-1] + 1))
+            else:
+                name = self.emit(
+                    "y[{}]".format(self.constant(indices.astype(np.int64)))
+                )
+
+        elif isinstance(symbol, pybamm.Time):
+            name = "t"
+
+        elif isinstance(symbol, pybamm.InputParameter):
+            if symbol.name not in self.input_starts:
+                self.input_starts[symbol.name] = sum(self.input_sizes.values())
+                self.input_sizes[symbol.name] = symbol._expected_size
+            start = self.input_starts[symbol.name]
+            size = self.input_sizes[symbol.name]
+            if size == 1:
+                name = self.emit("p[{}]".format(start))
+            else:
+                name = self.emit(
+                    "p[{}:{}].copy().reshape(({}, 1))".format(start, start + size, size)
+                )
+
+        else:
+            raise NotImplementedError(
+                "Conversion to numba not implemented for a symbol of type '{}'".format(
+                    type(symbol)
+                )
+            )
+
+        self._names[symbol.id] = name
+        return name
+
+    def _convert_matrix_multiplication(self, symbol):
+        left, right = symbol.children
+        if not left.is_constant():
+            raise NotImplementedError(
+                "Conversion to numba only implemented for matrix multiplication by a "
+                "constant matrix"
+            )
+        matrix = left.evaluate()
+        x = self.as_array(right)
+        if scipy.sparse.issparse(matrix):
+            matrix = matrix.tocsr()
+            matrix.sort_indices()
+            arrays = ", ".join(
+                [
+                    self.constant(matrix.data.astype(float)),
+                    self.constant(matrix.indices.astype(np.int64)),
+                    self.constant(matrix.indptr.astype(np.int64)),
+                ]
+            )
+            function = "csr_matvec"
+        else:
+            arrays = self.constant(np.asarray(matrix, dtype=float))
+            function = "dense_matvec"
+        key = "{}({}, {})".format(function, arrays, x)
+        if key in self._expressions:
+            return self._expressions[key]
+        return self.emit(
+            "{}({}, {}, {{buffer}})".format(function, arrays, x),
+            key=key,
+            buffer=self.buffer(matrix.shape[0]),
+        )
+
+    def _convert_function(self, symbol):
+        if isinstance(symbol, pybamm.Interpolant):
+            if not (
+                symbol.interpolator == "linear"
+                and len(symbol.x) == 1
+                and symbol.y.ndim == 1
+            ):
+                raise NotImplementedError(
+                    "Conversion to numba only implemented for 1D linear interpolants"
+                )
+            x = self.as_array(symbol.children[0])
+            return self.emit(
+                "interp_linear({}, {}, {}, {})".format(
+                    x,
+                    self.constant(np.asarray(symbol.x[0], dtype=float)),
+                    self.constant(np.asarray(symbol.y, dtype=float)),
+                    symbol.extrapolate,
+                )
+            )
+        function = symbol.function
+        children = [self.convert(child) for child in symbol.children]
+        if function in [np.max, np.min]:
+            return self.emit("np.{}({})".format(function.__name__, children[0]))
+        if isinstance(function, np.ufunc):
+            function_name = function.__name__
+            if function_name == "erf":
+                return self.emit(
+                    "erf({})".format(self.as_array(symbol.children[0]))
+                )
+            if getattr(np, function_name, None) is function:
+                return self.emit("np.{}({})".format(function_name, ", ".join(children)))
+        raise NotImplementedError(
+            "Conversion to numba not implemented for function '{}'".format(
+                symbol.name
+            )
+        )
+
+
+class EvaluatorNumba:
+    """
+    Converts a pybamm expression tree into a function compiled with numba's `njit`,
+    which calculates the result of calling `evaluate(t, y)` on the given expression
+    tree. This is used for models with `convert_to_format = "numba"`.
+
+    Compared to :class:`pybamm.EvaluatorPython`, which executes many small numpy and
+    scipy operations (allocating a new array for each), the whole expression is
+    compiled to machine code: sparse matrix-vector products are written as loops
+    over CSR arrays into preallocated arrays, and common subexpressions are only
+    computed once (see :class:`pybamm.NumbaCodeGenerator`). The generated code is
+    written to a file named after its hash, so numba only compiles it once, and
+    later runs (in any Python process) load the compiled function from numba's cache.
+
+    Requires numba. The function is compiled when the evaluator is created, and
+    `NotImplementedError` is raised if the expression tree cannot be compiled by
+    numba (either because it cannot be converted, or because numba fails to compile
+    the generated code).
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The symbol to convert
+    directory : str, optional
+        The directory in which to store the generated code and numba's cache. Default
+        is "pybamm/numba" in the user's cache directory (given by the
+        "XDG_CACHE_HOME" environment variable, or "~/.cache").
+    """
+
+    def __init__(self, symbol, directory=None):
+        if not have_numba():
+            raise ImportError("numba is not installed")
+        import numba
+
+        if directory is None:
+            cache_home = os.environ.get(
+                "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+            )
+            directory = os.path.join(cache_home, "pybamm", "numba")
+        self.directory = directory
+        self._symbol = symbol
+
+        if symbol.is_constant():
+            self._value = symbol.evaluate()
+            self._constants = ()
+            self._input_sizes = {}
+            self._source = None
+            self._evaluate = None
+            return
+
+        generator = NumbaCodeGenerator()
+        function_source = generator.generate(symbol)
+        self._constants = tuple(generator.constants)
+        self._input_sizes = generator.input_sizes
+        self._source = (
+            "import math\n\nimport numba\nimport numpy as np\n\n"
+            + _helpers
+            + "\n\n"
+            + function_source
+        )
+        self._load()
+
+        # Compile now (with the types that `evaluate` passes) rather than on the first
+        # call, so that typing errors are raised here instead of during a solve
+        signature = (
+            numba.typeof(self._constants),
+            numba.float64,
+            numba.typeof(np.zeros((1, 1))),
+            numba.typeof(np.zeros(1)),
+        )
+        try:
+            self._evaluate.compile(signature)
+        except numba.core.errors.NumbaError as e:
+            raise NotImplementedError(
+                "numba could not compile the generated code ({})".format(e)
+            )
+
+    def _load(self):
+        """Write the generated code to the cache (if needed) and import it"""
+        name = "pybamm_numba_" + hashlib.sha256(self._source.encode()).hexdigest()[:32]
+        path = os.path.join(self.directory, name + ".py")
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first, so that other processes never import a
+            # partially-written file
+            fd, tmp_path = tempfile.mkstemp(suffix=".py", dir=self.directory)
+            with os.fdopen(fd, "w") as f:
+                f.write(self._source)
+            os.replace(tmp_path, path)
+        if name not in sys.modules:
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            # numba's cache imports the module by name when loading a function
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+        module = sys.modules[name]
+        self._evaluate = module.evaluate
+
+    def evaluate(self, t=None, y=None, y_dot=None, inputs=None, known_evals=None):
+        """
+        Acts as a drop-in replacement for :func:`pybamm.Symbol.evaluate`
+        """
+        if self._evaluate is None:
+            result = self._value
+        else:
+            t = 0.0 if t is None else float(t)
+            # generated code assumes y is a column vector
+            if y is None:
+                y = np.zeros((0, 1))
+            else:
+                y = np.asarray(y, dtype=float).reshape(-1, 1)
+            if self._input_sizes:
+                p = np.concatenate(
+                    [
+                        np.asarray(inputs[name], dtype=float).reshape(-1)
+                        for name in self._input_sizes
+                    ]
+                )
+            else:
+                p = np.zeros(0)
+            result = self._evaluate(self._constants, t, y, p)
+
+        # don't need known_evals, but need to reproduce Symbol.evaluate signature
+        if known_evals is not None:
+            return result, known_evals
+        else:
+            return result
+
+    def __getstate__(self):
+        # The compiled function cannot be pickled, but is loaded again (from numba's
+        # cache) when unpickling
+        state = self.__dict__.copy()
+        del state["_evaluate"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._evaluate = None
+        if self._source is not None:
+            self._load()
@@ -48,7 +48,7 @@ class Jacobian(object):
         try:
             return self._known_jacs[symbol.id]
         except KeyError:
-            jac = self._jac(symbol, variable)
+            jac = pybamm.symbol_table.intern(self._jac(symbol, variable))
             self._known_jacs[symbol.id] = jac
             return jac
 
@@ -0,0 +1,98 @@
+#
+# Interning table for expression tree nodes
+#
+import weakref
+
+import pybamm
+
+
+class SymbolTable(object):
+    """
+    Interning ("hash-consing") table for expression tree nodes.
+
+    Structurally identical subtrees (i.e. with the same :attr:`pybamm.Symbol.id`) are
+    often created many times while processing a model, e.g. the same broadcasts,
+    parameters and spatial operators appear in many equations. When
+    `pybamm.settings.intern_symbols` is True, :meth:`SymbolTable.intern` is called on
+    the output of :meth:`pybamm.ParameterValues.process_symbol`,
+    :meth:`pybamm.Discretisation.process_symbol` and :meth:`pybamm.Jacobian.jac`, so
+    that all structurally identical results are the same object. Only one copy of
+    each node (and of its data, e.g. the entries of a matrix) is then kept in the
+    processed model, and anything computed and cached on a node (such as its shape,
+    or its size) is only computed once.
+
+    The table only holds weak references to the nodes, so nodes are removed from the
+    table once they are not used anywhere else. The global table is
+    `pybamm.symbol_table`.
+
+    Note that interned nodes are shared, and so must not be modified in place (e.g.
+    by setting their domain) after being returned by the processing functions.
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> pybamm.settings.intern_symbols = True
+    >>> a = pybamm.symbol_table.intern(pybamm.Scalar(1) + pybamm.Parameter("a"))
+    >>> b = pybamm.symbol_table.intern(pybamm.Scalar(1) + pybamm.Parameter("a"))
+    >>> a is b
+    True
+    >>> pybamm.settings.intern_symbols = False
+    """
+
+    def __init__(self):
+        self._symbols = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __contains__(self, symbol):
+        return self._symbols.get(symbol.id) is symbol
+
+    def intern(self, symbol, **attributes):
+        """
+        Return the canonical node for the structural id of `symbol`, registering
+        `symbol` as the canonical node if there is none yet. If interning is switched
+        off (see `pybamm.settings.intern_symbols`), `symbol` is returned.
+
+        Any `attributes` given are set on `symbol` (e.g. the mesh of a discretised
+        symbol). These attributes are not part of the structural id, so the canonical
+        node is only returned if it has the same attributes (compared by identity);
+        otherwise `symbol` is returned, and the canonical node is left unchanged.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The node to intern
+        **attributes
+            Attributes to set on `symbol`, which must match those of the canonical
+            node
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            The canonical node, or `symbol`
+        """
+        if pybamm.settings.intern_symbols:
+            canonical = self._symbols.get(symbol.id)
+            if canonical is None or canonical.id != symbol.id:
+                # No canonical node yet, or it has been modified since it was added
+                self._symbols[symbol.id] = symbol
+            elif (
+                canonical is not symbol
+                and type(canonical) is type(symbol)
+                and all(
+                    name in canonical.__dict__ and canonical.__dict__[name] is value
+                    for name, value in attributes.items()
+                )
+            ):
+                return canonical
+        for name, value in attributes.items():
+            setattr(symbol, name, value)
+        return symbol
+
+    def clear(self):
+        """Remove all the nodes from the table"""
+        self._symbols.clear()
+
+
+symbol_table = SymbolTable()
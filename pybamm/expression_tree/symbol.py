@@ -114,9 +114,13 @@ def is_matrix_x(expr, x):
 
     if is_constant(expr):
         result = expr.evaluate_ignoring_errors(t=None)
-        return (issparse(result) and np.all(result.__dict__["data"] == x)) or (
-            isinstance(result, np.ndarray) and np.all(result == x)
-        )
+        if issparse(result):
+            # Entries that are not stored are zero, so a sparse matrix is only equal
+            # to a non-zero x if all of its entries are stored
+            if x != 0 and result.nnz < np.prod(result.shape):
+                return False
+            return np.all(result.__dict__["data"] == x)
+        return isinstance(result, np.ndarray) and np.all(result == x)
     else:
         return False
 
@@ -26,6 +26,10 @@ class Mesh(dict):
 
     def __init__(self, geometry, submesh_types, var_pts):
         super().__init__()
+        # Combined submeshes and operators (e.g. the matrices of spatial methods) are
+        # stored, so that they are only created once for this mesh
+        self._combined_submeshes = {}
+        self._operators = {}
         # convert var_pts to an id dict
         var_id_pts = {var.id: pts for var, pts in var_pts.items()}
 
@@ -137,6 +141,15 @@ class Mesh(dict):
         # If there is just a single submesh, we can return it directly
         if len(submeshnames) == 1:
             return self[submeshnames[0]]
+        try:
+            return self._combined_submeshes[submeshnames]
+        except KeyError:
+            submesh = self._combine_submeshes(*submeshnames)
+            self._combined_submeshes[submeshnames] = submesh
+            return submesh
+
+    def _combine_submeshes(self, *submeshnames):
+        """ See :meth:`Mesh.combine_submeshes()`. """
         # Check that the final edge of each submesh is the same as the first edge of the
         # next submesh
         for i in range(len(submeshnames) - 1):
@@ -162,6 +175,44 @@ class Mesh(dict):
 
         return submesh
 
+    def get_operator(self, key, create_operator):
+        """
+        Get an operator on this mesh (e.g. the matrix of a spatial operator), which is
+        created with `create_operator` the first time it is requested and then shared
+        by all the spatial methods and discretisations that use this mesh.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies the operator (e.g. its type and domains)
+        create_operator : callable
+            Function, with no arguments, that creates the operator
+
+        Returns
+        -------
+        The operator
+        """
+        try:
+            return self._operators[key]
+        except KeyError:
+            operator = create_operator()
+            self._operators[key] = operator
+            return operator
+
+    def __getstate__(self):
+        # Combined submeshes and operators are created again when needed, so they
+        # don't need to be saved
+        state = self.__dict__.copy()
+        state["_combined_submeshes"] = {}
+        state["_operators"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Meshes saved before the operators were stored
+        self.__dict__.setdefault("_combined_submeshes", {})
+        self.__dict__.setdefault("_operators", {})
+
     def add_ghost_meshes(self):
         """
         Create meshes for potential ghost nodes on either side of each submesh, using
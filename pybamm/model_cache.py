@@ -0,0 +1,329 @@
+#
+# On-disk cache of built models
+#
+import enum
+import hashlib
+import numbers
+import os
+import pickle
+import time
+import types
+
+import casadi
+import numpy as np
+from scipy.sparse import issparse
+
+import pybamm
+
+
+class ModelCache(object):
+    """
+    A content-addressed cache of built models, stored on disk, so that a new
+    simulation with the same configuration as an earlier one (possibly from another
+    Python process) can skip setting the parameters, discretising the model and
+    setting up the solver.
+
+    Each entry is stored as a pickle file, named after its key. Keys are calculated
+    by :meth:`ModelCache.key`, from the content of the model equations, parameter
+    values, geometry, mesh, number of points, spatial methods and solver options.
+    Entries are evicted (oldest first) when the total size of the cache exceeds
+    `max_size`, or when they have not been used for longer than `max_age`.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory in which to store the cache. Default is "pybamm/models" in the
+        user's cache directory (given by the "XDG_CACHE_HOME" environment variable,
+        or "~/.cache").
+    max_size : int, optional
+        The maximum total size of the cache, in bytes. Default is 1 GB. If None, the
+        size of the cache is not limited.
+    max_age : float, optional
+        The maximum time, in seconds, since an entry was last used. Default is None,
+        in which case entries never expire.
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> cache = pybamm.ModelCache()
+    >>> sim = pybamm.Simulation(pybamm.lithium_ion.DFN(), cache=cache)
+    >>> solution = sim.solve([0, 3600])  # later runs skip straight to solving
+    """
+
+    def __init__(self, directory=None, max_size=1e9, max_age=None):
+        if directory is None:
+            cache_home = os.environ.get(
+                "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+            )
+            directory = os.path.join(cache_home, "pybamm", "models")
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def key(self, *objects):
+        """
+        Return a key identifying `objects`. The key only depends on the content of the
+        objects (e.g. the expression trees of a model, the values in a dictionary of
+        parameters, or the options of a solver), and is the same in all Python
+        processes.
+
+        :attr:`pybamm.Symbol.id` cannot be used for this as it is built with Python's
+        `hash`, which is salted differently in each process. Instead, the same
+        information (class, name, domains, children and any other attributes of each
+        node) is combined into a SHA-256 digest.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(pybamm.__version__.encode())
+        hasher.update(casadi.__version__.encode())
+        memo = {}
+        for obj in objects:
+            hasher.update(_digest(obj, memo))
+        return hasher.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def load(self, key):
+        """
+        Return the entry stored under `key`, or None if there is no such entry (or if
+        it could not be read, in which case it is removed from the cache).
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            pybamm.logger.warning(
+                "Removing unreadable entry '{}' from model cache ({})".format(key, e)
+            )
+            self.clear(key)
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        pybamm.logger.verbose("Loaded entry '{}' from model cache".format(key))
+        return entry
+
+    def save(self, key, entry):
+        """
+        Store `entry` under `key`, replacing any existing entry, and evict old entries
+        if necessary. Returns False (and leaves the cache unchanged) if `entry` cannot
+        be pickled.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Write to a temporary file first, so that other processes never read a
+        # partially-written entry
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            pybamm.logger.warning(
+                "Could not save entry '{}' to model cache ({})".format(key, e)
+            )
+            return False
+        pybamm.logger.verbose("Saved entry '{}' to model cache".format(key))
+        self.evict(keep=key)
+        return True
+
+    def clear(self, key=None):
+        """
+        Remove the entry stored under `key` (or all the entries, if `key` is None)
+        """
+        if key is None:
+            paths = [path for path, _, _ in self._entries()]
+        else:
+            paths = [self._path(key)]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def size(self):
+        """Total size of the entries in the cache, in bytes"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, keep=None):
+        """
+        Remove the entries that have not been used for longer than `max_age`, then
+        remove the least recently used entries until the total size of the cache is
+        less than `max_size`. The entry stored under `keep` (if any) is never removed.
+        """
+        now = time.time()
+        keep_path = None if keep is None else self._path(keep)
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total_size = sum(size for _, size, _ in entries)
+        for path, size, last_used in entries:
+            if path == keep_path:
+                continue
+            too_old = self.max_age is not None and now - last_used > self.max_age
+            too_big = self.max_size is not None and total_size > self.max_size
+            if too_old or too_big:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:  # pragma: no cover
+                    pass
+                total_size -= size
+
+    def _entries(self):
+        """(path, size, time of last use) of each entry in the cache"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pkl"):
+                path = os.path.join(self.directory, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:  # pragma: no cover
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+
+# Attributes of symbols that are either derived from the other attributes, or only
+# used for caching or printing, and so are not part of the content of the symbol
+_SYMBOL_IGNORED_ATTRIBUTES = {
+    "_id",
+    "_orphans",
+    "_NodeMixin__children",
+    "_NodeMixin__parent",
+    "cached_children",
+    "children",
+    "left",
+    "right",
+    "child",
+    "_print_name",
+    "_saved_evaluates_on_edges",
+    "_saved_evaluate_for_shape",
+}
+
+# Attributes of models that define the model
+_MODEL_ATTRIBUTES = [
+    "name",
+    "options",
+    "rhs",
+    "algebraic",
+    "initial_conditions",
+    "boundary_conditions",
+    "variables",
+    "events",
+    "external_variables",
+    "timescale",
+    "length_scales",
+    "convert_to_format",
+    "use_jacobian",
+    "use_simplify",
+    "is_discretised",
+]
+
+
+def _digest(obj, memo):
+    """
+    Stable SHA-256 digest of `obj`. `memo` stores the digests of the symbols and
+    other objects that have already been seen, keyed by their Python id (along with
+    the object itself, so that the id is not reused).
+    """
+    if id(obj) in memo:
+        return memo[id(obj)][1]
+
+    hasher = hashlib.sha256()
+
+    def update(*parts):
+        for part in parts:
+            hasher.update(part if isinstance(part, bytes) else str(part).encode())
+
+    def type_name(obj):
+        return "{}.{}".format(obj.__module__, obj.__qualname__)
+
+    if obj is None or isinstance(obj, (bool, numbers.Number, str, bytes)):
+        update(type(obj).__name__, repr(obj))
+        return hasher.digest()
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            update("ndarray", obj.shape, *[_digest(x, memo) for x in obj.flat])
+        else:
+            update("ndarray", obj.dtype.str, obj.shape, obj.tobytes())
+        return hasher.digest()
+    elif issparse(obj):
+        obj = obj.tocsr()
+        update("sparse", obj.shape, obj.data.tobytes(), obj.indices.tobytes())
+        update(obj.indptr.tobytes())
+        return hasher.digest()
+    elif isinstance(obj, (list, tuple)):
+        update(type(obj).__name__, len(obj), *[_digest(x, memo) for x in obj])
+        return hasher.digest()
+    elif isinstance(obj, (set, frozenset)):
+        update("set", *sorted(_digest(x, memo) for x in obj))
+        return hasher.digest()
+    elif isinstance(obj, dict):
+        # Keep the order of the items, as it matters for e.g. model.rhs
+        update(type(obj).__name__, len(obj))
+        for k, v in obj.items():
+            update(_digest(k, memo), _digest(v, memo))
+        return hasher.digest()
+
+    # Mark the object as being processed to guard against reference cycles
+    memo[id(obj)] = (obj, b"cycle")
+    if isinstance(obj, pybamm.Symbol):
+        update(type_name(type(obj)))
+        attributes = {
+            k: v for k, v in vars(obj).items() if k not in _SYMBOL_IGNORED_ATTRIBUTES
+        }
+        update(_digest(attributes, memo), _digest(list(obj.children), memo))
+    elif isinstance(obj, pybamm.BaseModel):
+        update(type_name(type(obj)))
+        for name in _MODEL_ATTRIBUTES:
+            update(name, _digest(getattr(obj, name, None), memo))
+    elif isinstance(obj, pybamm.ParameterValues):
+        update("ParameterValues", _digest(dict(obj.items()), memo))
+    elif isinstance(obj, pybamm.SpatialMethod):
+        # The mesh that the spatial method has been built with is not an option
+        update(type_name(type(obj)), _digest(obj.options, memo))
+    elif isinstance(obj, pybamm.BaseSolver):
+        # Ignore the runtime caches of the solver (e.g. integrators), which are
+        # dictionaries keyed by model (and are empty before the first solve)
+        attributes = {
+            k: v
+            for k, v in vars(obj).items()
+            if not (isinstance(v, dict) and not all(isinstance(x, str) for x in v))
+            and v != {}
+        }
+        update(type_name(type(obj)), _digest(attributes, memo))
+    elif isinstance(obj, enum.Enum):
+        update(type_name(type(obj)), obj.name)
+    elif isinstance(obj, type):
+        update("type", type_name(obj))
+    elif isinstance(obj, types.CodeType):
+        update("code", obj.co_code, _digest(obj.co_consts, memo))
+        update(_digest(obj.co_names, memo))
+    elif isinstance(obj, types.FunctionType):
+        closure = [cell.cell_contents for cell in obj.__closure__ or []]
+        update("function", obj.__module__, obj.__qualname__)
+        update(_digest(obj.__code__, memo), _digest(obj.__defaults__, memo))
+        update(_digest(closure, memo))
+    elif isinstance(obj, types.MethodType):
+        update("method", _digest(obj.__func__, memo), _digest(obj.__self__, memo))
+    elif callable(obj) and hasattr(obj, "__name__"):
+        # Builtin functions, numpy ufuncs, etc.
+        update("callable", getattr(obj, "__module__", None), obj.__name__)
+    elif hasattr(obj, "__dict__"):
+        update(type_name(type(obj)), _digest(vars(obj), memo))
+    else:
+        # Fall back on the representation of the object. This may not be stable
+        # across processes (e.g. if it includes a memory address), which would only
+        # cause cache misses
+        update(type_name(type(obj)), repr(obj))
+    digest = hasher.digest()
+    memo[id(obj)] = (obj, digest)
+    return digest
@@ -80,8 +80,14 @@ class BaseModel:
         - None: keep PyBaMM expression tree structure.
         - "python": convert into pure python code that will calculate the result of \
         calling `evaluate(t, y)` on the given expression treeself.
+        - "numba": as "python", but the rhs, algebraic equations, initial conditions \
+        and events are compiled with numba (see :class:`pybamm.EvaluatorNumba`). \
+        This requires numba.
         - "casadi": convert into CasADi expression tree, which then uses CasADi's \
         algorithm to calculate the Jacobian.
+        - "compiled": as "casadi", but the CasADi functions are then compiled into \
+        shared libraries (cached on disk) with :class:`pybamm.CasadiCompiler`. This \
+        requires a C compiler.
 
         Default is "casadi".
     """
@@ -170,7 +176,10 @@ class BaseModel:
 
     @variables.setter
     def variables(self, variables):
-        self._variables = pybamm.FuzzyDict(variables)
+        if isinstance(variables, pybamm.LazyFuzzyDict):
+            self._variables = variables
+        else:
+            self._variables = pybamm.FuzzyDict(variables)
 
     def variable_names(self):
         return list(self._variables.keys())
@@ -326,6 +335,20 @@ class BaseModel:
 
         print(self._parameter_info)
 
+    def _searchable_variables(self, typ):
+        """
+        The variables in which to look for symbols of type `typ`. Variables that are
+        processed lazily are only searched once they have been processed, so that
+        searching does not process all of them, except when looking for input
+        parameters, which are not changed by processing
+        """
+        if isinstance(self.variables, pybamm.LazyFuzzyDict):
+            variables = self.variables.processed_values()
+            if typ == pybamm.InputParameter:
+                variables += self.variables.unprocessed_values()
+            return [var for var in variables if var is not None]
+        return list(self.variables.values())
+
     def _find_symbols(self, typ):
         """Find all the instances of `typ` in the model"""
         unpacker = pybamm.SymbolUnpacker(typ)
@@ -338,7 +361,7 @@ class BaseModel:
                 for x in self.boundary_conditions.values()
                 for side in x.keys()
             ]
-            + list(self.variables.values())
+            + self._searchable_variables(typ)
             + [event.expression for event in self.events]
             + [self.timescale]
             + list(self.length_scales.values())
@@ -681,7 +704,8 @@ class BaseModel:
     def check_default_variables_dictionaries(self):
         """Check that the right variables are provided."""
         missing_vars = []
-        for output, expression in self._variables.items():
+        # Read the stored values, so that lazily-processed variables are not processed
+        for output, expression in dict.items(self._variables):
             if expression is None:
                 missing_vars.append(output)
         if len(missing_vars) > 0:
@@ -870,6 +894,53 @@ class BaseModel:
 
         return casadi_dict
 
+    def get_stacked_variables_casadi(self, variable_names, n_states, inputs):
+        """
+        Get a single casadi function that evaluates several variables of the
+        (discretised) model at once. The function is cached with the model, so that the
+        variables are only converted to casadi once, e.g. when extracting the same
+        variables from the solution of each cycle of an experiment.
+
+        Parameters
+        ----------
+        variable_names : list of str
+            The variables to evaluate
+        n_states : int
+            The number of states
+        inputs : dict
+            The input parameters (only their names and sizes are used)
+
+        Returns
+        -------
+        :class:`casadi.Function`
+            Function of the time, the states and the stacked inputs, with one output
+            (column vector) for each variable
+        """
+        key = tuple(variable_names)
+        if key in self._variables_casadi:
+            return self._variables_casadi[key]
+
+        t_MX = casadi.MX.sym("t")
+        y_MX = casadi.MX.sym("y", n_states)
+        symbolic_inputs_dict = {
+            name: casadi.MX.sym("input", np.size(value))
+            for name, value in inputs.items()
+        }
+        symbolic_inputs = casadi.vertcat(*symbolic_inputs_dict.values())
+        variables = [
+            self.variables[name].to_casadi(t_MX, y_MX, inputs=symbolic_inputs_dict)
+            for name in variable_names
+        ]
+        variables_casadi = casadi.Function(
+            "variables", [t_MX, y_MX, symbolic_inputs], variables
+        )
+        if self.convert_to_format == "compiled":
+            variables_casadi = pybamm.casadi_compiler.compile(
+                variables_casadi, derivatives=False
+            )
+        self._variables_casadi[key] = variables_casadi
+        return variables_casadi
+
     def generate(
         self, filename, variable_names, input_parameter_order=None, cg_options=None
     ):
@@ -1,6 +1,7 @@
 #
 # Dimensional and dimensionless parameter values, and scales
 #
+import copy
 import numpy as np
 import pybamm
 import pandas as pd
@@ -59,6 +60,14 @@ class ParameterValues:
 
     def __init__(self, values=None, chemistry=None):
         self._dict_items = pybamm.FuzzyDict()
+        # Initialise empty _processed_symbols dict (for caching), with the names of
+        # the parameters that each processed symbol depends on
+        self._processed_symbols = {}
+        self._processed_symbols_parameters = {}
+        self._processing_parameters = []
+        # Extrapolation events of interpolants, keyed by the id of the processed
+        # symbol that created them, so that they are dropped with it
+        self._parameter_events = {}
         # Must provide either values or chemistry, not both (nor neither)
         if values is not None and chemistry is not None:
             raise ValueError(
@@ -84,10 +93,6 @@ class ParameterValues:
             # Don't check parameter already exists when first creating it
             self.update(values, check_already_exists=False, path=path)
 
-        # Initialise empty _processed_symbols dict (for caching)
-        self._processed_symbols = {}
-        self.parameter_events = []
-
     def __getitem__(self, key):
         return self._dict_items[key]
 
@@ -125,6 +130,16 @@ class ParameterValues:
         dictionary."""
         return ParameterValues(values=self._dict_items.copy())
 
+    def _shallow_copy(self):
+        """
+        Returns a copy of the parameter values that shares the cache of processed
+        symbols, but is not affected by later updates to the parameter values
+        """
+        new_copy = copy.copy(self)
+        new_copy._dict_items = pybamm.FuzzyDict(self._dict_items)
+        new_copy._processing_parameters = []
+        return new_copy
+
     def search(self, key, print_values=True):
         """
         Search dictionary for keys containing 'key'.
@@ -331,8 +346,29 @@ class ParameterValues:
                     values[name] = float(value)
             else:
                 self._dict_items[name] = value
-        # reset processed symbols
-        self._processed_symbols = {}
+        # reset the processed symbols that depend on the updated parameters, and the
+        # interpolant events they created. New dictionaries are created, so that
+        # copies sharing the old cache (see `_shallow_copy`) do not add symbols
+        # processed with the old values to it
+        processed_symbols = {}
+        processed_symbols_parameters = {}
+        parameter_events = {}
+        for symbol_id, parameters in self._processed_symbols_parameters.items():
+            if parameters.isdisjoint(values.keys()):
+                processed_symbols[symbol_id] = self._processed_symbols[symbol_id]
+                processed_symbols_parameters[symbol_id] = parameters
+                if symbol_id in self._parameter_events:
+                    parameter_events[symbol_id] = self._parameter_events[symbol_id]
+        self._processed_symbols = processed_symbols
+        self._processed_symbols_parameters = processed_symbols_parameters
+        self._parameter_events = parameter_events
+
+    @property
+    def parameter_events(self):
+        """The events that catch the extrapolation of the processed interpolants"""
+        return [
+            event for events in self._parameter_events.values() for event in events
+        ]
 
     def check_parameter_values(self, values):
         # Make sure typical current is non-zero
@@ -413,6 +449,13 @@ class ParameterValues:
             `model.variables = {}`)
 
         """
+        with pybamm.profiler.span(
+            "ParameterValues.process_model", model=unprocessed_model.name
+        ):
+            return self._process_model(unprocessed_model, inplace)
+
+    def _process_model(self, unprocessed_model, inplace):
+        """ See :meth:`ParameterValues.process_model()`. """
         pybamm.logger.info(
             "Start setting parameters for {}".format(unprocessed_model.name)
         )
@@ -438,7 +481,10 @@ class ParameterValues:
             pybamm.logger.verbose(
                 "Processing parameters for {!r} (rhs)".format(variable)
             )
-            new_rhs[variable] = self.process_symbol(equation)
+            with pybamm.profiler.span(
+                "ParameterValues.process_symbol", equation="{!r} (rhs)".format(variable)
+            ):
+                new_rhs[variable] = self.process_symbol(equation)
         model.rhs = new_rhs
 
         new_algebraic = {}
@@ -446,7 +492,11 @@ class ParameterValues:
             pybamm.logger.verbose(
                 "Processing parameters for {!r} (algebraic)".format(variable)
             )
-            new_algebraic[variable] = self.process_symbol(equation)
+            with pybamm.profiler.span(
+                "ParameterValues.process_symbol",
+                equation="{!r} (algebraic)".format(variable),
+            ):
+                new_algebraic[variable] = self.process_symbol(equation)
         model.algebraic = new_algebraic
 
         new_initial_conditions = {}
@@ -454,41 +504,57 @@ class ParameterValues:
             pybamm.logger.verbose(
                 "Processing parameters for {!r} (initial conditions)".format(variable)
             )
-            new_initial_conditions[variable] = self.process_symbol(equation)
+            with pybamm.profiler.span(
+                "ParameterValues.process_symbol",
+                equation="{!r} (initial conditions)".format(variable),
+            ):
+                new_initial_conditions[variable] = self.process_symbol(equation)
         model.initial_conditions = new_initial_conditions
 
-        model.boundary_conditions = self.process_boundary_conditions(unprocessed_model)
-
-        new_variables = {}
-        for variable, equation in unprocessed_model.variables.items():
-            pybamm.logger.verbose(
-                "Processing parameters for {!r} (variables)".format(variable)
+        with pybamm.profiler.span(
+            "ParameterValues.process_boundary_conditions",
+            variables=len(unprocessed_model.boundary_conditions),
+        ):
+            model.boundary_conditions = self.process_boundary_conditions(
+                unprocessed_model
             )
-            new_variables[variable] = self.process_symbol(equation)
-        model.variables = new_variables
 
-        new_events = []
-        for event in unprocessed_model.events:
-            pybamm.logger.verbose(
-                "Processing parameters for event '{}''".format(event.name)
-            )
-            new_events.append(
-                pybamm.Event(
-                    event.name, self.process_symbol(event.expression), event.event_type
+        # Variables are only processed when they are first accessed, with a copy of
+        # the current parameter values that shares the cache of processed symbols
+        model.variables = pybamm.LazyFuzzyDict.from_processed(
+            unprocessed_model.variables, self._shallow_copy().process_symbol
+        )
+
+        with pybamm.profiler.span(
+            "ParameterValues.process_events",
+            events=len(unprocessed_model.events) + len(self.parameter_events),
+        ):
+            new_events = []
+            for event in unprocessed_model.events:
+                pybamm.logger.verbose(
+                    "Processing parameters for event '{}''".format(event.name)
+                )
+                new_events.append(
+                    pybamm.Event(
+                        event.name,
+                        self.process_symbol(event.expression),
+                        event.event_type,
+                    )
                 )
-            )
 
-        for event in self.parameter_events:
-            pybamm.logger.verbose(
-                "Processing parameters for event '{}''".format(event.name)
-            )
-            new_events.append(
-                pybamm.Event(
-                    event.name, self.process_symbol(event.expression), event.event_type
+            for event in self.parameter_events:
+                pybamm.logger.verbose(
+                    "Processing parameters for event '{}''".format(event.name)
+                )
+                new_events.append(
+                    pybamm.Event(
+                        event.name,
+                        self.process_symbol(event.expression),
+                        event.event_type,
+                    )
                 )
-            )
 
-        model.events = new_events
+            model.events = new_events
 
         # Set external variables
         model.external_variables = [
@@ -591,12 +657,27 @@ class ParameterValues:
 
         """
         try:
-            return self._processed_symbols[symbol.id]
+            processed_symbol = self._processed_symbols[symbol.id]
+            parameters = self._processed_symbols_parameters[symbol.id]
         except KeyError:
-            processed_symbol = self._process_symbol(symbol)
+            # keep track of the parameters used to process the symbol, so that it is
+            # only processed again if one of them is updated
+            self._processing_parameters.append(set())
+            try:
+                processed_symbol = pybamm.symbol_table.intern(
+                    self._process_symbol(symbol)
+                )
+            finally:
+                parameters = self._processing_parameters.pop()
+            if isinstance(symbol, (pybamm.Parameter, pybamm.FunctionParameter)):
+                parameters.add(symbol.name)
+            parameters = frozenset(parameters)
             self._processed_symbols[symbol.id] = processed_symbol
+            self._processed_symbols_parameters[symbol.id] = parameters
 
-            return processed_symbol
+        if self._processing_parameters:
+            self._processing_parameters[-1].update(parameters)
+        return processed_symbol
 
     def _process_symbol(self, symbol):
         """ See :meth:`ParameterValues.process_symbol()`. """
@@ -612,7 +693,11 @@ class ParameterValues:
                 return pybamm.Scalar(value, name=symbol.name, domain=symbol.domain)
             elif isinstance(value, pybamm.Symbol):
                 new_value = self.process_symbol(value)
-                new_value.domain = symbol.domain
+                if new_value.domain != symbol.domain:
+                    # Processed symbols are cached (and may be interned), so copy
+                    # before changing the domain
+                    new_value = new_value.new_copy()
+                    new_value.domain = symbol.domain
                 return new_value
             else:
                 raise TypeError("Cannot process parameter '{}'".format(value))
@@ -642,20 +727,18 @@ class ParameterValues:
                 # Define event to catch extrapolation. In these events the sign is
                 # important: it should be positive inside of the range and negative
                 # outside of it
-                self.parameter_events.append(
+                self._parameter_events[symbol.id] = [
                     pybamm.Event(
                         "Interpolant {} lower bound".format(name),
                         pybamm.min(new_children[0] - min(data[:, 0])),
                         pybamm.EventType.INTERPOLANT_EXTRAPOLATION,
-                    )
-                )
-                self.parameter_events.append(
+                    ),
                     pybamm.Event(
                         "Interpolant {} upper bound".format(name),
                         pybamm.min(max(data[:, 0]) - new_children[0]),
                         pybamm.EventType.INTERPOLANT_EXTRAPOLATION,
-                    )
-                )
+                    ),
+                ]
             elif isinstance(function_name, numbers.Number):
                 # Check not NaN (parameter in csv file but no value given)
                 if np.isnan(function_name):
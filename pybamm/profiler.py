@@ -0,0 +1,340 @@
+#
+# Hierarchical profiler for building and solving models
+#
+import json
+import os
+import sys
+import threading
+import timeit
+import numbers
+
+
+class Span(object):
+    """
+    A timed section of code recorded by a :class:`pybamm.Profiler`, with the spans
+    that were started inside it as children.
+
+    Parameters
+    ----------
+    name : str
+        The name of the span (e.g. the function being timed)
+    args : dict
+        Information about the span (e.g. counts and sizes)
+    parent : :class:`pybamm.Span`
+        The span that was being recorded when this one was started, or None
+    thread_id : int
+        The identifier of the thread in which the span was recorded
+    """
+
+    def __init__(self, name, args, parent, thread_id):
+        self.name = name
+        self.args = args
+        self.parent = parent
+        self.thread_id = thread_id
+        self.children = []
+        self.start = None
+        self.end = None
+
+    @property
+    def duration(self):
+        """Duration of the span, in seconds"""
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+    @property
+    def self_duration(self):
+        """Duration of the span, excluding the durations of its children"""
+        return self.duration - sum(child.duration for child in self.children)
+
+    def set(self, **args):
+        """Add information to the span (e.g. sizes that are only known at the end)"""
+        self.args.update(args)
+
+    def to_dict(self, start=0):
+        """
+        Nested dictionary representation of the span and its children, with times
+        (in seconds) relative to `start`
+        """
+        return {
+            "name": self.name,
+            "start": self.start - start,
+            "duration": self.duration,
+            "args": _to_json_args(self.args),
+            "children": [child.to_dict(start) for child in self.children],
+        }
+
+
+class _NullSpan(object):
+    """Span returned when the profiler is disabled, which records nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_null_span = _NullSpan()
+
+
+class _SpanContext(object):
+    """Context manager that records a span in a profiler"""
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.span = self.profiler._start_span(self.name, self.args)
+        return self.span
+
+    def __exit__(self, *exc_info):
+        self.profiler._end_span(self.span)
+        return False
+
+
+class Profiler(object):
+    """
+    Hierarchical profiler, which records nested spans (e.g. building a simulation,
+    processing each equation, setting up the solver, each integration) with their
+    durations and information such as counts and sizes.
+
+    The profiler is disabled by default, in which case recording spans costs almost
+    nothing. The global profiler is `pybamm.profiler`, which records spans for
+    :meth:`pybamm.Simulation.build`, :meth:`pybamm.Simulation.build_for_experiment`,
+    :meth:`pybamm.ParameterValues.process_model` and
+    :meth:`pybamm.Discretisation.process_model` (and each of the equations they
+    process), :meth:`pybamm.BaseSolver.set_up` (conversion and jacobians of each
+    function), each call to the integrator of the solver, event handling, and the
+    creation of each :class:`pybamm.ProcessedVariable`.
+
+    The spans can be saved as a Chrome trace (which can be opened in
+    ``chrome://tracing`` or https://ui.perfetto.dev) or as nested JSON, and
+    summarised in a table with :meth:`Profiler.print_summary`.
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> pybamm.profiler.enable()
+    >>> with pybamm.profiler.span("example", size=10) as span:
+    ...     span.set(count=2)
+    >>> pybamm.profiler.disable()
+    >>> [span.name for span in pybamm.profiler.spans]
+    ['example']
+    >>> pybamm.profiler.clear()
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._local = threading.local()
+        self.clear()
+
+    def enable(self):
+        """Start recording spans"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans. Spans that have been recorded are kept."""
+        self.enabled = False
+
+    def clear(self):
+        """Remove all the spans that have been recorded"""
+        self.spans = []
+        self._all_spans = []
+        self._start = timeit.default_timer()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+        return False
+
+    def span(self, name, **args):
+        """
+        Context manager that records a span, nested in any span already being
+        recorded in the same thread. If the profiler is disabled, nothing is recorded.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span
+        **args
+            Information about the span (e.g. counts and sizes). More information can
+            be added with :meth:`Span.set` inside the context.
+        """
+        if not self.enabled:
+            return _null_span
+        return _SpanContext(self, name, args)
+
+    def _get_stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _start_span(self, name, args):
+        stack = self._get_stack()
+        parent = stack[-1] if stack else None
+        span = Span(name, args, parent, threading.get_ident())
+        if parent is None:
+            self.spans.append(span)
+        else:
+            parent.children.append(span)
+        self._all_spans.append(span)
+        stack.append(span)
+        span.start = timeit.default_timer()
+        return span
+
+    def _end_span(self, span):
+        span.end = timeit.default_timer()
+        stack = self._get_stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def to_chrome_trace(self):
+        """
+        Chrome trace representation of the recorded spans (as "complete" events, with
+        times in microseconds)
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "pybamm",
+                "ph": "X",
+                "ts": (span.start - self._start) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": _to_json_args(span.args),
+            }
+            for span in self._all_spans
+            if span.end is not None
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_json(self):
+        """Nested dictionary representation of the recorded spans"""
+        return [
+            span.to_dict(self._start) for span in self.spans if span.end is not None
+        ]
+
+    def save(self, filename, to_format="chrome"):
+        """
+        Save the recorded spans
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file to save the spans to
+        to_format : str, optional
+            The format to save to. Options are:
+
+            - 'chrome' (default): Chrome trace format, which can be opened in \
+            ``chrome://tracing`` or https://ui.perfetto.dev
+            - 'json': nested spans, with their durations (in seconds), information \
+            and children
+        """
+        if to_format == "chrome":
+            data = self.to_chrome_trace()
+        elif to_format == "json":
+            data = self.to_json()
+        else:
+            raise ValueError("format '{}' not recognised".format(to_format))
+        with open(filename, "w") as f:
+            json.dump(data, f)
+
+    def get_summary(self):
+        """
+        Summary of the recorded spans, grouped by name: the number of calls, total
+        duration, duration excluding the children ("self"), mean and maximum
+        durations. Durations are in seconds, and the spans nested in spans with the
+        same name are not counted twice in the total.
+
+        Returns
+        -------
+        list of dict
+            One entry per name, sorted by decreasing total duration
+        """
+        summary = {}
+        for span in self._all_spans:
+            if span.end is None:
+                continue
+            entry = summary.setdefault(
+                span.name,
+                {"name": span.name, "calls": 0, "total": 0, "self": 0, "max": 0},
+            )
+            entry["calls"] += 1
+            entry["self"] += span.self_duration
+            entry["max"] = max(entry["max"], span.duration)
+            # Don't count recursive spans twice
+            parent = span.parent
+            while parent is not None and parent.name != span.name:
+                parent = parent.parent
+            if parent is None:
+                entry["total"] += span.duration
+        for entry in summary.values():
+            entry["mean"] = entry["total"] / entry["calls"]
+        return sorted(summary.values(), key=lambda entry: -entry["total"])
+
+    def print_summary(self, file=None):
+        """
+        Print a table summarising the recorded spans (see
+        :meth:`Profiler.get_summary`)
+
+        Parameters
+        ----------
+        file : file-like object, optional
+            Where to print the table. Default is `sys.stdout`.
+        """
+        file = file or sys.stdout
+        summary = self.get_summary()
+        width = max([len(entry["name"]) for entry in summary] + [4])
+        columns = ["calls", "total", "self", "mean", "max"]
+        header = "{:<{width}}".format("name", width=width) + "".join(
+            "{:>12}".format(column) for column in columns
+        )
+        print(header, file=file)
+        print("-" * len(header), file=file)
+        for entry in summary:
+            row = "{:<{width}}{:>12}".format(entry["name"], entry["calls"], width=width)
+            row += "".join(
+                "{:>12}".format(_format_time(entry[column])) for column in columns[1:]
+            )
+            print(row, file=file)
+
+
+def _format_time(time):
+    """Format a number of seconds with a suitable unit"""
+    if time < 1e-3:
+        return "{:.1f} us".format(time * 1e6)
+    elif time < 1:
+        return "{:.1f} ms".format(time * 1e3)
+    else:
+        return "{:.2f} s".format(time)
+
+
+def _to_json_args(args):
+    """Convert the information of a span to JSON-serialisable values"""
+    json_args = {}
+    for key, value in args.items():
+        if isinstance(value, (bool, str)) or value is None:
+            json_args[key] = value
+        elif isinstance(value, numbers.Integral):
+            json_args[key] = int(value)
+        elif isinstance(value, numbers.Number):
+            json_args[key] = float(value)
+        else:
+            json_args[key] = str(value)
+    return json_args
+
+
+profiler = Profiler()
@@ -10,6 +10,8 @@ class Settings(object):
     _max_smoothing = "exact"
     _heaviside_smoothing = "exact"
     _abs_smoothing = "exact"
+    _processing_threads = 1
+    _intern_symbols = False
     max_words_in_line = 4
 
     @property
@@ -30,6 +32,25 @@ class Settings(object):
         assert isinstance(value, bool)
         self._simplify = value
 
+    @property
+    def processing_threads(self):
+        return self._processing_threads
+
+    @processing_threads.setter
+    def processing_threads(self, value):
+        if not isinstance(value, int) or value < 1:
+            raise ValueError("processing_threads must be a positive integer")
+        self._processing_threads = value
+
+    @property
+    def intern_symbols(self):
+        return self._intern_symbols
+
+    @intern_symbols.setter
+    def intern_symbols(self, value):
+        assert isinstance(value, bool)
+        self._intern_symbols = value
+
     def set_smoothing_parameters(self, k):
         "Helper function to set all smoothing parameters"
         self.min_smoothing = k
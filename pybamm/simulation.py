@@ -5,6 +5,8 @@ import pickle
 import pybamm
 import numpy as np
 import copy
+import os
+import numbers
 import warnings
 import sys
 
@@ -41,6 +43,40 @@ def constant_current_constant_voltage_constant_power(variables):
     )
 
 
+def get_parameter_names(values):
+    """
+    Names of the parameters in the symbols in `values`, which can be nested in
+    dictionaries (e.g. a geometry)
+    """
+    names = set()
+    for value in values:
+        if isinstance(value, dict):
+            names.update(get_parameter_names(value.values()))
+        elif isinstance(value, pybamm.Symbol):
+            names.update(
+                symbol.name
+                for symbol in value.pre_order()
+                if isinstance(symbol, (pybamm.Parameter, pybamm.FunctionParameter))
+            )
+    return names
+
+
+def is_same_parameter_value(old_value, new_value):
+    """Check whether a new parameter value is the same as the old one"""
+    if old_value is new_value:
+        return True
+    if isinstance(old_value, tuple) and isinstance(new_value, tuple):
+        # (name, data) for interpolants
+        return old_value[0] == new_value[0] and np.array_equal(
+            old_value[1], new_value[1]
+        )
+    if isinstance(old_value, pybamm.Symbol) and isinstance(new_value, pybamm.Symbol):
+        return old_value.id == new_value.id
+    if isinstance(old_value, numbers.Number) and isinstance(new_value, numbers.Number):
+        return old_value == new_value
+    return False
+
+
 class Simulation:
     """A Simulation class for easy building and running of PyBaMM simulations.
 
@@ -67,6 +103,14 @@ class Simulation:
         A list of variables to plot automatically
     C_rate: float (optional)
         The C-rate at which you would like to run a constant current (dis)charge.
+    cache: :class:`pybamm.ModelCache` or bool (optional)
+        If given, the built model is stored in this on-disk cache (or in a
+        :class:`pybamm.ModelCache` in the default directory, if True), and later
+        simulations with the same model, parameter values, geometry, mesh, number of
+        points and spatial methods load it from the cache instead of building it again.
+        Models in the "casadi" format are stored after being set up by the solver, so
+        that the solver set-up is also skipped. Can only be used if not simulating an
+        Experiment.
     """
 
     def __init__(
@@ -81,6 +125,7 @@ class Simulation:
         solver=None,
         output_variables=None,
         C_rate=None,
+        cache=None,
     ):
         self.parameter_values = parameter_values or model.default_parameter_values
 
@@ -129,10 +174,21 @@ class Simulation:
         self._built_model = None
         self._built_initial_soc = None
         self.op_conds_to_built_models = None
+        self._built_initial_conditions = {}
         self._mesh = None
         self._disc = None
+        self._geometry_parameters = set()
         self._solution = None
 
+        # Set up the model cache
+        if cache is True:
+            cache = pybamm.ModelCache()
+        if cache and experiment is not None:
+            raise ValueError("'cache' can only be used if not simulating an Experiment")
+        self.cache = cache or None
+        self._cache_key = None
+        self._cache_entry = None
+
         # ignore runtime warnings in notebooks
         if is_notebook():  # pragma: no cover
             import warnings
@@ -159,10 +215,13 @@ class Simulation:
         # Update parameter values with experiment parameters
         self._parameter_values.update(experiment.parameters)
         # Create a new submodel for each set of operating conditions and update
-        # parameters and events accordingly
+        # parameters and events accordingly. Inputs and times are only calculated for
+        # each unique step, and indexed with `experiment.schedule`
         self._experiment_inputs = []
         self._experiment_times = []
-        for op, events in zip(experiment.operating_conditions, experiment.events):
+        for op, events in zip(
+            experiment.unique_operating_conditions, experiment.unique_events
+        ):
             operating_inputs = {
                 "Current switch": 0,
                 "Voltage switch": 0,
@@ -325,7 +384,7 @@ class Simulation:
 
         operating_conditions = set(
             x["electric"] + (x["time"],) + (x["period"],)
-            for x in self.experiment.operating_conditions
+            for x in self.experiment.unique_operating_conditions
         )
         self.op_conds_to_model_and_param = {
             op_cond[:2]: (new_model, self.parameter_values)
@@ -335,18 +394,30 @@ class Simulation:
     def set_up_model_for_experiment_new(self, model):
         """
         Set up self.model to be able to run the experiment (new version).
-        In this version, a new model is created for each step.
+        In this version, a new model is created for each type of control (current,
+        voltage, power or CCCV), with the value of the current, voltage or power as
+        an input parameter, so that the model is shared by all the steps with the
+        same type of control.
 
         This increases set-up time since several models to be processed, but
         reduces simulation time since the model formulation is efficient.
         """
         self.op_conds_to_model_and_param = {}
+        control_to_model_and_param = {}
         for op_cond, op_inputs in zip(
-            self.experiment.operating_conditions, self._experiment_inputs
+            self.experiment.unique_operating_conditions, self._experiment_inputs
         ):
-            # Create model for this operating condition if it has not already been seen
+            if op_inputs["Current switch"] == 1:
+                op_control = "current"
+            elif op_inputs["Voltage switch"] == 1:
+                op_control = "voltage"
+            elif op_inputs["Power switch"] == 1:
+                op_control = "power"
+            else:
+                op_control = "CCCV"
+            # Create model for this type of control if it has not already been seen
             # before
-            if op_cond["electric"] not in self.op_conds_to_model_and_param:
+            if op_control not in control_to_model_and_param:
                 if op_inputs["Current switch"] == 1:
                     # Current control
                     # Make a new copy of the model (we will update events later))
@@ -452,35 +523,38 @@ class Simulation:
                     elif event.name == "Maximum voltage":
                         event._expression -= 1
 
-                # Update parameter values
+                # Update parameter values. The current, voltage or power are input
+                # parameters, set from the inputs of each step when solving
                 new_parameter_values = self.parameter_values.copy()
-                if op_inputs["Current switch"] == 1:
-                    new_parameter_values.update(
-                        {"Current function [A]": op_inputs["Current input [A]"]}
-                    )
-                elif op_inputs["Voltage switch"] == 1:
+                current = pybamm.InputParameter("Current input [A]")
+                voltage = pybamm.InputParameter("Voltage input [V]")
+                power = pybamm.InputParameter("Power input [W]")
+                if op_control == "current":
+                    new_parameter_values.update({"Current function [A]": current})
+                elif op_control == "voltage":
                     new_parameter_values.update(
-                        {"Voltage function [V]": op_inputs["Voltage input [V]"]},
-                        check_already_exists=False,
+                        {"Voltage function [V]": voltage}, check_already_exists=False
                     )
-                elif op_inputs["Power switch"] == 1:
+                elif op_control == "power":
                     new_parameter_values.update(
-                        {"Power function [W]": op_inputs["Power input [W]"]},
-                        check_already_exists=False,
+                        {"Power function [W]": power}, check_already_exists=False
                     )
-                elif op_inputs["CCCV switch"] == 1:
+                elif op_control == "CCCV":
                     new_parameter_values.update(
                         {
-                            "Current function [A]": op_inputs["Current input [A]"],
-                            "Voltage function [V]": op_inputs["Voltage input [V]"],
+                            "Current function [A]": current,
+                            "Voltage function [V]": voltage,
                         },
                         check_already_exists=False,
                     )
 
-                self.op_conds_to_model_and_param[op_cond["electric"]] = (
+                control_to_model_and_param[op_control] = (
                     new_model,
                     new_parameter_values,
                 )
+            self.op_conds_to_model_and_param[
+                op_cond["electric"]
+            ] = control_to_model_and_param[op_control]
         self.model = model
 
     def set_parameters(self):
@@ -498,9 +572,143 @@ class Simulation:
             self._model_with_set_params = self._parameter_values.process_model(
                 self._unprocessed_model, inplace=False
             )
+            # Keep track of the parameters in the geometry, which cannot be updated
+            # without creating a new mesh (see `update_parameters`)
+            self._geometry_parameters.update(
+                get_parameter_names(self._geometry.values())
+            )
             self._parameter_values.process_geometry(self._geometry)
         self.model = self._model_with_set_params
 
+    def update_parameters(self, values, check_model=True):
+        """
+        Update some parameter values and rebuild the model, without building it from
+        scratch. The mesh, spatial methods and discretisation are reused, and only the
+        parts of the model that depend on the updated parameters are processed again
+        (both when setting the parameters and when discretising). If the rhs,
+        algebraic equations and events of the model do not change (e.g. if only the
+        initial conditions are updated), the model keeps the functions created by the
+        solver when it was set up.
+
+        Parameters that appear in the geometry cannot be updated, since this would
+        require a new mesh. Use a new simulation instead.
+
+        Parameters
+        ----------
+        values : dict or :class:`pybamm.ParameterValues`
+            The parameter values to update. Only the values that differ from the
+            current ones are updated.
+        check_model : bool, optional
+            If True, model checks are performed after discretisation (see
+            :meth:`pybamm.Discretisation.process_model`). Default is True.
+        """
+        if self.operating_mode == "with experiment":
+            raise NotImplementedError(
+                "Cannot update the parameters of a simulation with an experiment. "
+                "Create a new simulation instead."
+            )
+        if self._unprocessed_model.is_discretised:
+            raise pybamm.ModelError(
+                "Cannot update the parameters of a simulation whose model was "
+                "discretised before creating the simulation"
+            )
+        if not isinstance(values, dict):
+            values = values._dict_items
+        if self._built_model is not None and self._model_with_set_params is None:
+            # The built model was loaded from the cache, so the parameters have not
+            # been set yet. Set them now, so that the parameters in the geometry are
+            # known and the model can be processed again from the updated symbols
+            self.set_parameters()
+        changed_values = {
+            name: value
+            for name, value in values.items()
+            if not is_same_parameter_value(self._parameter_values.get(name), value)
+        }
+        geometry_parameters = self._geometry_parameters.intersection(changed_values)
+        if geometry_parameters:
+            raise ValueError(
+                "Cannot update parameters that appear in the geometry ({}), as the "
+                "mesh would change. Create a new simulation instead.".format(
+                    ", ".join(sorted(geometry_parameters))
+                )
+            )
+        if changed_values == {}:
+            return None
+
+        pybamm.logger.info(
+            "Updating parameters {}".format(", ".join(changed_values.keys()))
+        )
+        self._parameter_values.update(changed_values)
+        current = self._parameter_values.get("Current function [A]")
+        if isinstance(current, pybamm.Interpolant):
+            self.operating_mode = "drive cycle"
+        else:
+            self.operating_mode = "without experiment"
+
+        if self._built_model is None:
+            # The model has not been built yet, so there is nothing to reuse
+            if self._model_with_set_params is not None:
+                self._model_with_set_params = None
+                self.set_parameters()
+            return None
+        old_built_model = self._built_model
+        self._model_with_set_params = None
+        self._built_model = None
+        self.set_parameters()
+
+        if self.cache is not None and self._load_from_cache():
+            return None
+        # Models loaded from the cache only come with their mesh
+        if self._disc is None:
+            self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
+        built_model = self._disc.process_model(
+            self._model_with_set_params, inplace=False, check_model=check_model
+        )
+        self._built_model = self._reuse_solver_set_up(old_built_model, built_model)
+        if self.cache is not None:
+            self._save_to_cache()
+
+    def _reuse_solver_set_up(self, old_model, new_model):
+        """
+        If the rhs, algebraic equations, events and scales of `new_model` are the same
+        as those of `old_model`, and `old_model` has been set up by the solver, return
+        a copy of `old_model` (which shares the functions created by the solver) with
+        the initial conditions and variables of `new_model`. Otherwise, return
+        `new_model`.
+        """
+        solver = self._solver
+        if old_model not in solver.models_set_up:
+            return new_model
+
+        def equations(model):
+            return (
+                model.concatenated_rhs.id,
+                model.concatenated_algebraic.id,
+                [
+                    (event.name, event.expression.id, event.event_type)
+                    for event in model.events
+                ],
+                model.timescale.id,
+                {domain: scale.id for domain, scale in model.length_scales.items()},
+                [var.id for var in model.external_variables],
+            )
+
+        if equations(old_model) != equations(new_model):
+            return new_model
+
+        model = copy.copy(old_model)
+        model.initial_conditions = new_model.initial_conditions
+        model.concatenated_initial_conditions = (
+            new_model.concatenated_initial_conditions
+        )
+        model.variables = new_model.variables
+        model._variables_casadi = {}
+        # The solver only sets up the initial conditions again if they have changed
+        solver.models_set_up[model] = {
+            "initial conditions": solver.models_set_up[old_model]["initial conditions"]
+        }
+        return model
+
     def build(self, check_model=True):
         """
         A method to build the model into a system of matrices and vectors suitable for
@@ -521,13 +729,75 @@ class Simulation:
         elif self.model.is_discretised:
             self._model_with_set_params = self.model
             self._built_model = self.model
+        elif self.cache is not None and self._load_from_cache():
+            return None
         else:
-            self.set_parameters()
-            self._mesh = pybamm.Mesh(self._geometry, self._submesh_types, self._var_pts)
-            self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
-            self._built_model = self._disc.process_model(
-                self._model_with_set_params, inplace=False, check_model=check_model
-            )
+            with pybamm.profiler.span(
+                "Simulation.build", model=self._unprocessed_model.name
+            ) as span:
+                self.set_parameters()
+                with pybamm.profiler.span("Mesh"):
+                    self._mesh = pybamm.Mesh(
+                        self._geometry, self._submesh_types, self._var_pts
+                    )
+                self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
+                self._built_model = self._disc.process_model(
+                    self._model_with_set_params, inplace=False, check_model=check_model
+                )
+                span.set(states=self._built_model.len_rhs_and_alg)
+                if self.cache is not None:
+                    self._save_to_cache()
+
+    def _load_from_cache(self):
+        """
+        Load the built model (and mesh) from the cache, if it contains an entry with
+        the same configuration as this simulation. Returns True if successful.
+        """
+        self._cache_key = self.cache.key(
+            self._unprocessed_model,
+            self._parameter_values,
+            self._geometry,
+            self._submesh_types,
+            self._var_pts,
+            self._spatial_methods,
+        )
+        self._cache_entry = None
+        entry = self.cache.load(self._cache_key)
+        if entry is None:
+            return False
+        self._built_model = entry["model"]
+        self._mesh = entry["mesh"]
+        self._cache_entry = entry
+        return True
+
+    def _save_to_cache(self, solver=None):
+        """
+        Save the built model (and mesh) to the cache. If a solver is given, the model
+        is saved as set up by that solver.
+        """
+        entry = {
+            "model": self._built_model,
+            "mesh": self._mesh,
+            "solver": None if solver is None else self.cache.key(solver),
+        }
+        if self.cache.save(self._cache_key, entry):
+            self._cache_entry = entry
+
+    def _set_up_solver_from_cache(self, solver):
+        """
+        If the built model was loaded from the cache after being set up by a solver
+        with the same options as `solver`, mark it as set up in `solver`
+        """
+        model = self._built_model
+        if (
+            self._cache_entry is not None
+            and self._cache_entry["solver"] is not None
+            and model not in solver.models_set_up
+            and self._cache_entry["solver"] == self.cache.key(solver)
+        ):
+            solver.models_set_up[model] = {
+                "initial conditions": model.concatenated_initial_conditions
+            }
 
     def build_for_experiment(self, check_model=True):
         """
@@ -536,12 +806,17 @@ class Simulation:
         """
         if self.op_conds_to_built_models:
             return None
-        else:
+        with pybamm.profiler.span(
+            "Simulation.build_for_experiment", model=self.model.name
+        ) as span:
             # Can process geometry with default parameter values (only electrical
             # parameters change between parameter values)
             self._parameter_values.process_geometry(self._geometry)
             # Only needs to set up mesh and discretisation once
-            self._mesh = pybamm.Mesh(self._geometry, self._submesh_types, self._var_pts)
+            with pybamm.profiler.span("Mesh"):
+                self._mesh = pybamm.Mesh(
+                    self._geometry, self._submesh_types, self._var_pts
+                )
             self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
             # Process all the different models
             self.op_conds_to_built_models = {}
@@ -564,6 +839,21 @@ class Simulation:
                     processed_models[unbuilt_model] = built_model
 
                 self.op_conds_to_built_models[op_cond] = built_model
+            span.set(
+                operating_conditions=len(self.op_conds_to_built_models),
+                models=len(processed_models),
+            )
+
+            # Stepping through the experiment updates the initial conditions of the
+            # built models in place, so keep the original ones to reset them before
+            # each solve
+            self._built_initial_conditions = {
+                model: (
+                    model.initial_conditions.copy(),
+                    model.concatenated_initial_conditions,
+                )
+                for model in processed_models.values()
+            }
 
     def solve(
         self,
@@ -572,8 +862,10 @@ class Simulation:
         check_model=True,
         save_at_cycles=None,
         calc_esoh=True,
+        batch_summary_variables=False,
         starting_solution=None,
         initial_soc=None,
+        solution_store=None,
         **kwargs,
     ):
         """
@@ -611,6 +903,16 @@ class Simulation:
             Whether to include eSOH variables in the summary variables. If `False`
             then only summary variables that do not require the eSOH calculation
             are calculated. Default is True.
+        batch_summary_variables : bool or int, optional
+            If False (default), the summary variables are calculated after each
+            cycle. If True, the summary variables of all the cycles are calculated
+            at the end of the experiment, in a single vectorised pass (see
+            :func:`pybamm.get_batched_cycle_summary_variables`), which is much faster
+            for long experiments. If an int N, the summary variables are calculated
+            in the same way every N cycles, in which case a capacity termination
+            condition is only checked every N cycles. The step solutions of the
+            cycles whose summary variables have not been calculated yet are kept in
+            memory until they are.
         starting_solution : :class:`pybamm.Solution`
             The solution to start stepping from. If None (default), then self._solution
             is used. Must be None if not using an experiment.
@@ -618,14 +920,25 @@ class Simulation:
             Initial State of Charge (SOC) for the simulation. Must be between 0 and 1.
             If given, overwrites the initial concentrations provided in the parameter
             set.
+        solution_store : :class:`pybamm.SolutionStore` or bool, optional
+            If given, the states of the solution are written to disk by the store as
+            the simulation runs (after each step, when using an experiment) and read
+            back lazily, instead of being kept in memory. If True, a new
+            :class:`pybamm.SolutionStore` (in a temporary directory) is used.
+            Default is None.
         **kwargs
             Additional key-word arguments passed to `solver.solve`.
-            See :meth:`pybamm.BaseSolver.solve`.
+            See :meth:`pybamm.BaseSolver.solve`. In particular, a
+            :class:`pybamm.SolverPool` can be passed as `pool` to solve for a list of
+            inputs with a persistent pool of worker processes.
         """
         # Setup
         if solver is None:
             solver = self.solver
 
+        if solution_store is True:
+            solution_store = pybamm.SolutionStore()
+
         if initial_soc is not None:
             if self._built_initial_soc != initial_soc:
                 # reset
@@ -736,17 +1049,46 @@ class Simulation:
                             pybamm.SolverWarning,
                         )
 
+            if self._cache_key is not None:
+                self._set_up_solver_from_cache(solver)
             self._solution = solver.solve(self.built_model, t_eval, **kwargs)
+            if solution_store is not None:
+                if isinstance(self._solution, list):
+                    for solution in self._solution:
+                        solution_store.write(solution)
+                else:
+                    solution_store.write(self._solution)
+            # Only models in the "casadi" format can be saved once set up
+            if (
+                self._cache_key is not None
+                and self._cache_entry is not None
+                and self._cache_entry["solver"] is None
+                and self.built_model in solver.models_set_up
+                and self.built_model.convert_to_format == "casadi"
+            ):
+                self._save_to_cache(solver)
 
         elif self.operating_mode == "with experiment":
             self.build_for_experiment(check_model=check_model)
+            for model, (
+                initial_conditions,
+                concatenated_initial_conditions,
+            ) in self._built_initial_conditions.items():
+                model.initial_conditions = initial_conditions.copy()
+                model.concatenated_initial_conditions = concatenated_initial_conditions
             if t_eval is not None:
                 pybamm.logger.warning(
                     "Ignoring t_eval as solution times are specified by the experiment"
                 )
+            if kwargs.get("pool") is not None:
+                raise ValueError(
+                    "'pool' can only be used if not simulating an Experiment"
+                )
             # Re-initialize solution, e.g. for solving multiple times with different
-            # inputs without having to build the simulation again
+            # inputs without having to build the simulation again. The solution is
+            # accumulated with a builder, so that appending each cycle is cheap
             self._solution = starting_solution
+            solution_builder = pybamm.SolutionBuilder(starting_solution)
             # Step through all experimental conditions
             inputs = kwargs.get("inputs", {})
             pybamm.logger.info("Start running experiment")
@@ -777,6 +1119,21 @@ class Simulation:
 
             idx = 0
             num_cycles = len(self.experiment.cycle_lengths)
+            if batch_summary_variables is True:
+                if "capacity" in self.experiment.termination:
+                    raise ValueError(
+                        "batch_summary_variables must be False or an int if the "
+                        "experiment has a capacity termination condition"
+                    )
+                batch_size = num_cycles
+            elif batch_summary_variables is not False:
+                batch_size = batch_summary_variables
+            # Step solutions and whether to save the cycle, for each cycle whose
+            # summary variables are yet to be calculated
+            pending_steps = []
+            pending_save_cycles = []
+            capacity_start = None
+            capacity_stop = None
             feasible = True  # simulation will stop if experiment is infeasible
             for cycle_num, cycle_length in enumerate(
                 self.experiment.cycle_lengths, start=1
@@ -786,7 +1143,6 @@ class Simulation:
                     f"({timer.time()} elapsed) " + "-" * 20
                 )
                 steps = []
-                cycle_solution = None
 
                 # Decide whether we should save this cycle
                 save_this_cycle = (
@@ -806,10 +1162,13 @@ class Simulation:
                     )
                 )
                 for step_num in range(1, cycle_length + 1):
-                    exp_inputs = self._experiment_inputs[idx]
-                    dt = self._experiment_times[idx]
-                    op_conds_str = self.experiment.operating_conditions_strings[idx]
-                    op_conds_elec = self.experiment.operating_conditions[idx][
+                    step = self.experiment.schedule[idx]
+                    exp_inputs = self._experiment_inputs[step]
+                    dt = self._experiment_times[step]
+                    op_conds_str = self.experiment.unique_operating_conditions_strings[
+                        step
+                    ]
+                    op_conds_elec = self.experiment.unique_operating_conditions[step][
                         "electric"
                     ]
                     model = self.op_conds_to_built_models[op_conds_elec]
@@ -831,11 +1190,14 @@ class Simulation:
                         save=False,
                         **kwargs,
                     )
+                    if solution_store is not None and step_solution is not None:
+                        # Write the states to disk before the step solution is
+                        # added to the cycle solution, so that both use the
+                        # memory-mapped states
+                        solution_store.write(step_solution)
                     steps.append(step_solution)
                     current_solution = step_solution
 
-                    cycle_solution = cycle_solution + step_solution
-
                     # Only allow events specified by experiment
                     if not (
                         step_solution is None
@@ -854,9 +1216,7 @@ class Simulation:
                         "\n\n\tExperiment is infeasible: '{}' ".format(
                             step_solution.termination
                         )
-                        + "was triggered during '{}'. ".format(
-                            self.experiment.operating_conditions_strings[idx]
-                        )
+                        + "was triggered during '{}'. ".format(op_conds_str)
                         + "The returned solution only contains the first "
                         "{} cycles. ".format(cycle_num - 1 + cycle_offset)
                         + "Try reducing the current, shortening the time interval, "
@@ -865,33 +1225,51 @@ class Simulation:
                     break
 
                 if save_this_cycle:
-                    self._solution = self._solution + cycle_solution
+                    for step_solution in steps:
+                        solution_builder.append(step_solution)
+                    self._solution = solution_builder.build()
 
                 # At the final step of the inner loop we save the cycle
-                cycle_solution, cycle_summary_variables = pybamm.make_cycle_solution(
-                    steps,
-                    esoh_sim,
-                    save_this_cycle=save_this_cycle,
-                )
-                all_cycle_solutions.append(cycle_solution)
-                all_summary_variables.append(cycle_summary_variables)
+                if batch_summary_variables is False:
+                    (
+                        cycle_solution,
+                        cycle_summary_variables,
+                    ) = pybamm.make_cycle_solution(
+                        steps,
+                        esoh_sim,
+                        save_this_cycle=save_this_cycle,
+                    )
+                    all_cycle_solutions.append(cycle_solution)
+                    all_summary_variables.append(cycle_summary_variables)
+                else:
+                    pending_steps.append(steps)
+                    pending_save_cycles.append(save_this_cycle)
+                    if len(pending_steps) < batch_size and cycle_num < num_cycles:
+                        continue
+                    (
+                        new_cycle_solutions,
+                        new_summary_variables,
+                    ) = pybamm.make_cycle_solutions(
+                        pending_steps, esoh_sim, save_cycles=pending_save_cycles
+                    )
+                    all_cycle_solutions.extend(new_cycle_solutions)
+                    all_summary_variables.extend(new_summary_variables)
+                    pending_steps = []
+                    pending_save_cycles = []
 
                 # Calculate capacity_start using the first cycle
-                if cycle_num == 1:
-                    if "capacity" in self.experiment.termination:
-                        # Note capacity_start could be defined as
-                        # self.parameter_values["Nominal cell capacity [A.h]"] instead
-                        capacity_start = all_summary_variables[0]["Capacity [A.h]"]
-                        value, typ = self.experiment.termination["capacity"]
-                        if typ == "Ah":
-                            capacity_stop = value
-                        elif typ == "%":
-                            capacity_stop = value / 100 * capacity_start
-                    else:
-                        capacity_stop = None
+                if "capacity" in self.experiment.termination and capacity_start is None:
+                    # Note capacity_start could be defined as
+                    # self.parameter_values["Nominal cell capacity [A.h]"] instead
+                    capacity_start = all_summary_variables[0]["Capacity [A.h]"]
+                    value, typ = self.experiment.termination["capacity"]
+                    if typ == "Ah":
+                        capacity_stop = value
+                    elif typ == "%":
+                        capacity_stop = value / 100 * capacity_start
 
                 if capacity_stop is not None:
-                    capacity_now = cycle_summary_variables["Capacity [A.h]"]
+                    capacity_now = all_summary_variables[-1]["Capacity [A.h]"]
                     if np.isnan(capacity_now) or capacity_now > capacity_stop:
                         pybamm.logger.notice(
                             f"Capacity is now {capacity_now:.3f} Ah "
@@ -906,10 +1284,27 @@ class Simulation:
                         )
                         break
 
+            # Calculate the summary variables of the remaining cycles (e.g. if the
+            # experiment was infeasible)
+            if len(pending_steps) > 0:
+                (
+                    new_cycle_solutions,
+                    new_summary_variables,
+                ) = pybamm.make_cycle_solutions(
+                    pending_steps, esoh_sim, save_cycles=pending_save_cycles
+                )
+                all_cycle_solutions.extend(new_cycle_solutions)
+                all_summary_variables.extend(new_summary_variables)
+
             if self.solution is not None and len(all_cycle_solutions) > 0:
                 self.solution.cycles = all_cycle_solutions
                 self.solution.set_summary_variables(all_summary_variables)
 
+            if self.solution is not None and solution_store is not None:
+                # Keep the store alive for as long as the solutions use its files
+                for sol in [self.solution] + self.solution.cycles:
+                    sol._store = solution_store
+
             pybamm.logger.notice(
                 "Finish experiment simulation, took {}".format(timer.time())
             )
@@ -1100,8 +1495,25 @@ class Simulation:
             "Create a new simulation for each different case instead."
         )
 
-    def save(self, filename):
-        """Save simulation using pickle"""
+    def save(self, filename, to_format="pickle"):
+        """
+        Save the simulation, which can then be loaded with :func:`pybamm.load_sim`
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file (or, for the 'compact' format, of the directory) to
+            save the simulation to
+        to_format : str, optional
+            The format to save to. Options are:
+
+            - 'pickle' (default): pickles the whole simulation, including its solution
+            - 'compact': creates a directory, in which the simulation is pickled
+              without its solution (in 'simulation.pkl'), and the solution is saved
+              in the 'compact' format of :meth:`pybamm.Solution.save` (in the
+              'solution' subdirectory). When loaded, the times and states of the
+              solution are memory-mapped.
+        """
         if self.model.convert_to_format == "python":
             # We currently cannot save models in the 'python' format
             raise NotImplementedError(
@@ -1110,16 +1522,47 @@ class Simulation:
                 Set model.convert_to_format = 'casadi' instead.
                 """
             )
+        self._clear_unpicklable_attributes()
+        if to_format == "pickle":
+            with open(filename, "wb") as f:
+                pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        elif to_format == "compact":
+            solution = self._solution
+            if isinstance(solution, list):
+                raise ValueError(
+                    "Cannot save a simulation with a list of solutions in the "
+                    "'compact' format"
+                )
+            os.makedirs(filename, exist_ok=True)
+            # The solution is saved separately
+            self._solution = None
+            try:
+                with open(os.path.join(filename, "simulation.pkl"), "wb") as f:
+                    pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+            finally:
+                self._solution = solution
+            if solution is not None:
+                solution.save(os.path.join(filename, "solution"), to_format="compact")
+        else:
+            raise ValueError("format '{}' not recognised".format(to_format))
+
+    def _clear_unpicklable_attributes(self):
+        """
+        Clear the attributes that cannot be pickled, and which are automatically
+        recomputed when needed
+        """
         # Clear solver problem (not pickle-able, will automatically be recomputed)
         if (
             isinstance(self._solver, pybamm.CasadiSolver)
             and self._solver.integrator_specs != {}
         ):
             self._solver.integrator_specs = {}
-        if self.solution is not None:
-            self.solution.clear_casadi_attributes()
-        with open(filename, "wb") as f:
-            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        solutions = self.solution
+        if not isinstance(solutions, list):
+            solutions = [solutions]
+        for solution in solutions:
+            if solution is not None:
+                solution.clear_casadi_attributes()
 
 
 def load_sim(filename):
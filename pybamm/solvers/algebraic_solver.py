@@ -60,7 +60,7 @@ class AlgebraicSolver(pybamm.BaseSolver):
             Any input parameters to pass to the model when solving
         """
         inputs_dict = inputs_dict or {}
-        if model.convert_to_format == "casadi":
+        if model.convert_to_format in ["casadi", "compiled"]:
             inputs = casadi.vertcat(*[x for x in inputs_dict.values()])
         else:
             inputs = inputs_dict
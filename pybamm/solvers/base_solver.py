@@ -140,6 +140,14 @@ class BaseSolver(object):
         t_eval : numeric type, optional
             The times (in seconds) at which to compute the solution
         """
+        with pybamm.profiler.span(
+            "BaseSolver.set_up", solver=self.name, model=model.name
+        ) as span:
+            self._set_up(model, inputs, t_eval, ics_only)
+            span.set(states=model.len_rhs_and_alg)
+
+    def _set_up(self, model, inputs, t_eval, ics_only):
+        """ See :meth:`BaseSolver.set_up()`. """
         pybamm.logger.info("Start solver set-up")
 
         # Check model.algebraic for ode solvers
@@ -183,7 +191,7 @@ class BaseSolver(object):
         }
         if (
             isinstance(self, (pybamm.CasadiSolver, pybamm.CasadiAlgebraicSolver))
-        ) and model.convert_to_format != "casadi":
+        ) and model.convert_to_format not in ["casadi", "compiled"]:
             pybamm.logger.warning(
                 "Converting {} to CasADi for solving with CasADi solver".format(
                     model.name
@@ -192,7 +200,7 @@ class BaseSolver(object):
             model.convert_to_format = "casadi"
         if (
             isinstance(self.root_method, pybamm.CasadiAlgebraicSolver)
-            and model.convert_to_format != "casadi"
+            and model.convert_to_format not in ["casadi", "compiled"]
         ):
             pybamm.logger.warning(
                 "Converting {} to CasADi for calculating ICs with CasADi".format(
@@ -233,7 +241,7 @@ class BaseSolver(object):
             model.len_rhs_sens = model.len_rhs * num_parameters
             model.len_alg_sens = model.len_alg * num_parameters
 
-        if model.convert_to_format != "casadi":
+        if model.convert_to_format not in ["casadi", "compiled"]:
             # Create Jacobian from concatenated rhs and algebraic
             y = pybamm.StateVector(slice(0, model.len_rhs_and_alg))
             # set up Jacobian object, for re-use of dict
@@ -265,6 +273,12 @@ class BaseSolver(object):
                 y_and_S = y_casadi
 
         def process(func, name, use_jacobian=None):
+            with pybamm.profiler.span(
+                "BaseSolver.process", function=name, format=model.convert_to_format
+            ):
+                return _process(func, name, use_jacobian)
+
+        def _process(func, name, use_jacobian=None):
             def report(string):
                 # don't log event conversion
                 if "event" not in string:
@@ -286,14 +300,15 @@ class BaseSolver(object):
                     jacp = jacp.evaluate
                 if use_jacobian:
                     report(f"Calculating jacobian for {name} using jax")
-                    jac = func.get_jacobian()
+                    with pybamm.profiler.span("BaseSolver.jacobian", function=name):
+                        jac = func.get_jacobian()
                     jac = jac.evaluate
                 else:
                     jac = None
 
                 func = func.evaluate
 
-            elif model.convert_to_format != "casadi":
+            elif model.convert_to_format not in ["casadi", "compiled"]:
                 # Process with pybamm functions, optionally converting
                 # to python evaluator
                 if model.calculate_sensitivities:
@@ -305,7 +320,7 @@ class BaseSolver(object):
                         p: func.diff(pybamm.InputParameter(p))
                         for p in model.calculate_sensitivities
                     }
-                    if model.convert_to_format == "python":
+                    if model.convert_to_format in ["python", "numba"]:
                         report(f"Converting sensitivities for {name} to python")
                         jacp_dict = {
                             p: pybamm.EvaluatorPython(jacp)
@@ -321,8 +336,11 @@ class BaseSolver(object):
 
                 if use_jacobian:
                     report(f"Calculating jacobian for {name}")
-                    jac = jacobian.jac(func, y)
-                    if model.convert_to_format == "python":
+                    with pybamm.profiler.span("BaseSolver.jacobian", function=name):
+                        jac = jacobian.jac(func, y)
+                    if model.convert_to_format in ["python", "numba"]:
+                        # Jacobians are expressions of sparse matrices, which are
+                        # evaluated in python for the numba format too
                         report(f"Converting jacobian for {name} to python")
                         jac = pybamm.EvaluatorPython(jac)
                     jac = jac.evaluate
@@ -332,6 +350,16 @@ class BaseSolver(object):
                 if model.convert_to_format == "python":
                     report(f"Converting {name} to python")
                     func = pybamm.EvaluatorPython(func)
+                elif model.convert_to_format == "numba":
+                    report(f"Compiling {name} with numba")
+                    try:
+                        func = pybamm.EvaluatorNumba(func)
+                    except NotImplementedError as e:
+                        pybamm.logger.warning(
+                            "Could not compile {} with numba ({}). Converting to "
+                            "python instead".format(name, e)
+                        )
+                        func = pybamm.EvaluatorPython(func)
 
                 func = func.evaluate
 
@@ -425,16 +453,23 @@ class BaseSolver(object):
 
                 if use_jacobian:
                     report(f"Calculating jacobian for {name} using CasADi")
-                    jac_casadi = casadi.jacobian(func, y_and_S)
-                    jac = casadi.Function(
-                        name, [t_casadi, y_and_S, p_casadi_stacked], [jac_casadi]
-                    )
+                    with pybamm.profiler.span("BaseSolver.jacobian", function=name):
+                        jac_casadi = casadi.jacobian(func, y_and_S)
+                        jac = casadi.Function(
+                            name, [t_casadi, y_and_S, p_casadi_stacked], [jac_casadi]
+                        )
                 else:
                     jac = None
 
                 func = casadi.Function(
                     name, [t_casadi, y_and_S, p_casadi_stacked], [func]
                 )
+
+                if model.convert_to_format == "compiled":
+                    report(f"Compiling {name}")
+                    func = pybamm.casadi_compiler.compile(func)
+                    if jac is not None:
+                        jac = pybamm.casadi_compiler.compile(jac, derivatives=False)
             if name == "residuals":
                 func_call = Residuals(func, name, model)
             else:
@@ -444,9 +479,12 @@ class BaseSolver(object):
             else:
                 jac_call = None
             if jacp is not None:
+                if model.convert_to_format == "compiled":
+                    form = "casadi"
+                else:
+                    form = model.convert_to_format
                 jacp_call = SensitivityCallable(
-                    jacp, name + "_sensitivity_wrt_inputs", model,
-                    model.convert_to_format
+                    jacp, name + "_sensitivity_wrt_inputs", model, form
                 )
             else:
                 jacp_call = None
@@ -786,7 +824,8 @@ class BaseSolver(object):
         inputs=None,
         initial_conditions=None,
         nproc=None,
-        calculate_sensitivities=False
+        calculate_sensitivities=False,
+        pool=None,
     ):
         """
         Execute the solver setup and calculate the solution of the model at
@@ -816,6 +855,12 @@ class BaseSolver(object):
             If true, solver calculates sensitivities of all input parameters.
             If only a subset of sensitivities are required, can also pass a
             list of input parameter names
+        pool : :class:`pybamm.SolverPool`, optional
+            A persistent pool of worker processes to use when solving for more than
+            one set of input parameters. The model is only sent to each worker once,
+            and stays there for subsequent calls with the same pool. If None
+            (default), a new `multiprocessing.Pool` with `nproc` processes is created
+            for each call.
 
         Returns
         -------
@@ -874,6 +919,22 @@ class BaseSolver(object):
         if (np.diff(t_eval) < 0).any():
             raise pybamm.SolverError("t_eval must increase monotonically")
 
+        # Solve for each set of inputs separately in the workers of a persistent pool
+        if pool is not None and isinstance(inputs, list) and len(inputs) > 1:
+            pybamm.logger.info(
+                "Solving {} for {} sets of inputs with a solver pool".format(
+                    model.name, len(inputs)
+                )
+            )
+            return pool.map(
+                self,
+                model,
+                t_eval,
+                inputs,
+                external_variables=external_variables,
+                calculate_sensitivities=calculate_sensitivities,
+            )
+
         # Set up external variables and inputs
         #
         # Argument "inputs" can be either a list of input dicts or
@@ -887,8 +948,15 @@ class BaseSolver(object):
             for inputs in inputs_list
         ]
 
-        # Cannot use multiprocessing with model in "jax" format
-        if (len(inputs_list) > 1) and model.convert_to_format == "jax":
+        # Cannot use multiprocessing with model in "jax" format (solvers that can
+        # integrate several sets of inputs at once, such as the JaxSolver, override
+        # `_integrate_multiple_inputs`)
+        if (
+            len(inputs_list) > 1
+            and model.convert_to_format == "jax"
+            and type(self)._integrate_multiple_inputs
+            is BaseSolver._integrate_multiple_inputs
+        ):
             raise pybamm.SolverError(
                 "Cannot solve list of inputs with multiprocessing "
                 'when model in format "jax".'
@@ -904,6 +972,7 @@ class BaseSolver(object):
             # CasadiSolver caches its integrators using model, so delete this too
             if isinstance(self, pybamm.CasadiSolver):
                 self.integrators.pop(model, None)
+                self.mapped_integrators.pop(model, None)
 
         # save sensitivity parameters so we can identify them later on
         # (FYI: this is used in the Solution class)
@@ -1031,25 +1100,27 @@ class BaseSolver(object):
                 )
             )
             ninputs = len(ext_and_inputs_list)
-            if ninputs == 1:
-                new_solution = self._integrate(
-                    model,
-                    t_eval_dimensionless[start_index:end_index],
-                    ext_and_inputs_list[0],
-                )
-                new_solutions = [new_solution]
-            else:
-                with mp.Pool(processes=nproc) as p:
-                    new_solutions = p.starmap(
-                        self._integrate,
-                        zip(
-                            [model] * ninputs,
-                            [t_eval_dimensionless[start_index:end_index]] * ninputs,
-                            ext_and_inputs_list,
-                        ),
+            with pybamm.profiler.span(
+                "BaseSolver._integrate",
+                solver=self.name,
+                time_points=end_index - start_index,
+                states=model.len_rhs_and_alg,
+                inputs=ninputs,
+            ):
+                if ninputs == 1:
+                    new_solution = self._integrate(
+                        model,
+                        t_eval_dimensionless[start_index:end_index],
+                        ext_and_inputs_list[0],
+                    )
+                    new_solutions = [new_solution]
+                else:
+                    new_solutions = self._integrate_multiple_inputs(
+                        model,
+                        t_eval_dimensionless[start_index:end_index],
+                        ext_and_inputs_list,
+                        nproc,
                     )
-                    p.close()
-                    p.join()
             # Setting the solve time for each segment.
             # pybamm.Solution.__add__ assumes attribute solve_time.
             solve_time = timer.time()
@@ -1077,20 +1148,24 @@ class BaseSolver(object):
         solve_time = timer.time()
 
         for i, solution in enumerate(solutions):
-            # Check if extrapolation occurred
-            extrapolation = self.check_extrapolation(solution, model.events)
-            if extrapolation:
-                warnings.warn(
-                    "While solving {} extrapolation occurred for {}".format(
-                        model.name, extrapolation
-                    ),
-                    pybamm.SolverWarning,
+            with pybamm.profiler.span(
+                "BaseSolver.handle_events", events=len(model.events)
+            ) as span:
+                # Check if extrapolation occurred
+                extrapolation = self.check_extrapolation(solution, model.events)
+                if extrapolation:
+                    warnings.warn(
+                        "While solving {} extrapolation occurred for {}".format(
+                            model.name, extrapolation
+                        ),
+                        pybamm.SolverWarning,
+                    )
+                # Identify the event that caused termination and update the solution
+                # to include the event time and state
+                solutions[i], termination = self.get_termination_reason(
+                    solution, model.events
                 )
-            # Identify the event that caused termination and update the solution to
-            # include the event time and state
-            solutions[i], termination = self.get_termination_reason(
-                solution, model.events
-            )
+                span.set(termination=termination)
             # Assign times
             solutions[i].set_up_time = set_up_time
             # all solutions get the same solve time, but their integration time
@@ -1142,6 +1217,39 @@ class BaseSolver(object):
         else:
             return solutions
 
+    def _integrate_multiple_inputs(self, model, t_eval, inputs_list, nproc=None):
+        """
+        Integrate a model for several sets of inputs. By default, each set of inputs is
+        integrated in a separate process, but solvers that can integrate several sets
+        of inputs at once can override this method.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model whose solution to calculate.
+        t_eval : numeric type
+            The (dimensionless) times at which to compute the solution
+        inputs_list : list of dict
+            The external variables and input parameters for each solution
+        nproc : int, optional
+            Number of processes to use. Defaults to value returned by
+            "os.cpu_count()".
+
+        Returns
+        -------
+        list of :class:`pybamm.Solution`
+            The solution for each set of inputs
+        """
+        ninputs = len(inputs_list)
+        with mp.Pool(processes=nproc) as p:
+            solutions = p.starmap(
+                self._integrate,
+                zip([model] * ninputs, [t_eval] * ninputs, inputs_list),
+            )
+            p.close()
+            p.join()
+        return solutions
+
     def step(
         self,
         old_solution,
@@ -1285,22 +1393,35 @@ class BaseSolver(object):
             )
         )
         timer.reset()
-        solution = self._integrate(model, t_eval, ext_and_inputs)
+        with pybamm.profiler.span(
+            "BaseSolver._integrate",
+            solver=self.name,
+            time_points=npts,
+            states=model.len_rhs_and_alg,
+            inputs=1,
+        ):
+            solution = self._integrate(model, t_eval, ext_and_inputs)
         solution.solve_time = timer.time()
 
-        # Check if extrapolation occurred
-        extrapolation = self.check_extrapolation(solution, model.events)
-        if extrapolation:
-            warnings.warn(
-                "While solving {} extrapolation occurred for {}".format(
-                    model.name, extrapolation
-                ),
-                pybamm.SolverWarning,
-            )
+        with pybamm.profiler.span(
+            "BaseSolver.handle_events", events=len(model.events)
+        ) as span:
+            # Check if extrapolation occurred
+            extrapolation = self.check_extrapolation(solution, model.events)
+            if extrapolation:
+                warnings.warn(
+                    "While solving {} extrapolation occurred for {}".format(
+                        model.name, extrapolation
+                    ),
+                    pybamm.SolverWarning,
+                )
 
-        # Identify the event that caused termination and update the solution to
-        # include the event time and state
-        solution, termination = self.get_termination_reason(solution, model.events)
+            # Identify the event that caused termination and update the solution to
+            # include the event time and state
+            solution, termination = self.get_termination_reason(
+                solution, model.events
+            )
+            span.set(termination=termination)
 
         # Assign setup time
         solution.set_up_time = set_up_time
@@ -1322,8 +1443,14 @@ class BaseSolver(object):
         # Return solution
         if save is False:
             return solution
-        else:
+        elif old_solution is None:
             return old_solution + solution
+        else:
+            # Keep appending to the same builder when stepping repeatedly, rather
+            # than creating a new solution from all the previous steps each time
+            builder = pybamm.SolutionBuilder.from_solution(old_solution)
+            builder.append(solution)
+            return builder.build()
 
     def get_termination_reason(self, solution, events):
         """
@@ -0,0 +1,322 @@
+#
+# Step many copies of the same model forward in lock-step
+#
+import numbers
+
+import casadi
+import numpy as np
+
+import pybamm
+
+
+class BatchStepper(object):
+    """
+    Steps many copies of the same built model (e.g. the cells of a pack) forward in
+    time together, in lock-step.
+
+    Unlike calling :meth:`pybamm.BaseSolver.step` in a loop over a list of
+    :class:`pybamm.Simulation` objects, the model is only set up once, the states
+    and inputs of all the cells are stored in arrays, and each step integrates all
+    the cells with a single call to a CasADi integrator mapped over the cells (see
+    :meth:`pybamm.CasadiSolver.create_mapped_integrator`), without creating a
+    :class:`pybamm.Solution` for each cell. Input parameters (e.g. the current or
+    ambient temperature of each cell, from a pack-level model) can be changed
+    between steps with :meth:`BatchStepper.set_inputs`.
+
+    Events are not checked, as in the "fast" mode of :class:`pybamm.CasadiSolver`,
+    but any variable (e.g. the voltage or temperature of each cell) can be
+    evaluated for all the cells at once with :meth:`BatchStepper.evaluate`. The
+    timescale of the model is evaluated with the inputs of the first cell, so should
+    not depend on input parameters that differ between cells.
+
+    Parameters
+    ----------
+    model : :class:`pybamm.BaseModel`
+        The discretised model to step (e.g. `Simulation.built_model`)
+    inputs : dict
+        The input parameters of the model. Each value can be a number, shared by all
+        the cells, or an array with one entry (column, for vector inputs) for each
+        cell.
+    n_cells : int, optional
+        The number of cells. By default, this is the number of entries of the inputs
+        given for each cell.
+    y0 : array-like, optional
+        The initial states, either one vector for all the cells or an array with one
+        column for each cell. By default, the initial conditions of the model (for
+        the inputs of the first cell) are used for all the cells.
+    solver : :class:`pybamm.CasadiSolver`, optional
+        The solver to use. Must have `batch_parallelisation` set. Default is a
+        :class:`pybamm.CasadiSolver` in "fast" mode with "serial"
+        `batch_parallelisation`.
+    nproc : int, optional
+        The number of threads, if the solver's `batch_parallelisation` is "thread"
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> model = pybamm.lithium_ion.SPM()
+    >>> param = model.default_parameter_values
+    >>> param["Current function [A]"] = "[input]"
+    >>> sim = pybamm.Simulation(model, parameter_values=param)
+    >>> sim.build()
+    >>> stepper = pybamm.BatchStepper(
+    ...     sim.built_model, {"Current function [A]": [0.5, 1, 2]}
+    ... )
+    >>> t, y = stepper.step(60)
+    >>> V = stepper.evaluate(["Terminal voltage [V]"])["Terminal voltage [V]"]
+    >>> stepper.set_inputs("Current function [A]", 2 - 0.1 * V)
+    >>> t, y = stepper.step(60)
+    """
+
+    def __init__(self, model, inputs, n_cells=None, y0=None, solver=None, nproc=None):
+        if solver is None:
+            solver = pybamm.CasadiSolver(mode="fast", batch_parallelisation="serial")
+        elif not isinstance(solver, pybamm.CasadiSolver):
+            raise TypeError("solver must be a pybamm.CasadiSolver")
+        elif solver.batch_parallelisation is None:
+            raise ValueError("solver must have batch_parallelisation set")
+        if not model.is_discretised:
+            raise pybamm.ModelError("model must be discretised before stepping")
+        if getattr(model, "calculate_sensitivities", []):
+            raise NotImplementedError(
+                "BatchStepper does not support calculating sensitivities"
+            )
+        self.model = model
+        self.solver = solver
+        self.nproc = nproc
+
+        # Read the number of cells from the inputs given for each cell
+        if n_cells is None:
+            n_cells = 1
+            for name, value in inputs.items():
+                if not isinstance(value, numbers.Number):
+                    n_cells = max(n_cells, np.shape(value)[-1])
+        self.n_cells = n_cells
+
+        # Store the inputs of all the cells as rows of a single array, so that they
+        # can be updated without looping over the cells
+        self.input_names = list(inputs.keys())
+        self._input_slices = {}
+        rows = []
+        start = 0
+        for name, value in inputs.items():
+            value = self._broadcast(name, value)
+            self._input_slices[name] = slice(start, start + value.shape[0])
+            start += value.shape[0]
+            rows.append(value)
+        self._inputs = np.vstack(rows) if rows else np.zeros((0, n_cells))
+
+        # Set the model up once, with the inputs of the first cell
+        first_inputs = self.get_inputs(0)
+        solver.set_up(model, first_inputs)
+        # Discard integrators created for any previous set-up of the model, whose
+        # inputs may have been stacked in a different order
+        solver.integrators.pop(model, None)
+        solver.integrator_specs.pop(model, None)
+        solver.mapped_integrators.pop(model, None)
+        solver.models_set_up.update(
+            {model: {"initial conditions": model.concatenated_initial_conditions}}
+        )
+
+        if y0 is None:
+            solver._set_initial_conditions(model, first_inputs, update_rhs=True)
+            y0 = model.y0
+            if isinstance(y0, casadi.DM):
+                y0 = y0.full()
+        y0 = np.asarray(y0, dtype=float)
+        if y0.ndim == 1 or y0.shape[1] == 1:
+            y0 = np.tile(y0.reshape(-1, 1), (1, n_cells))
+        if y0.shape != (model.len_rhs_and_alg, n_cells):
+            raise ValueError(
+                "y0 should have shape ({0},) or ({0}, {1}), not {2}".format(
+                    model.len_rhs_and_alg, n_cells, y0.shape
+                )
+            )
+        self.y = y0
+        # dimensionless time
+        self._t = 0.0
+        self._mapped_variables = {}
+        self._mapped_rootfinder = None
+
+    @property
+    def t(self):
+        """The current time, in seconds"""
+        return self._t * self.model.timescale_eval
+
+    def _broadcast(self, name, value):
+        """Convert the values of an input for all the cells to a 2D array"""
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0:
+            value = np.full((1, self.n_cells), float(value))
+        elif value.ndim == 1:
+            value = value.reshape(1, -1)
+        if value.shape[1] != self.n_cells:
+            raise ValueError(
+                "Input '{}' has values for {} cells, but there are {} cells".format(
+                    name, value.shape[1], self.n_cells
+                )
+            )
+        return value
+
+    def get_inputs(self, cell):
+        """
+        Get the input parameters of one cell.
+
+        Parameters
+        ----------
+        cell : int
+            The index of the cell
+
+        Returns
+        -------
+        dict
+            The input parameters of the cell
+        """
+        inputs = {}
+        for name in self.input_names:
+            value = self._inputs[self._input_slices[name], cell]
+            inputs[name] = value[0] if value.shape[0] == 1 else value.reshape(-1, 1)
+        return inputs
+
+    def set_inputs(self, name, value):
+        """
+        Update an input parameter of all the cells, e.g. to couple the cells through
+        a pack-level model between steps.
+
+        Parameters
+        ----------
+        name : str
+            The name of the input parameter
+        value : numeric type or array-like
+            The new value, either shared by all the cells or with one entry (column,
+            for vector inputs) for each cell
+        """
+        try:
+            rows = self._input_slices[name]
+        except KeyError:
+            raise KeyError(
+                "'{}' is not an input of the BatchStepper. Inputs are {}".format(
+                    name, self.input_names
+                )
+            )
+        self._inputs[rows] = self._broadcast(name, value)
+
+    def step(self, dt, npts=2):
+        """
+        Step all the cells forward by a given time increment.
+
+        Parameters
+        ----------
+        dt : numeric type
+            The timestep (in seconds)
+        npts : int, optional
+            The number of points at which the states are returned during the step.
+            Default is 2 (the states at t0 and t0 + dt).
+
+        Returns
+        -------
+        t : :class:`numpy.ndarray`
+            The times (in seconds) at which the states are returned
+        y : :class:`numpy.ndarray`
+            The states, with shape (number of states, number of cells, npts)
+        """
+        if dt <= 0:
+            raise pybamm.SolverError("Step time must be positive")
+        model = self.model
+        solver = self.solver
+        t_eval = np.linspace(self._t, self._t + dt / model.timescale_eval, npts)
+        self._set_consistent_states()
+
+        integrator = solver.create_integrator(
+            model, casadi.DM(self._inputs[:, :1]), t_eval
+        )
+        mapped_integrator = solver.create_mapped_integrator(
+            model, integrator, t_eval, self.n_cells, self.nproc
+        )
+        len_rhs = model.len_rhs
+        p = np.vstack([self._inputs, np.full((1, self.n_cells), t_eval[0])])
+        try:
+            casadi_sol = mapped_integrator(
+                x0=self.y[:len_rhs],
+                z0=casadi.DM(self.y[len_rhs:]),
+                p=p,
+                **solver.extra_options_call
+            )
+        except RuntimeError as e:
+            raise pybamm.SolverError(e.args[0])
+
+        # The outputs of the mapped integrator are the outputs for each cell,
+        # concatenated horizontally
+        y = casadi.vertcat(casadi_sol["xf"], casadi_sol["zf"]).full()
+        y = y.reshape(y.shape[0], self.n_cells, npts)
+        self.y = np.ascontiguousarray(y[:, :, -1])
+        self._t = t_eval[-1]
+        return t_eval * model.timescale_eval, y
+
+    def _set_consistent_states(self):
+        """
+        Make the algebraic states of all the cells consistent with their differential
+        states and (possibly updated) inputs, with one call to a root-finder mapped
+        over the cells
+        """
+        model = self.model
+        if model.len_alg == 0:
+            return
+        if self._mapped_rootfinder is None:
+            t = casadi.MX.sym("t")
+            y_diff = casadi.MX.sym("y_diff", model.len_rhs)
+            y_alg = casadi.MX.sym("y_alg", model.len_alg)
+            p = casadi.MX.sym("p", self._inputs.shape[0])
+            alg = model.casadi_algebraic(t, casadi.vertcat(y_diff, y_alg), p)
+            roots = casadi.rootfinder(
+                "roots",
+                "newton",
+                dict(x=y_alg, p=casadi.vertcat(t, y_diff, p), g=alg),
+                {"abstol": self.solver.root_tol},
+            )
+            self._mapped_rootfinder = roots.map(self.n_cells)
+        len_rhs = model.len_rhs
+        params = np.vstack(
+            [np.full((1, self.n_cells), self._t), self.y[:len_rhs], self._inputs]
+        )
+        try:
+            y_alg = self._mapped_rootfinder(self.y[len_rhs:], params)
+        except RuntimeError as e:
+            raise pybamm.SolverError(
+                "Could not find consistent states: {}".format(e.args[0])
+            )
+        self.y[len_rhs:] = y_alg.full()
+
+    def evaluate(self, names):
+        """
+        Evaluate variables of the model at the current states of all the cells,
+        with one call to a stacked CasADi function (see
+        :meth:`pybamm.BaseModel.get_stacked_variables_casadi`) mapped over the cells.
+
+        Parameters
+        ----------
+        names : list of str
+            The names of the variables to evaluate
+
+        Returns
+        -------
+        dict
+            The values of each variable, as a 1D array (one entry for each cell) for
+            scalar variables, or a 2D array (one column for each cell) otherwise
+        """
+        key = tuple(names)
+        if key not in self._mapped_variables:
+            variables_casadi = self.model.get_stacked_variables_casadi(
+                names, self.model.len_rhs_and_alg, self.get_inputs(0)
+            )
+            self._mapped_variables[key] = variables_casadi.map(self.n_cells)
+        values = self._mapped_variables[key](self._t, self.y, self._inputs)
+        if len(names) == 1:
+            values = [values]
+        variables = {}
+        for name, value in zip(names, values):
+            value = value.full()
+            if value.shape[0] == 1:
+                value = value[0]
+            variables[name] = value
+        return variables
@@ -0,0 +1,99 @@
+#ifndef PYBAMM_IDAKLU_CASADI_FUNCTIONS_HPP
+#define PYBAMM_IDAKLU_CASADI_FUNCTIONS_HPP
+
+#include <casadi/casadi.hpp>
+#include <sundials/sundials_types.h> /* defs. of realtype, sunindextype      */
+
+#include <vector>
+
+using Function = casadi::Function;
+
+// Wrapper around a casadi function that preallocates the work buffers, so that
+// the function can be called from the sundials callbacks without allocating
+// memory (or going through python). Before each call, the pointers to the inputs
+// and outputs are set in m_arg and m_res
+class CasadiFunction
+{
+public:
+  explicit CasadiFunction(const Function &f) : m_func(f)
+  {
+    size_t sz_arg;
+    size_t sz_res;
+    size_t sz_iw;
+    size_t sz_w;
+    m_func.sz_work(sz_arg, sz_res, sz_iw, sz_w);
+    m_arg.resize(sz_arg, nullptr);
+    m_res.resize(sz_res, nullptr);
+    m_iw.resize(sz_iw, 0);
+    m_w.resize(sz_w, 0);
+    m_mem = m_func.checkout();
+  }
+
+  ~CasadiFunction() { m_func.release(m_mem); }
+
+  // the checked out memory can only be released once
+  CasadiFunction(const CasadiFunction &) = delete;
+  CasadiFunction &operator=(const CasadiFunction &) = delete;
+
+  void operator()()
+  {
+    m_func(m_arg.data(), m_res.data(), m_iw.data(), m_w.data(), m_mem);
+  }
+
+  std::vector<const realtype *> m_arg;
+  std::vector<realtype *> m_res;
+
+private:
+  const Function &m_func;
+  std::vector<casadi_int> m_iw;
+  std::vector<realtype> m_w;
+  int m_mem;
+};
+
+// The casadi functions (and work buffers) passed as user data to the sundials
+// callbacks of solve_casadi. The functions are
+//
+// - residuals(t, y, yp, inputs) = F(t, y, p) - M yp
+// - jac_times_cjmass(t, y, inputs, cj) = dF/dy - cj * M, with a fixed sparsity
+// - sensitivities(t, y, yp, yS, ypS, inputs) = dF/dy yS - M ypS + dF/dp
+// - events(t, y, inputs)
+class CasadiFunctions
+{
+public:
+  int number_of_states;
+  int number_of_events;
+  int number_of_parameters;
+  CasadiFunction residuals;
+  CasadiFunction jac_times_cjmass;
+  CasadiFunction sensitivities;
+  CasadiFunction events;
+  std::vector<realtype> inputs;
+
+  // sparsity pattern (CSC) of jac_times_cjmass
+  std::vector<sunindextype> jac_colptrs;
+  std::vector<sunindextype> jac_rowvals;
+
+  // column-major (number_of_states x number_of_parameters) buffers for the
+  // sensitivity equations
+  std::vector<realtype> yS;
+  std::vector<realtype> ypS;
+  std::vector<realtype> resvalS;
+
+  CasadiFunctions(const Function &res, const Function &jac,
+                  const Function &sens, const Function &event, const int n_s,
+                  const int n_e, const int n_p,
+                  const std::vector<realtype> &inputs_in)
+      : number_of_states(n_s), number_of_events(n_e), number_of_parameters(n_p),
+        residuals(res), jac_times_cjmass(jac), sensitivities(sens),
+        events(event), inputs(inputs_in), yS(n_s * n_p), ypS(n_s * n_p),
+        resvalS(n_s * n_p)
+  {
+    const casadi::Sparsity &sparsity = jac.sparsity_out(0);
+    std::vector<casadi_int> colind = sparsity.get_colind();
+    std::vector<casadi_int> row = sparsity.get_row();
+    jac_colptrs.assign(colind.begin(), colind.end());
+    jac_rowvals.assign(row.begin(), row.end());
+  }
+};
+
+#endif // PYBAMM_IDAKLU_CASADI_FUNCTIONS_HPP
@@ -13,6 +13,15 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl_bind.h>
 
+// casadi is optional: without it, models in casadi format are solved through
+// python callbacks (see `solve`)
+#ifdef IDAKLU_WITH_CASADI
+#include "casadi_functions.hpp"
+#endif
+
+#include <algorithm>
+#include <string>
+
 //#include <iostream>
 namespace py = pybind11;
 
@@ -293,6 +302,109 @@ int sensitivities(int Ns, realtype t, N_Vector yy, N_Vector yp,
   return 0;
 }
 
+#ifdef IDAKLU_WITH_CASADI
+int residual_casadi(realtype tres, N_Vector yy, N_Vector yp, N_Vector rr,
+                    void *user_data)
+{
+  CasadiFunctions *p_casadi_functions =
+      static_cast<CasadiFunctions *>(user_data);
+
+  CasadiFunction &residuals = p_casadi_functions->residuals;
+  residuals.m_arg[0] = &tres;
+  residuals.m_arg[1] = N_VGetArrayPointer(yy);
+  residuals.m_arg[2] = N_VGetArrayPointer(yp);
+  residuals.m_arg[3] = p_casadi_functions->inputs.data();
+  residuals.m_res[0] = N_VGetArrayPointer(rr);
+  residuals();
+
+  return 0;
+}
+
+int jacobian_casadi(realtype tt, realtype cj, N_Vector yy, N_Vector yp,
+                    N_Vector resvec, SUNMatrix JJ, void *user_data,
+                    N_Vector tempv1, N_Vector tempv2, N_Vector tempv3)
+{
+  CasadiFunctions *p_casadi_functions =
+      static_cast<CasadiFunctions *>(user_data);
+
+  // the values are written directly into the (CSC) jacobian matrix
+  CasadiFunction &jac_times_cjmass = p_casadi_functions->jac_times_cjmass;
+  jac_times_cjmass.m_arg[0] = &tt;
+  jac_times_cjmass.m_arg[1] = N_VGetArrayPointer(yy);
+  jac_times_cjmass.m_arg[2] = p_casadi_functions->inputs.data();
+  jac_times_cjmass.m_arg[3] = &cj;
+  jac_times_cjmass.m_res[0] = SUNSparseMatrix_Data(JJ);
+  jac_times_cjmass();
+
+  // the sparsity pattern is fixed, but sundials zeros the whole matrix
+  // (including the index arrays) before each call, so copy it across again
+  std::copy(p_casadi_functions->jac_colptrs.begin(),
+            p_casadi_functions->jac_colptrs.end(),
+            SUNSparseMatrix_IndexPointers(JJ));
+  std::copy(p_casadi_functions->jac_rowvals.begin(),
+            p_casadi_functions->jac_rowvals.end(),
+            SUNSparseMatrix_IndexValues(JJ));
+
+  return 0;
+}
+
+int events_casadi(realtype t, N_Vector yy, N_Vector yp, realtype *events_ptr,
+                  void *user_data)
+{
+  CasadiFunctions *p_casadi_functions =
+      static_cast<CasadiFunctions *>(user_data);
+
+  CasadiFunction &events = p_casadi_functions->events;
+  events.m_arg[0] = &t;
+  events.m_arg[1] = N_VGetArrayPointer(yy);
+  events.m_arg[2] = p_casadi_functions->inputs.data();
+  events.m_res[0] = events_ptr;
+  events();
+
+  return 0;
+}
+
+int sensitivities_casadi(int Ns, realtype t, N_Vector yy, N_Vector yp,
+                         N_Vector resval, N_Vector *yS, N_Vector *ypS,
+                         N_Vector *resvalS, void *user_data, N_Vector tmp1,
+                         N_Vector tmp2, N_Vector tmp3)
+{
+  // See sensitivities() for a description of the arguments
+  CasadiFunctions *p_casadi_functions =
+      static_cast<CasadiFunctions *>(user_data);
+
+  const int n = p_casadi_functions->number_of_states;
+
+  // gather the sensitivity vectors into the (column-major) work buffers
+  for (int i = 0; i < Ns; i++)
+  {
+    const realtype *ySval = N_VGetArrayPointer(yS[i]);
+    const realtype *ypSval = N_VGetArrayPointer(ypS[i]);
+    std::copy(ySval, ySval + n, p_casadi_functions->yS.begin() + i * n);
+    std::copy(ypSval, ypSval + n, p_casadi_functions->ypS.begin() + i * n);
+  }
+
+  CasadiFunction &sensitivities = p_casadi_functions->sensitivities;
+  sensitivities.m_arg[0] = &t;
+  sensitivities.m_arg[1] = N_VGetArrayPointer(yy);
+  sensitivities.m_arg[2] = N_VGetArrayPointer(yp);
+  sensitivities.m_arg[3] = p_casadi_functions->yS.data();
+  sensitivities.m_arg[4] = p_casadi_functions->ypS.data();
+  sensitivities.m_arg[5] = p_casadi_functions->inputs.data();
+  sensitivities.m_res[0] = p_casadi_functions->resvalS.data();
+  sensitivities();
+
+  for (int i = 0; i < Ns; i++)
+  {
+    std::copy(p_casadi_functions->resvalS.begin() + i * n,
+              p_casadi_functions->resvalS.begin() + (i + 1) * n,
+              N_VGetArrayPointer(resvalS[i]));
+  }
+
+  return 0;
+}
+#endif
+
 class Solution
 {
 public:
@@ -307,14 +419,14 @@ public:
   np_array yS;
 };
 
-/* main program */
-Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
-               residual_type res, jacobian_type jac, 
-               sensitivities_type sens,
-               jac_get_type gjd, jac_get_type gjrv, jac_get_type gjcp, 
-               int nnz, event_type event,
-               int number_of_events, int use_jacobian, np_array rhs_alg_id,
-               np_array atol_np, double rel_tol, int number_of_parameters)
+/* solve with IDAS, given the sundials callbacks, the user data that is passed
+ * to them and the (sparse) jacobian matrix used by the KLU linear solver */
+Solution solve_ida(np_array t_np, np_array y0_np, np_array yp0_np,
+                   IDAResFn res, IDALsJacFn jac, IDASensResFn sens,
+                   IDARootFn event, void *user_data, SUNMatrix J,
+                   int number_of_events, int use_jacobian,
+                   np_array rhs_alg_id, np_array atol_np, double rel_tol,
+                   int number_of_parameters)
 {
   auto t = t_np.unchecked<1>();
   auto y0 = y0_np.unchecked<1>();
@@ -328,7 +440,6 @@ Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
   N_Vector *yyS, *ypS;      // y, y' for sensitivities
   realtype rtol, *yval, *ypval, *atval, *ySval;
   int retval;
-  SUNMatrix J;
   SUNLinearSolver LS;
 
   // allocate vectors
@@ -366,7 +477,7 @@ Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
 
   // initialise solver
   realtype t0 = RCONST(t(0));
-  IDAInit(ida_mem, residual, t0, yy, yp);
+  IDAInit(ida_mem, res, t0, yy, yp);
 
   // set tolerances
   rtol = RCONST(rel_tol);
@@ -374,30 +485,24 @@ Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
   IDASVtolerances(ida_mem, rtol, avtol);
 
   // set events
-  IDARootInit(ida_mem, number_of_events, events);
+  IDARootInit(ida_mem, number_of_events, event);
 
-  // set pybamm functions by passing pointer to it
-  PybammFunctions pybamm_functions(res, jac, sens, gjd, gjrv, gjcp, event,
-                                   number_of_states, number_of_events,
-                                   number_of_parameters);
-  void *user_data = &pybamm_functions;
+  // set user data (passed to the callbacks)
   IDASetUserData(ida_mem, user_data);
 
   // set linear solver
-  J = SUNSparseMatrix(number_of_states, number_of_states, nnz, CSR_MAT);
-
   LS = SUNLinSol_KLU(yy, J);
   IDASetLinearSolver(ida_mem, LS, J);
 
   if (use_jacobian == 1)
   {
-    IDASetJacFn(ida_mem, jacobian);
+    IDASetJacFn(ida_mem, jac);
   }
 
   if (number_of_parameters > 0)
   {
     IDASensInit(ida_mem, number_of_parameters, 
-                IDA_SIMULTANEOUS, sensitivities, yyS, ypS);
+                IDA_SIMULTANEOUS, sens, yyS, ypS);
     IDASensEEtolerances(ida_mem);
   }
 
@@ -477,7 +582,6 @@ Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
   }
   IDAFree(&ida_mem);
   SUNLinSolFree(LS);
-  SUNMatDestroy(J);
   N_VDestroy(avtol);
   N_VDestroy(yp);
   if (number_of_parameters > 0) {
@@ -497,6 +601,83 @@ Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
   return sol;
 }
 
+/* main program, calling python functions */
+Solution solve(np_array t_np, np_array y0_np, np_array yp0_np,
+               residual_type res, jacobian_type jac, 
+               sensitivities_type sens,
+               jac_get_type gjd, jac_get_type gjrv, jac_get_type gjcp, 
+               int nnz, event_type event,
+               int number_of_events, int use_jacobian, np_array rhs_alg_id,
+               np_array atol_np, double rel_tol, int number_of_parameters)
+{
+  int number_of_states = y0_np.request().size;
+
+  // set pybamm functions by passing pointer to it
+  PybammFunctions pybamm_functions(res, jac, sens, gjd, gjrv, gjcp, event,
+                                   number_of_states, number_of_events,
+                                   number_of_parameters);
+
+  SUNMatrix J = SUNSparseMatrix(number_of_states, number_of_states, nnz,
+                                CSR_MAT);
+
+  Solution sol = solve_ida(t_np, y0_np, yp0_np, residual, jacobian,
+                           sensitivities, events, &pybamm_functions, J,
+                           number_of_events, use_jacobian, rhs_alg_id, atol_np,
+                           rel_tol, number_of_parameters);
+
+  SUNMatDestroy(J);
+
+  return sol;
+}
+
+#ifdef IDAKLU_WITH_CASADI
+/* main program, calling casadi functions directly (i.e. without going through
+ * python during the integration) */
+Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
+                      const Function &residuals,
+                      const Function &jac_times_cjmass,
+                      const Function &sens, const Function &event,
+                      int number_of_events, int use_jacobian,
+                      np_array rhs_alg_id, np_array atol_np, double rel_tol,
+                      np_array inputs_np, int number_of_parameters)
+{
+  int number_of_states = y0_np.request().size;
+
+  auto inputs_np_val = inputs_np.unchecked<1>();
+  std::vector<realtype> inputs(inputs_np_val.shape(0));
+  for (int i = 0; i < inputs.size(); i++)
+  {
+    inputs[i] = inputs_np_val[i];
+  }
+
+  CasadiFunctions casadi_functions(residuals, jac_times_cjmass, sens, event,
+                                   number_of_states, number_of_events,
+                                   number_of_parameters, inputs);
+
+  // casadi uses the CSC format, and the sparsity pattern of the jacobian is
+  // fixed, so the matrix can be allocated with the right number of nonzeros
+  SUNMatrix J = SUNSparseMatrix(number_of_states, number_of_states,
+                                casadi_functions.jac_rowvals.size(), CSC_MAT);
+
+  Solution sol = solve_ida(t_np, y0_np, yp0_np, residual_casadi,
+                           jacobian_casadi, sensitivities_casadi,
+                           events_casadi, &casadi_functions, J,
+                           number_of_events, use_jacobian, rhs_alg_id, atol_np,
+                           rel_tol, number_of_parameters);
+
+  SUNMatDestroy(J);
+
+  return sol;
+}
+
+/* create a casadi function from its serialized form (see
+ * casadi.Function.serialize) */
+Function generate_function(const std::string &data)
+{
+  return Function::deserialize(data);
+}
+#endif
+
 PYBIND11_MODULE(idaklu, m)
 {
   m.doc() = "sundials solvers"; // optional module docstring
@@ -512,6 +693,22 @@ PYBIND11_MODULE(idaklu, m)
         py::arg("number_of_sensitivity_parameters"),
         py::return_value_policy::take_ownership);
 
+#ifdef IDAKLU_WITH_CASADI
+  m.def("solve_casadi", &solve_casadi,
+        "The solve function, calling casadi functions directly", py::arg("t"),
+        py::arg("y0"), py::arg("yp0"), py::arg("residuals"),
+        py::arg("jac_times_cjmass"), py::arg("sens"), py::arg("events"),
+        py::arg("number_of_events"), py::arg("use_jacobian"),
+        py::arg("rhs_alg_id"), py::arg("atol"), py::arg("rtol"),
+        py::arg("inputs"), py::arg("number_of_sensitivity_parameters"),
+        py::return_value_policy::take_ownership);
+
+  m.def("generate_function", &generate_function,
+        "Create a casadi function from its serialized form", py::arg("data"));
+
+  py::class_<Function>(m, "Function");
+#endif
+
   py::class_<Solution>(m, "solution")
       .def_readwrite("t", &Solution::t)
       .def_readwrite("y", &Solution::y)
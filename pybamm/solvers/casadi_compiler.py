@@ -0,0 +1,169 @@
+#
+# Compile casadi functions to shared libraries
+#
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+
+import casadi
+
+import pybamm
+
+
+class CasadiCompiler(object):
+    """
+    Compiles casadi functions into shared libraries, which are cached on disk and
+    loaded with :func:`casadi.external`.
+
+    This is used for models with `convert_to_format = "compiled"`: the functions
+    created by the solver when setting up the model (rhs, algebraic equations,
+    jacobians, events, initial conditions) and by the solution when processing
+    variables are expanded into scalar operations where possible, written to C with
+    :class:`casadi.CodeGenerator`, as in :meth:`pybamm.BaseModel.generate`, and
+    compiled, so that they are evaluated as machine code instead of by casadi's
+    virtual machine. This makes each evaluation faster (several times faster for the
+    DFN model), at the cost of compiling the functions the first time that they are
+    used.
+
+    Compiled libraries are named after a hash of their C code (and of the compiler
+    and flags used), so a function is only compiled once, and later runs (in any
+    Python process) load the library from the cache. The global compiler used by
+    the solvers is `pybamm.casadi_compiler`.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory in which to store the compiled libraries. Default is
+        "pybamm/compiled" in the user's cache directory (given by the
+        "XDG_CACHE_HOME" environment variable, or "~/.cache").
+    compiler : str, optional
+        The C compiler to use. Default is the "CC" environment variable, or "cc".
+    flags : list of str, optional
+        Flags to pass to the compiler, in addition to those needed to build a shared
+        library. Default is ["-O1"], which compiles large models much faster than
+        higher optimisation levels for a similar speed of evaluation.
+    """
+
+    def __init__(self, directory=None, compiler=None, flags=None):
+        if directory is None:
+            cache_home = os.environ.get(
+                "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+            )
+            directory = os.path.join(cache_home, "pybamm", "compiled")
+        self.directory = directory
+        self.compiler = compiler or os.environ.get("CC", "cc")
+        self.flags = ["-O1"] if flags is None else list(flags)
+
+    def compile(self, function, derivatives=True):
+        """
+        Compile a casadi function, or load it from the cache if it has already been
+        compiled.
+
+        Parameters
+        ----------
+        function : :class:`casadi.Function`
+            The function to compile
+        derivatives : bool, optional
+            Whether to also compile the first-order derivatives of the function
+            (jacobian, forward and reverse mode), which casadi needs to differentiate
+            expressions that call the compiled function (e.g. in the integrators).
+            Default is True.
+
+        Returns
+        -------
+        :class:`casadi.Function`
+            The compiled function, with the same name, inputs and outputs as
+            `function`
+        """
+        name = function.name()
+        try:
+            # Scalar (SX) functions generate much faster code than matrix (MX)
+            # functions, whose code still calls generic sparse matrix routines
+            function = function.expand()
+        except RuntimeError:
+            # Some functions (e.g. some interpolants) cannot be expanded
+            pass
+        functions = [function]
+        if derivatives:
+            functions += [function.jacobian(), function.forward(1), function.reverse(1)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = os.path.join(tmp_dir, name + ".c")
+            generator = casadi.CodeGenerator(name + ".c", {"with_header": False})
+            for func in functions:
+                generator.add(func)
+            generator.generate(tmp_dir + os.sep)
+            with open(source_path) as f:
+                source = _patch_source(f.read())
+            with open(source_path, "w") as f:
+                f.write(source)
+
+            hasher = hashlib.sha256(source.encode())
+            hasher.update(casadi.__version__.encode())
+            hasher.update(" ".join([self.compiler] + self.flags).encode())
+            library_path = os.path.join(
+                self.directory, "{}_{}.so".format(name, hasher.hexdigest()[:32])
+            )
+            if not os.path.exists(library_path):
+                self._build(source_path, library_path)
+            else:
+                pybamm.logger.debug(
+                    "Loading compiled '{}' from {}".format(name, library_path)
+                )
+
+        return casadi.external(name, library_path)
+
+    def _build(self, source_path, library_path):
+        """Compile the C file `source_path` into the shared library `library_path`"""
+        pybamm.logger.verbose("Compiling {}".format(os.path.basename(library_path)))
+        os.makedirs(self.directory, exist_ok=True)
+        # Compile to a temporary file first, so that other processes never load a
+        # partially-written library
+        fd, tmp_path = tempfile.mkstemp(suffix=".so", dir=self.directory)
+        os.close(fd)
+        command = [self.compiler, "-shared", "-fPIC"] + self.flags
+        if sys.platform.startswith("linux"):
+            # Fail at compile time, rather than when the function is called, if
+            # anything is undefined
+            command.append("-Wl,-z,defs")
+        command += [source_path, "-o", tmp_path, "-lm"]
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+            os.replace(tmp_path, library_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            message = getattr(e, "stderr", None) or str(e)
+            raise pybamm.SolverError(
+                "Could not compile casadi function with '{}': {}".format(
+                    " ".join(command), message
+                )
+            )
+
+    def clear(self):
+        """Remove all the compiled libraries from the cache"""
+        if os.path.isdir(self.directory):
+            for filename in os.listdir(self.directory):
+                if filename.endswith(".so"):
+                    os.remove(os.path.join(self.directory, filename))
+
+
+def _patch_source(source):
+    """
+    Define the casadi helpers that the code generator uses without defining them
+    (e.g. `casadi_fmin` in the code for the minimum of a vector)
+    """
+    for helper in ["fmin", "fmax"]:
+        name = "casadi_" + helper
+        if name + "(" in source and "#define " + name + " " not in source:
+            source = source.replace(
+                "#include <math.h>\n",
+                "#include <math.h>\n#define {} {}\n".format(name, helper),
+                1,
+            )
+    return source
+
+
+casadi_compiler = CasadiCompiler()
@@ -2,6 +2,7 @@
 # CasADi Solver class
 #
 import casadi
+import os
 import pybamm
 import numpy as np
 from scipy.interpolate import interp1d
@@ -62,6 +63,21 @@ class CasadiSolver(pybamm.BaseSolver):
         Any options to pass to the CasADi integrator when calling the integrator.
         Please consult `CasADi documentation <https://tinyurl.com/y5rk76os>`_ for
         details.
+    batch_parallelisation : str, optional
+        How to integrate the model when solving for a list of inputs. If None
+        (default), each set of inputs is integrated in a separate process (see
+        :meth:`pybamm.BaseSolver.solve`). Otherwise, all the sets of inputs are
+        integrated in a single call to the CasADi integrator, mapped over the inputs
+        using `casadi.Function.map` with the given parallelisation strategy:
+
+            - "serial": integrate the sets of inputs one after the other
+            - "thread": integrate the sets of inputs in parallel threads. The \
+            maximum number of threads is given by the `nproc` argument of \
+            :meth:`pybamm.BaseSolver.solve`
+            - "openmp": integrate the sets of inputs in parallel using OpenMP \
+            (falls back to "serial" if CasADi was compiled without OpenMP)
+
+        Can only be used in "fast" or "fast with events" mode.
     """
 
     def __init__(
@@ -76,6 +92,7 @@ class CasadiSolver(pybamm.BaseSolver):
         extrap_tol=0,
         extra_options_setup=None,
         extra_options_call=None,
+        batch_parallelisation=None,
     ):
         super().__init__(
             "problem dependent",
@@ -93,6 +110,20 @@ class CasadiSolver(pybamm.BaseSolver):
                 "'fast', for solving quickly without events, or 'safe without grid' or "
                 "'fast with events' (both experimental)".format(mode)
             )
+        if batch_parallelisation not in [None, "serial", "thread", "openmp"]:
+            raise ValueError(
+                "invalid batch_parallelisation '{}'. Must be None, 'serial', 'thread' "
+                "or 'openmp'".format(batch_parallelisation)
+            )
+        if batch_parallelisation is not None and mode not in [
+            "fast",
+            "fast with events",
+        ]:
+            raise ValueError(
+                "batch_parallelisation can only be used in 'fast' or "
+                "'fast with events' mode"
+            )
+        self.batch_parallelisation = batch_parallelisation
         self.max_step_decrease_count = max_step_decrease_count
         self.dt_max = dt_max
 
@@ -105,10 +136,20 @@ class CasadiSolver(pybamm.BaseSolver):
         # Initialize
         self.integrators = {}
         self.integrator_specs = {}
+        self.mapped_integrators = {}
         self.y_sols = {}
 
         pybamm.citations.register("Andersson2019")
 
+    def __getstate__(self):
+        # the integrator problems contain symbolic casadi objects, which cannot be
+        # pickled, but the integrators can be created again from the model
+        state = self.__dict__.copy()
+        state["integrators"] = {}
+        state["integrator_specs"] = {}
+        state["mapped_integrators"] = {}
+        return state
+
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
         Solve a DAE model defined by residuals with initial conditions y0.
@@ -278,6 +319,107 @@ class CasadiSolver(pybamm.BaseSolver):
 
             return solution
 
+    def _integrate_multiple_inputs(self, model, t_eval, inputs_list, nproc=None):
+        """
+        Integrate a model for several sets of inputs. If `batch_parallelisation` is
+        not None, all the sets of inputs are integrated in a single call to a mapped
+        CasADi integrator. Otherwise, see
+        :meth:`pybamm.BaseSolver._integrate_multiple_inputs`.
+        """
+        if self.batch_parallelisation is None:
+            return super()._integrate_multiple_inputs(model, t_eval, inputs_list, nproc)
+
+        ninputs = len(inputs_list)
+        inputs = [casadi.vertcat(*[x for x in inp.values()]) for inp in inputs_list]
+
+        # Calculate initial event signs for each set of inputs
+        if self.mode == "fast with events" and model.terminate_events_eval:
+            all_init_event_signs = [
+                np.sign(
+                    np.concatenate(
+                        [
+                            event(t_eval[0], model.y0, inp)
+                            for event in model.terminate_events_eval
+                        ]
+                    )
+                )
+                for inp in inputs
+            ]
+        else:
+            all_init_event_signs = [np.sign([])] * ninputs
+
+        integrator = self.create_integrator(
+            model,
+            inputs[0],
+            t_eval,
+            use_event_switch=self.mode == "fast with events",
+        )
+        mapped_integrator = self.create_mapped_integrator(
+            model, integrator, t_eval, ninputs, nproc
+        )
+
+        len_rhs = model.concatenated_rhs.size
+        if model.calculate_sensitivities:
+            len_rhs *= model.len_rhs_sens // model.len_rhs + 1
+        y0 = model.y0
+        x0 = casadi.repmat(y0[:len_rhs], 1, ninputs)
+        z0 = casadi.repmat(y0[len_rhs:], 1, ninputs)
+        p = casadi.horzcat(*[casadi.vertcat(inp, t_eval[0]) for inp in inputs])
+
+        pybamm.logger.debug(
+            "Running mapped CasADi integrator for {} sets of inputs".format(ninputs)
+        )
+        try:
+            timer = pybamm.Timer()
+            casadi_sol = mapped_integrator(x0=x0, z0=z0, p=p, **self.extra_options_call)
+            integration_time = timer.time()
+        except RuntimeError as e:
+            raise pybamm.SolverError(e.args[0])
+
+        # Outputs of the mapped integrator are the outputs of each integrator,
+        # concatenated horizontally
+        n_t = len(t_eval)
+        y_sols = casadi.horzsplit(
+            casadi.vertcat(casadi_sol["xf"], casadi_sol["zf"]), n_t
+        )
+        solutions = []
+        for y_sol, inputs_dict, init_event_signs in zip(
+            y_sols, inputs_list, all_init_event_signs
+        ):
+            solution = pybamm.Solution(
+                t_eval,
+                y_sol,
+                model,
+                inputs_dict,
+                sensitivities=bool(model.calculate_sensitivities),
+            )
+            solution.integration_time = integration_time
+            solutions.append(self._solve_for_event(solution, init_event_signs))
+        return solutions
+
+    def create_mapped_integrator(self, model, integrator, t_eval, ninputs, nproc=None):
+        """
+        Method to create a casadi integrator that integrates `ninputs` sets of inputs
+        at once, by mapping `integrator` using the `batch_parallelisation` strategy.
+        """
+        t_eval_shifted_rounded = np.round(t_eval - t_eval[0], decimals=12).tobytes()
+        # the number of threads only matters in "thread" mode
+        if self.batch_parallelisation != "thread":
+            nproc = None
+        key = (t_eval_shifted_rounded, ninputs, nproc)
+        mapped_integrators = self.mapped_integrators.setdefault(model, {})
+        if key not in mapped_integrators:
+            pybamm.logger.debug("Creating mapped CasADi integrator")
+            if self.batch_parallelisation == "thread":
+                mapped_integrators[key] = integrator.map(
+                    ninputs, "thread", nproc or os.cpu_count()
+                )
+            else:
+                mapped_integrators[key] = integrator.map(
+                    ninputs, self.batch_parallelisation
+                )
+        return mapped_integrators[key]
+
     def _solve_for_event(self, coarse_solution, init_event_signs):
         """
         Check if the sign of an event changes, if so find an accurate
@@ -41,6 +41,13 @@ class IDAKLUSolver(pybamm.BaseSolver):
         The tolerance for the initial-condition solver (default is 1e-6).
     extrap_tol : float, optional
         The tolerance to assert whether extrapolation occurs or not (default is 0).
+
+    Notes
+    -----
+    If the model is in casadi format (the default), and the KLU extension has been
+    compiled with casadi, the residuals, jacobian, events and sensitivity equations
+    are evaluated by calling the casadi functions directly from C++, so that the
+    integration does not need to go through Python at each step.
     """
 
     def __init__(
@@ -66,10 +73,24 @@ class IDAKLUSolver(pybamm.BaseSolver):
             max_steps,
         )
         self.name = "IDA KLU solver"
+        # casadi functions called directly by the KLU extension, keyed by model
+        self.casadi_functions = {}
 
         pybamm.citations.register("Hindmarsh2000")
         pybamm.citations.register("Hindmarsh2005")
 
+    def __getstate__(self):
+        # the casadi functions created by the extension cannot be pickled, but can
+        # be created again from the model
+        state = self.__dict__.copy()
+        state["casadi_functions"] = {}
+        return state
+
+    def set_up(self, model, inputs=None, t_eval=None, ics_only=False):
+        # any casadi functions previously created for the model are out of date
+        self.casadi_functions.pop(model, None)
+        super().set_up(model, inputs, t_eval, ics_only)
+
     def set_atol_by_variable(self, variables_with_tols, model):
         """
         A method to set the absolute tolerances in the solver by state variable.
@@ -159,7 +180,9 @@ class IDAKLUSolver(pybamm.BaseSolver):
             Any external variables or input parameters to pass to the model when solving
         """
         inputs_dict = inputs_dict or {}
-        if model.rhs_eval.form == "casadi":
+        if model.rhs_eval.form == "casadi" and hasattr(idaklu, "solve_casadi"):
+            return self._integrate_casadi(model, t_eval, inputs_dict)
+        elif model.rhs_eval.form == "casadi":  # pragma: no cover
             # stack inputs
             inputs = casadi.vertcat(*[x for x in inputs_dict.values()])
             # raise warning about casadi format being slow
@@ -175,17 +198,8 @@ class IDAKLUSolver(pybamm.BaseSolver):
         if model.jacobian_eval is None:
             raise pybamm.SolverError("KLU requires the Jacobian to be provided")
 
-        try:
-            atol = model.atol
-        except AttributeError:
-            atol = self._atol
-
-        y0 = model.y0
-        if isinstance(y0, casadi.DM):
-            y0 = y0.full().flatten()
-
+        y0, atol = self._get_y0_and_atol(model)
         rtol = self._rtol
-        atol = self._check_atol_type(atol, y0.size)
 
         if model.convert_to_format == "jax":
             mass_matrix = model.mass_matrix.entries.toarray()
@@ -254,10 +268,11 @@ class IDAKLUSolver(pybamm.BaseSolver):
         alg_ids = np.zeros(len(y0) - len(rhs_ids))
         ids = np.concatenate((rhs_ids, alg_ids))
 
-        number_of_sensitivity_parameters = 0
+        sensitivity_names = []
         if model.sensitivities_eval is not None:
             sens0 = model.sensitivities_eval(t=0, y=y0, inputs=inputs)
-            number_of_sensitivity_parameters = len(sens0.keys())
+            sensitivity_names = list(sens0.keys())
+        number_of_sensitivity_parameters = len(sensitivity_names)
 
         def sensfn(resvalS, t, y, yp, yS, ypS):
             """
@@ -316,16 +331,175 @@ class IDAKLUSolver(pybamm.BaseSolver):
         )
         integration_time = timer.time()
 
+        return self._process_solution(
+            sol, model, inputs_dict, sensitivity_names, integration_time
+        )
+
+    def _integrate_casadi(self, model, t_eval, inputs_dict):
+        """
+        Solve a DAE model in casadi format, with the KLU extension calling the casadi
+        functions directly (see :meth:`IDAKLUSolver._create_casadi_functions`)
+        """
+        if model not in self.casadi_functions:
+            self.casadi_functions[model] = self._create_casadi_functions(
+                model, inputs_dict
+            )
+        functions = self.casadi_functions[model]
+
+        y0, atol = self._get_y0_and_atol(model)
+        # solver works with ydot0 set to zero
+        ydot0 = np.zeros_like(y0)
+        inputs = np.concatenate(
+            [np.array(x, dtype=float).reshape(-1) for x in inputs_dict.values()]
+            + [np.array([])]
+        )
+
+        # get ids of rhs and algebraic variables
+        ids = np.concatenate([np.ones(model.len_rhs), np.zeros(model.len_alg)])
+
+        timer = pybamm.Timer()
+        sol = idaklu.solve_casadi(
+            t_eval,
+            y0,
+            ydot0,
+            functions["residuals"],
+            functions["jac_times_cjmass"],
+            functions["sensitivities"],
+            functions["events"],
+            len(model.terminate_events_eval),
+            1,
+            ids,
+            atol,
+            self._rtol,
+            inputs,
+            len(model.calculate_sensitivities),
+        )
+        integration_time = timer.time()
+
+        return self._process_solution(
+            sol, model, inputs_dict, model.calculate_sensitivities, integration_time
+        )
+
+    def _create_casadi_functions(self, model, inputs_dict):
+        """
+        Create the casadi functions that are called by the KLU extension:
+
+        - residuals(t, y, ydot, inputs) = F(t, y, inputs) - M ydot
+        - jac_times_cjmass(t, y, inputs, cj) = dF/dy - cj M
+        - sensitivities(t, y, ydot, yS, ypS, inputs) = dF/dy yS - M ypS + dF/dp
+        - events(t, y, inputs)
+
+        where F is the concatenated rhs and algebraic equations, M is the mass
+        matrix, and yS, ypS are (n x n_p) matrices whose columns are the
+        sensitivities of y and ydot to each of the n_p parameters in
+        `model.calculate_sensitivities`. If the model is in "compiled" format, these
+        functions are compiled (see :class:`pybamm.CasadiCompiler`). The functions are
+        serialized and deserialized by the extension, which then owns them.
+        """
+        n = model.len_rhs_and_alg
+        t_casadi = casadi.MX.sym("t")
+        y_casadi = casadi.MX.sym("y", n)
+        ydot_casadi = casadi.MX.sym("ydot", n)
+        cj_casadi = casadi.MX.sym("cj")
+        # the inputs are stacked in the same order as in set_up
+        offsets = {}
+        size = 0
+        for name, value in inputs_dict.items():
+            offsets[name] = size
+            size += np.size(value)
+        p_casadi = casadi.MX.sym("p", size)
+
+        rhs_algebraic = casadi.vertcat(
+            model.rhs_eval._function(t_casadi, y_casadi, p_casadi),
+            model.algebraic_eval._function(t_casadi, y_casadi, p_casadi),
+        )
+        mass_matrix = casadi.DM(model.mass_matrix.entries)
+        jac_y = casadi.jacobian(rhs_algebraic, y_casadi)
+
+        residuals = casadi.Function(
+            "residuals",
+            [t_casadi, y_casadi, ydot_casadi, p_casadi],
+            [rhs_algebraic - mass_matrix @ ydot_casadi],
+        )
+        jac_times_cjmass = casadi.Function(
+            "jac_times_cjmass",
+            [t_casadi, y_casadi, p_casadi, cj_casadi],
+            [jac_y - cj_casadi * mass_matrix],
+        )
+        events = casadi.Function(
+            "events",
+            [t_casadi, y_casadi, p_casadi],
+            [
+                casadi.vertcat(
+                    *[
+                        event._function(t_casadi, y_casadi, p_casadi)
+                        for event in model.terminate_events_eval
+                    ]
+                )
+            ],
+        )
+
+        n_p = len(model.calculate_sensitivities)
+        yS_casadi = casadi.MX.sym("yS", n, n_p)
+        ypS_casadi = casadi.MX.sym("ypS", n, n_p)
+        if n_p > 0:
+            jac_p = casadi.jacobian(rhs_algebraic, p_casadi)
+            dFdp = casadi.horzcat(
+                *[jac_p[:, offsets[name]] for name in model.calculate_sensitivities]
+            )
+            sens = jac_y @ yS_casadi - mass_matrix @ ypS_casadi + dFdp
+        else:
+            sens = casadi.MX(n, 0)
+        sensitivities = casadi.Function(
+            "sensitivities",
+            [t_casadi, y_casadi, ydot_casadi, yS_casadi, ypS_casadi, p_casadi],
+            [sens],
+        )
+
+        functions = [
+            ("residuals", residuals),
+            ("jac_times_cjmass", jac_times_cjmass),
+            ("sensitivities", sensitivities),
+            ("events", events),
+        ]
+        if model.convert_to_format == "compiled":
+            functions = [
+                (name, pybamm.casadi_compiler.compile(func, derivatives=False))
+                for name, func in functions
+            ]
+        return {
+            name: idaklu.generate_function(func.serialize())
+            for name, func in functions
+        }
+
+    def _get_y0_and_atol(self, model):
+        try:
+            atol = model.atol
+        except AttributeError:
+            atol = self._atol
+
+        y0 = model.y0
+        if isinstance(y0, casadi.DM):
+            y0 = y0.full().flatten()
+
+        atol = self._check_atol_type(atol, y0.size)
+        return y0, atol
+
+    def _process_solution(
+        self, sol, model, inputs_dict, sensitivity_names, integration_time
+    ):
+        """Convert the solution returned by the KLU extension to a pybamm.Solution"""
         t = sol.t
         number_of_timesteps = t.size
-        number_of_states = y0.size
+        number_of_states = model.y0.shape[0]
         y_out = sol.y.reshape((number_of_timesteps, number_of_states))
 
         # return sensitivity solution, we need to flatten yS to
         # (#timesteps * #states,) to match format used by Solution
-        if number_of_sensitivity_parameters != 0:
+        if len(sensitivity_names) != 0:
             yS_out = {
-                name: sol.yS[i].reshape(-1, 1) for i, name in enumerate(sens0.keys())
+                name: sol.yS[i].reshape(-1, 1)
+                for i, name in enumerate(sensitivity_names)
             }
         else:
             yS_out = False
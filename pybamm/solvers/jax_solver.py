@@ -3,6 +3,9 @@
 #
 import pybamm
 
+import collections
+import weakref
+
 import jax
 from jax.experimental.ode import odeint
 import jax.numpy as jnp
@@ -25,6 +28,12 @@ class JaxSolver(pybamm.BaseSolver):
     RuntimeError
         if `model.convert_to_format != 'jax'`
 
+    Several sets of inputs can be solved at once, by passing a list of input
+    dictionaries (or a dictionary of stacked inputs, see :meth:`JaxSolver.solve`) to
+    `solve`. The solve function is then vectorised over the sets of inputs with
+    :func:`jax.vmap` and compiled into a single function, instead of solving each set
+    of inputs separately.
+
     Parameters
     ----------
     method: str
@@ -45,8 +54,19 @@ class JaxSolver(pybamm.BaseSolver):
         Please consult `JAX documentation
         <https://github.com/google/jax/blob/master/jax/experimental/ode.py>`_
         for details.
+    cache_dir : str, optional
+        If given, enable JAX's persistent compilation cache in this directory (see
+        :meth:`JaxSolver.set_compilation_cache_dir`), so that the compiled
+        solve functions are reused by later Python processes.
     """
 
+    # Jitted solve functions, shared by all the solvers (see `create_solve`), with the
+    # least recently used ones removed once there are more than `max_compiled_solves`
+    _compiled_solves = collections.OrderedDict()
+    max_compiled_solves = 32
+    # Fingerprints of the equations of each model
+    _model_fingerprints = weakref.WeakKeyDictionary()
+
     def __init__(
         self,
         method="RK45",
@@ -55,6 +75,7 @@ class JaxSolver(pybamm.BaseSolver):
         atol=1e-6,
         extrap_tol=0,
         extra_options=None,
+        cache_dir=None,
     ):
         # note: bdf solver itself calculates consistent initial conditions so can set
         # root_method to none, allow user to override this behavior
@@ -69,10 +90,11 @@ class JaxSolver(pybamm.BaseSolver):
             self.ode_solver = True
         self.extra_options = extra_options or {}
         self.name = "JAX solver ({})".format(method)
-        self._cached_solves = dict()
+        if cache_dir is not None:
+            self.set_compilation_cache_dir(cache_dir)
         pybamm.citations.register("jax2018")
 
-    def get_solve(self, model, t_eval):
+    def get_solve(self, model, t_eval, batched=False):
         """
         Return a compiled JAX function that solves an ode model with input arguments.
 
@@ -82,6 +104,9 @@ class JaxSolver(pybamm.BaseSolver):
             The model whose solution to calculate.
         t_eval : :class:`numpy.array`, size (k,)
             The times at which to compute the solution
+        batched : bool, optional
+            Whether to return a function that solves for several sets of inputs at
+            once (see :meth:`JaxSolver.create_solve`). Default is False.
 
         Returns
         -------
@@ -90,26 +115,40 @@ class JaxSolver(pybamm.BaseSolver):
             any input parameters to pass to the model when solving
 
         """
-        if model not in self._cached_solves:
-            if model not in self.models_set_up:
-                raise RuntimeError(
-                    "Model is not set up for solving, run" "`solver.solve(model)` first"
-                )
-
-            self._cached_solves[model] = self.create_solve(model, t_eval)
+        if model not in self.models_set_up:
+            raise RuntimeError(
+                "Model is not set up for solving, run" "`solver.solve(model)` first"
+            )
 
-        return self._cached_solves[model]
+        return self.create_solve(model, t_eval, batched=batched)
 
-    def create_solve(self, model, t_eval):
+    def create_solve(self, model, t_eval, batched=False):
         """
         Return a compiled JAX function that solves an ode model with input arguments.
 
+        The function is a wrapper around a jitted function of the times, initial
+        conditions and inputs, which is cached (see :meth:`JaxSolver.clear_cache`)
+        with a key made of a fingerprint of the model equations and of the method,
+        tolerances and options of the solver, so that it is shared by all the
+        models with the same equations and all the solvers with the same settings.
+        JAX compiles the function once for each length of `t_eval` and shape of the
+        inputs, so that solving again with a different `t_eval` (or different
+        initial conditions) does not recompile it unless the number of times changes.
+        At most `JaxSolver.max_compiled_solves` functions are kept in the cache, and
+        they do not keep a reference to the model or the solver.
+
         Parameters
         ----------
         model : :class:`pybamm.BaseModel`
             The model whose solution to calculate.
         t_eval : :class:`numpy.array`, size (k,)
             The times at which to compute the solution
+        batched : bool, optional
+            If True, the function is vectorised with :func:`jax.vmap`, so that it
+            solves for several sets of inputs at once: each input must then be
+            stacked, with the sets of inputs along the first axis, and the solution
+            has shape (number of sets of inputs, number of states, k). Default is
+            False.
 
         Returns
         -------
@@ -135,49 +174,208 @@ class JaxSolver(pybamm.BaseSolver):
                 " end-time".format(model.events)
             )
 
+        compiled_solve = self._get_compiled_solve(model, batched)
+        t_eval = jnp.asarray(t_eval, dtype=float)
         # Initial conditions, make sure they are an 0D array
         y0 = jnp.array(model.y0).reshape(-1)
+
+        def solve(inputs):
+            return compiled_solve(t_eval, y0, inputs)
+
+        return solve
+
+    def _get_compiled_solve(self, model, batched):
+        """
+        Return the jitted function `f(t_eval, y0, inputs)` that solves `model`, from
+        the cache if possible
+        """
+        key = (
+            self._model_fingerprint(model),
+            self.method,
+            self.rtol,
+            self.atol,
+            repr(sorted(self.extra_options.items())),
+            batched,
+        )
+        if key in JaxSolver._compiled_solves:
+            JaxSolver._compiled_solves.move_to_end(key)
+            return JaxSolver._compiled_solves[key]
+
         mass = None
         if self.method == "BDF":
             mass = model.mass_matrix.entries.toarray()
 
+        # The cached function must not keep the model (or the solver, which stores
+        # the models it has set up) alive, so only refer to the jax evaluators of the
+        # equations and to the settings of the solver
+        rhs_evaluate = model.rhs_eval._function
+        algebraic_evaluate = model.algebraic_eval._function
+        rtol = self.rtol
+        atol = self.atol
+        extra_options = self.extra_options.copy()
+
         def rhs_ode(y, t, inputs):
-            return (model.rhs_eval(t, y, inputs),)
+            return (rhs_evaluate(t, y, inputs=inputs).reshape(-1),)
 
         def rhs_dae(y, t, inputs):
             return jnp.concatenate(
-                [model.rhs_eval(t, y, inputs), model.algebraic_eval(t, y, inputs)]
+                [
+                    rhs_evaluate(t, y, inputs=inputs).reshape(-1),
+                    algebraic_evaluate(t, y, inputs=inputs).reshape(-1),
+                ]
             )
 
-        def solve_model_rk45(inputs):
+        def solve_model_rk45(t_eval, y0, inputs):
             y = odeint(
-                rhs_ode,
-                y0,
-                t_eval,
-                inputs,
-                rtol=self.rtol,
-                atol=self.atol,
-                **self.extra_options
+                rhs_ode, y0, t_eval, inputs, rtol=rtol, atol=atol, **extra_options
             )
             return jnp.transpose(y)
 
-        def solve_model_bdf(inputs):
+        def solve_model_bdf(t_eval, y0, inputs):
             y = pybamm.jax_bdf_integrate(
                 rhs_dae,
                 y0,
                 t_eval,
                 inputs,
-                rtol=self.rtol,
-                atol=self.atol,
+                rtol=rtol,
+                atol=atol,
                 mass=mass,
-                **self.extra_options
+                **extra_options
             )
             return jnp.transpose(y)
 
         if self.method == "RK45":
-            return jax.jit(solve_model_rk45)
+            solve_model = solve_model_rk45
+        else:
+            solve_model = solve_model_bdf
+        if batched:
+            # Only the inputs are batched
+            solve_model = jax.vmap(solve_model, in_axes=(None, None, 0))
+        compiled_solve = jax.jit(solve_model)
+        JaxSolver._compiled_solves[key] = compiled_solve
+        while len(JaxSolver._compiled_solves) > JaxSolver.max_compiled_solves:
+            JaxSolver._compiled_solves.popitem(last=False)
+        return compiled_solve
+
+    @staticmethod
+    def _model_fingerprint(model):
+        """
+        Return a key identifying the equations of a model (see
+        :meth:`pybamm.ModelCache.key`), which is calculated again only if the
+        equations have changed
+        """
+        ids = (
+            model.concatenated_rhs.id,
+            model.concatenated_algebraic.id,
+            None if model.mass_matrix is None else model.mass_matrix.id,
+        )
+        try:
+            fingerprint_ids, fingerprint = JaxSolver._model_fingerprints[model]
+        except KeyError:
+            fingerprint_ids = None
+        if fingerprint_ids != ids:
+            fingerprint = pybamm.ModelCache().key(
+                model.concatenated_rhs,
+                model.concatenated_algebraic,
+                model.mass_matrix,
+            )
+            JaxSolver._model_fingerprints[model] = (ids, fingerprint)
+        return fingerprint
+
+    @staticmethod
+    def set_compilation_cache_dir(cache_dir):
+        """
+        Enable JAX's persistent compilation cache, so that the functions compiled by XLA
+        (e.g. the solve functions of :class:`pybamm.JaxSolver`) are saved in `cache_dir`
+        and loaded from there by later Python processes instead of being compiled again.
+        This is a global JAX setting.
+
+        Parameters
+        ----------
+        cache_dir : str
+            The directory in which to store the compiled functions
+        """
+        if "jax_compilation_cache_dir" in jax.config.values:
+            jax.config.update("jax_compilation_cache_dir", cache_dir)
         else:
-            return jax.jit(solve_model_bdf)
+            from jax.experimental.compilation_cache import compilation_cache
+
+            if compilation_cache.is_initialized():
+                compilation_cache.reset_cache()
+            compilation_cache.initialize_cache(cache_dir)
+        # Cache all the functions, however quick they are to compile
+        jax.config.update("jax_persistent_cache_min_compile_time_secs", 0)
+
+    @staticmethod
+    def clear_cache():
+        """Remove all the compiled solve functions from the (in-memory) cache"""
+        JaxSolver._compiled_solves.clear()
+        JaxSolver._model_fingerprints.clear()
+
+    def solve(
+        self, model, t_eval=None, external_variables=None, inputs=None, **kwargs
+    ):
+        """
+        Execute the solver setup and calculate the solution of the model at
+        specified times. See :meth:`pybamm.BaseSolver.solve`.
+
+        As well as a dict or a list of dicts, `inputs` can be a dict of stacked
+        inputs, which gives one solution for each set of inputs, as for a list of
+        dicts. An input is stacked if it is an array whose first axis is the set of
+        inputs: a 1D array (of length greater than 1) for a scalar input parameter, or
+        a 2D array for a vector input parameter. Inputs that are not stacked are
+        used for all the sets of inputs.
+
+        Returns
+        -------
+        :class:`pybamm.Solution` or list of :class:`pybamm.Solution` objects.
+            If type of `inputs` is `list` or `inputs` is stacked, return a list of
+            corresponding :class:`pybamm.Solution` objects.
+        """
+        if isinstance(inputs, dict):
+            inputs = self._unstack_inputs(model, inputs)
+        return super().solve(
+            model,
+            t_eval,
+            external_variables=external_variables,
+            inputs=inputs,
+            **kwargs,
+        )
+
+    def _unstack_inputs(self, model, inputs):
+        """
+        Split a dict of stacked inputs into a list of dicts (one for each set of
+        inputs), or return `inputs` unchanged if none of the inputs are stacked
+        """
+        expected_sizes = {
+            input_param.name: input_param._expected_size
+            for input_param in model.input_parameters
+        }
+        ninputs = None
+        stacked = {}
+        for name, value in inputs.items():
+            ndim = onp.ndim(value)
+            if ndim == 2 or (
+                ndim == 1 and expected_sizes.get(name, 1) == 1 and len(value) > 1
+            ):
+                if ninputs is not None and len(value) != ninputs:
+                    raise ValueError(
+                        "All stacked inputs must have the same number of sets of "
+                        "inputs, but '{}' has {} (expected {})".format(
+                            name, len(value), ninputs
+                        )
+                    )
+                ninputs = len(value)
+                stacked[name] = value
+        if ninputs is None:
+            return inputs
+        return [
+            {
+                name: stacked[name][i] if name in stacked else value
+                for name, value in inputs.items()
+            }
+            for i in range(ninputs)
+        ]
 
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
@@ -200,10 +398,9 @@ class JaxSolver(pybamm.BaseSolver):
 
         """
         timer = pybamm.Timer()
-        if model not in self._cached_solves:
-            self._cached_solves[model] = self.create_solve(model, t_eval)
+        solve = self.create_solve(model, t_eval)
 
-        y = self._cached_solves[model](inputs_dict).block_until_ready()
+        y = solve(inputs_dict).block_until_ready()
         integration_time = timer.time()
 
         # convert to a normal numpy array
@@ -217,3 +414,51 @@ class JaxSolver(pybamm.BaseSolver):
         )
         sol.integration_time = integration_time
         return sol
+
+    def _integrate_multiple_inputs(self, model, t_eval, inputs_list, nproc=None):
+        """
+        Solve a model for several sets of inputs at once, with a single call to the
+        compiled and vectorised solve function (see :meth:`JaxSolver.create_solve`).
+        `nproc` is ignored.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model whose solution to calculate.
+        t_eval : :class:`numpy.array`, size (k,)
+            The times at which to compute the solution
+        inputs_list : list of dict
+            The input parameters for each solution
+        nproc : int, optional
+            Not used
+
+        Returns
+        -------
+        list of :class:`pybamm.Solution`
+            The solution for each set of inputs
+        """
+        timer = pybamm.Timer()
+        solve = self.create_solve(model, t_eval, batched=True)
+
+        # Stack the inputs, with the sets of inputs along the first axis
+        stacked_inputs = {
+            name: jnp.stack([jnp.asarray(inputs[name]) for inputs in inputs_list])
+            for name in inputs_list[0]
+        }
+        y = solve(stacked_inputs).block_until_ready()
+        integration_time = timer.time()
+
+        # convert to a normal numpy array
+        y = onp.array(y)
+
+        termination = "final time"
+        t_event = None
+        y_event = onp.array(None)
+        solutions = []
+        for i, inputs_dict in enumerate(inputs_list):
+            sol = pybamm.Solution(
+                t_eval, y[i], model, inputs_dict, t_event, y_event, termination
+            )
+            sol.integration_time = integration_time
+            solutions.append(sol)
+        return solutions
@@ -104,19 +104,51 @@ class ProcessedVariable(object):
                             + "(note processing of 3D variables is not yet implemented)"
                         )
 
-    def initialise_0D(self):
-        # initialise empty array of the correct size
-        entries = np.empty(len(self.t_pts))
+    def evaluate_entries(self, size):
+        """
+        Evaluate the base variable at all the time points of the solution.
+
+        Each sub-solution is evaluated with a single call to the casadi function of
+        the base variable, mapped over the time points of that sub-solution, and the
+        results are written into a preallocated array. If
+        `pybamm.settings.processing_threads` is greater than 1, the mapped function
+        evaluates the time points in parallel with that many threads.
+
+        Parameters
+        ----------
+        size : int
+            The size of the base variable at a single time point
+
+        Returns
+        -------
+        entries : :class:`numpy.array`, size (size, n_t)
+            The values of the base variable at each time point (one column per time
+            point)
+        """
+        entries = np.empty((size, len(self.t_pts)))
+        n_threads = pybamm.settings.processing_threads
         idx = 0
-        # Evaluate the base_variable index-by-index
         for ts, ys, inputs, base_var_casadi in zip(
             self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
         ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[idx] = base_var_casadi(t, y, inputs).full()[0, 0]
-                idx += 1
+            n_ts = len(ts)
+            if n_ts == 1:
+                mapped_casadi = base_var_casadi
+            elif n_threads > 1:
+                mapped_casadi = base_var_casadi.map(
+                    n_ts, "thread", min(n_threads, n_ts)
+                )
+            else:
+                mapped_casadi = base_var_casadi.map(n_ts)
+            entries[:, idx : idx + n_ts] = mapped_casadi(
+                np.reshape(ts, (1, n_ts)), ys, inputs
+            ).full()
+            idx += n_ts
+        return entries
+
+    def initialise_0D(self):
+        # Evaluate the base_variable at all time points
+        entries = self.evaluate_entries(1)[0]
 
         # set up interpolation
         if len(self.t_pts) == 1:
@@ -134,21 +166,12 @@ class ProcessedVariable(object):
 
         self.entries = entries
         self.dimensions = 0
+        self.grid = {"t": self.t_pts}
 
     def initialise_1D(self, fixed_t=False):
         len_space = self.base_eval.shape[0]
-        entries = np.empty((len_space, len(self.t_pts)))
-
-        # Evaluate the base_variable index-by-index
-        idx = 0
-        for ts, ys, inputs, base_var_casadi in zip(
-            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
-        ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, idx] = base_var_casadi(t, y, inputs).full()[:, 0]
-                idx += 1
+        # Evaluate the base_variable at all time points
+        entries = self.evaluate_entries(len_space)
 
         # Get node and edge values
         nodes = self.mesh.nodes
@@ -203,6 +226,10 @@ class ProcessedVariable(object):
 
         # Set first_dim_pts to edges for nicer plotting
         self.first_dim_pts = edges * length_scale
+        self.grid = {
+            self.first_dimension: pts_for_interp[1:-1],
+            "t": self.t_pts,
+        }
 
         # set up interpolation
         if len(self.t_pts) == 1:
@@ -238,22 +265,14 @@ class ProcessedVariable(object):
         second_dim_pts = second_dim_nodes
         first_dim_size = len(first_dim_pts)
         second_dim_size = len(second_dim_pts)
-        entries = np.empty((first_dim_size, second_dim_size, len(self.t_pts)))
 
-        # Evaluate the base_variable index-by-index
-        idx = 0
-        for ts, ys, inputs, base_var_casadi in zip(
-            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
-        ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, :, idx] = np.reshape(
-                    base_var_casadi(t, y, inputs).full(),
-                    [first_dim_size, second_dim_size],
-                    order="F",
-                )
-                idx += 1
+        # Evaluate the base_variable at all time points, and reshape the values at
+        # each time point (Fortran order in space)
+        entries = np.reshape(
+            self.evaluate_entries(first_dim_size * second_dim_size),
+            [first_dim_size, second_dim_size, len(self.t_pts)],
+            order="F",
+        )
 
         # add points outside first dimension domain for extrapolation to
         # boundaries
@@ -386,6 +405,11 @@ class ProcessedVariable(object):
         # Set pts to edges for nicer plotting
         self.first_dim_pts = first_dim_edges * first_length_scale
         self.second_dim_pts = second_dim_edges * second_length_scale
+        self.grid = {
+            self.first_dimension: first_dim_pts_for_interp[1:-1],
+            self.second_dimension: second_dim_pts_for_interp[1:-1],
+            "t": self.t_pts,
+        }
 
         # set up interpolation
         if len(self.t_pts) == 1:
@@ -409,22 +433,12 @@ class ProcessedVariable(object):
         len_y = len(y_sol)
         z_sol = self.mesh.edges["z"]
         len_z = len(z_sol)
-        entries = np.empty((len_y, len_z, len(self.t_pts)))
 
-        # Evaluate the base_variable index-by-index
-        idx = 0
-        for ts, ys, inputs, base_var_casadi in zip(
-            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
-        ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, :, idx] = np.reshape(
-                    base_var_casadi(t, y, inputs).full(),
-                    [len_y, len_z],
-                    order="C",
-                )
-                idx += 1
+        # Evaluate the base_variable at all time points, and reshape the values at
+        # each time point (C order in space)
+        entries = np.reshape(
+            self.evaluate_entries(len_y * len_z), [len_y, len_z, len(self.t_pts)]
+        )
 
         # assign attributes for reference
         self.entries = entries
@@ -435,6 +449,7 @@ class ProcessedVariable(object):
         self.second_dimension = "z"
         self.first_dim_pts = y_sol * self.get_spatial_scale("y", "current collector")
         self.second_dim_pts = z_sol * self.get_spatial_scale("z", "current collector")
+        self.grid = {"y": self.first_dim_pts, "z": self.second_dim_pts, "t": self.t_pts}
 
         # set up interpolation
         if len(self.t_pts) == 1:
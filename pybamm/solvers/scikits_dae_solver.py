@@ -87,7 +87,7 @@ class ScikitsDaeSolver(pybamm.BaseSolver):
 
         """
         inputs_dict = inputs_dict or {}
-        if model.convert_to_format == "casadi":
+        if model.convert_to_format in ["casadi", "compiled"]:
             inputs = casadi.vertcat(*[x for x in inputs_dict.values()])
         else:
             inputs = inputs_dict
@@ -68,7 +68,7 @@ class ScipySolver(pybamm.BaseSolver):
         """
         # Save inputs dictionary, and if necessary convert inputs to a casadi vector
         inputs_dict = inputs_dict or {}
-        if model.convert_to_format == "casadi":
+        if model.convert_to_format in ["casadi", "compiled"]:
             inputs = casadi.vertcat(*[x for x in inputs_dict.values()])
         else:
             inputs = inputs_dict
@@ -2,8 +2,10 @@
 # Solution class
 #
 import casadi
+import collections.abc
 import numbers
 import numpy as np
+import os
 import pickle
 import pybamm
 import pandas as pd
@@ -60,11 +62,12 @@ class Solution(object):
         termination="final time",
         sensitivities=False
     ):
-        if not isinstance(all_ts, list):
+        # Lists can also be views of lists (see pybamm.SolutionBuilder)
+        if not isinstance(all_ts, collections.abc.Sequence):
             all_ts = [all_ts]
-        if not isinstance(all_ys, list):
+        if not isinstance(all_ys, collections.abc.Sequence):
             all_ys = [all_ys]
-        if not isinstance(all_models, list):
+        if not isinstance(all_models, collections.abc.Sequence):
             all_models = [all_models]
         self._all_ts = all_ts
         self._all_ys = all_ys
@@ -72,7 +75,7 @@ class Solution(object):
         self._all_models = all_models
 
         # Set up inputs
-        if not isinstance(all_inputs, list):
+        if not isinstance(all_inputs, collections.abc.Sequence):
             all_inputs_copy = dict(all_inputs)
             for key, value in all_inputs_copy.items():
                 if isinstance(value, numbers.Number):
@@ -122,15 +125,36 @@ class Solution(object):
         # Add self as sub-solution for compatibility with ProcessedVariable
         self._sub_solutions = [self]
 
+        # Identifiers of the sub-solutions (one for each item of all_ts), which are
+        # kept when solutions are added together or copied, so that the sub-solutions
+        # of the cycles and steps can be matched with those of the full solution
+        # (see `_save_compact`)
+        self._all_ids = [object() for _ in all_ts]
+
         # initialize empty cycles
         self._cycles = []
 
         # Initialize empty summary variables
         self._summary_variables = None
 
+        # Store holding the states on disk, if any (see pybamm.SolutionStore)
+        self._store = None
+
         # Solution now uses CasADi
         pybamm.citations.register("Andersson2019")
 
+    def __getstate__(self):
+        # The builder that created the solution is only needed to append to it
+        state = self.__dict__.copy()
+        state.pop("_builder", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Solutions pickled before the identifiers of the sub-solutions were added
+        if "_all_ids" not in state:
+            self._all_ids = [object() for _ in self._all_ts]
+
     def extract_explicit_sensitivities(self):
         # if we got here, we havn't set y yet
         self.set_y()
@@ -403,6 +427,101 @@ class Solution(object):
             self._last_state = new_sol
             return self._last_state
 
+    def get_window(self, t_start=None, t_end=None):
+        """
+        A Solution object that only contains the time points between `t_start` and
+        `t_end` (inclusive). The states of the new solution are views of the states
+        of this solution, so if they have been written to a
+        :class:`pybamm.SolutionStore`, only the states in the window are read from
+        disk when processing variables.
+
+        Parameters
+        ----------
+        t_start : float, optional
+            The start of the window, in seconds. Default is the start of the solution.
+        t_end : float, optional
+            The end of the window, in seconds. Default is the end of the solution.
+        """
+        t_start = -np.inf if t_start is None else t_start / self.timescale_eval
+        t_end = np.inf if t_end is None else t_end / self.timescale_eval
+
+        all_ts = []
+        all_ys = []
+        all_models = []
+        all_inputs = []
+        all_inputs_casadi = []
+        for ts, ys, model, inputs, inputs_casadi in zip(
+            self.all_ts,
+            self.all_ys,
+            self.all_models,
+            self.all_inputs,
+            self.all_inputs_casadi,
+        ):
+            start = np.searchsorted(ts, t_start, side="left")
+            end = np.searchsorted(ts, t_end, side="right")
+            if end > start:
+                all_ts.append(ts[start:end])
+                all_ys.append(ys[:, start:end])
+                all_models.append(model)
+                all_inputs.append(inputs)
+                all_inputs_casadi.append(inputs_casadi)
+        if len(all_ts) == 0:
+            raise ValueError("The solution has no time points in the given window")
+
+        return self._new_window(
+            all_ts, all_ys, all_models, all_inputs, all_inputs_casadi
+        )
+
+    def _new_window(self, all_ts, all_ys, all_models, all_inputs, all_inputs_casadi):
+        """Create a solution from (views of) parts of the sub-solutions"""
+        new_sol = Solution(
+            all_ts,
+            all_ys,
+            all_models,
+            all_inputs,
+            self.t_event,
+            self.y_event,
+            self.termination,
+        )
+        new_sol._all_inputs_casadi = all_inputs_casadi
+        new_sol._store = self._store
+
+        new_sol.solve_time = self.solve_time
+        new_sol.integration_time = self.integration_time
+        new_sol.set_up_time = self.set_up_time
+
+        return new_sol
+
+    def _chunks(self, size):
+        """
+        Split the solution into consecutive windows of at most `size` time points,
+        each made of (views of) one or more sub-solutions. Yields the index of the
+        first time point of each window, and the window.
+        """
+        start = 0
+        parts = []
+        n_parts = 0
+        for ts, ys, model, inputs, inputs_casadi in zip(
+            self.all_ts,
+            self.all_ys,
+            self.all_models,
+            self.all_inputs,
+            self.all_inputs_casadi,
+        ):
+            for i in range(0, len(ts), size):
+                # ys may be a casadi.DM, which cannot be sliced out of bounds
+                end = min(i + size, len(ts))
+                part = (ts[i:end], ys[:, i:end], model, inputs)
+                if n_parts + len(part[0]) > size:
+                    yield start, self._new_window(*map(list, zip(*parts)))
+                    start += n_parts
+                    parts = []
+                    n_parts = 0
+                parts.append(part + (inputs_casadi,))
+                n_parts += len(part[0])
+        if parts:
+            yield start, self._new_window(*map(list, zip(*parts)))
+
     @property
     def total_time(self):
         return self.set_up_time + self.solve_time
@@ -442,54 +561,113 @@ class Solution(object):
             variables = [variables]
         # Process
         for key in variables:
-            pybamm.logger.debug("Post-processing {}".format(key))
-            # If there are symbolic inputs then we need to make a
-            # ProcessedSymbolicVariable
-            if self.has_symbolic_inputs is True:
-                var = pybamm.ProcessedSymbolicVariable(
-                    self.all_models[0].variables[key], self
-                )
+            with pybamm.profiler.span(
+                "Solution.process_variable", variable=key, time_points=len(self.t)
+            ) as span:
+                var = self._process_variable(key)
+                if pybamm.profiler.enabled:
+                    span.set(size=var.data.size)
 
-            # Otherwise a standard ProcessedVariable is ok
-            else:
-                vars_pybamm = [model.variables[key] for model in self.all_models]
-
-                # Iterate through all models, some may be in the list several times and
-                # therefore only get set up once
-                vars_casadi = []
-                for model, ys, inputs, var_pybamm in zip(
-                    self.all_models, self.all_ys, self.all_inputs, vars_pybamm
-                ):
-                    if key in model._variables_casadi:
-                        var_casadi = model._variables_casadi[key]
-                    else:
-                        t_MX = casadi.MX.sym("t")
-                        y_MX = casadi.MX.sym("y", ys.shape[0])
-                        symbolic_inputs_dict = {
-                            key: casadi.MX.sym("input", value.shape[0])
-                            for key, value in inputs.items()
-                        }
-                        symbolic_inputs = casadi.vertcat(
-                            *[p for p in symbolic_inputs_dict.values()]
-                        )
+            # Save variable and data
+            self._variables[key] = var
+            self.data[key] = var.data
 
-                        # Convert variable to casadi
-                        # Make all inputs symbolic first for converting to casadi
-                        var_sym = var_pybamm.to_casadi(
-                            t_MX, y_MX, inputs=symbolic_inputs_dict
-                        )
+    def _process_variable(self, key):
+        """Process the variable `key`, without storing it in the solution"""
+        pybamm.logger.debug("Post-processing {}".format(key))
+        # If there are symbolic inputs then we need to make a
+        # ProcessedSymbolicVariable
+        if self.has_symbolic_inputs is True:
+            var = pybamm.ProcessedSymbolicVariable(
+                self.all_models[0].variables[key], self
+            )
+
+        # Otherwise a standard ProcessedVariable is ok
+        else:
+            vars_pybamm = [model.variables[key] for model in self.all_models]
+
+            # Iterate through all models, some may be in the list several times and
+            # therefore only get set up once
+            vars_casadi = []
+            for model, ys, inputs, var_pybamm in zip(
+                self.all_models, self.all_ys, self.all_inputs, vars_pybamm
+            ):
+                if key in model._variables_casadi:
+                    var_casadi = model._variables_casadi[key]
+                else:
+                    t_MX = casadi.MX.sym("t")
+                    y_MX = casadi.MX.sym("y", ys.shape[0])
+                    symbolic_inputs_dict = {
+                        key: casadi.MX.sym("input", value.shape[0])
+                        for key, value in inputs.items()
+                    }
+                    symbolic_inputs = casadi.vertcat(
+                        *[p for p in symbolic_inputs_dict.values()]
+                    )
+
+                    # Convert variable to casadi
+                    # Make all inputs symbolic first for converting to casadi
+                    var_sym = var_pybamm.to_casadi(
+                        t_MX, y_MX, inputs=symbolic_inputs_dict
+                    )
 
-                        var_casadi = casadi.Function(
-                            "variable", [t_MX, y_MX, symbolic_inputs], [var_sym]
+                    var_casadi = casadi.Function(
+                        "variable", [t_MX, y_MX, symbolic_inputs], [var_sym]
+                    )
+                    if model.convert_to_format == "compiled":
+                        var_casadi = pybamm.casadi_compiler.compile(
+                            var_casadi, derivatives=False
                         )
-                        model._variables_casadi[key] = var_casadi
-                    vars_casadi.append(var_casadi)
+                    model._variables_casadi[key] = var_casadi
+                vars_casadi.append(var_casadi)
 
-                var = pybamm.ProcessedVariable(vars_pybamm, vars_casadi, self)
+            var = pybamm.ProcessedVariable(vars_pybamm, vars_casadi, self)
 
-            # Save variable and data
-            self._variables[key] = var
-            self.data[key] = var.data
+        return var
+
+    def evaluate_variables(self, names):
+        """
+        Evaluate several variables at all the time points of the solution in a single
+        pass, without creating a :class:`pybamm.ProcessedVariable` for each variable.
+
+        The variables are compiled into one stacked casadi function for each model
+        (see :meth:`pybamm.BaseModel.get_stacked_variables_casadi`), which is cached
+        with the model and evaluated with one call for each sub-solution. This is much
+        faster than processing the variables one by one when only their raw values are
+        needed, e.g. to extract the summary variables of each cycle of an experiment.
+
+        Parameters
+        ----------
+        names : list of str
+            The names of the variables to evaluate
+
+        Returns
+        -------
+        dict
+            The values of each variable, as a 1D array (one entry for each time) for
+            scalar variables, or a 2D array (one column for each time) otherwise. The
+            values are not reshaped or extrapolated to the domain boundaries as in
+            :class:`pybamm.ProcessedVariable`.
+        """
+        values = _evaluate_variables(
+            names,
+            list(
+                zip(
+                    self.all_models,
+                    self.all_ts,
+                    self.all_ys,
+                    self.all_inputs,
+                    self.all_inputs_casadi,
+                )
+            ),
+        )
+        variables = {}
+        for i, name in enumerate(names):
+            value = np.concatenate([point_values[i] for point_values in values], axis=1)
+            if value.shape[0] == 1:
+                value = value[0]
+            variables[name] = value
+        return variables
 
     def __getitem__(self, key):
         """Read a variable from the solution. Variables are created 'just in time', i.e.
@@ -540,17 +718,173 @@ class Solution(object):
         # symbolic_inputs_dict = None
         pass
 
-    def save(self, filename):
-        """Save the whole solution using pickle"""
+    def save(self, filename, to_format="pickle"):
+        """
+        Save the whole solution, which can then be loaded with :func:`pybamm.load`
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file (or, for the 'compact' format, of the directory) to
+            save the solution to
+        to_format : str, optional
+            The format to save to. Options are:
+
+            - 'pickle' (default): pickles the whole solution, including a copy of the
+              model of each sub-solution
+            - 'compact': creates a directory, in which the times and states of all the
+              sub-solutions are stored as contiguous arrays (one `.npy` file for the
+              times, and one for the states of each size), and each distinct model is
+              only stored once (models are identified by the content of their
+              equations). When loaded, the times and states are memory-mapped, so
+              loading is fast whatever the size of the solution, and only the states
+              that are needed to process a variable are read from disk.
+        """
         # No warning here if len(self.data)==0 as solution can be loaded
         # and used to process new variables
 
         self.clear_casadi_attributes()
-        # Pickle
-        with open(filename, "wb") as f:
-            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        if to_format == "pickle":
+            with open(filename, "wb") as f:
+                pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        elif to_format == "compact":
+            self._save_compact(filename)
+        else:
+            raise ValueError("format '{}' not recognised".format(to_format))
+
+    def _save_compact(self, directory):
+        """Save the solution in the 'compact' format (see :meth:`Solution.save`)"""
+        if self.has_symbolic_inputs or any(
+            isinstance(ys, casadi.MX) for ys in self.all_ys
+        ):
+            raise ValueError("Cannot save a solution with symbolic inputs or states")
+        os.makedirs(directory, exist_ok=True)
+
+        # Store each distinct model once, identified by its content
+        cache = pybamm.ModelCache()
+        fingerprints = {}
+        models = {}
+        for model in self.all_models:
+            if id(model) not in fingerprints:
+                fingerprint = cache.key(model)
+                fingerprints[id(model)] = fingerprint
+                models.setdefault(fingerprint, model)
+
+        # Concatenate the times, and the states of each size (time-major, so that the
+        # states at a given time are contiguous on disk)
+        t_start = 0
+        states = {}
+        y_starts = {}
+        sub_solutions = []
+        for ts, ys, model, inputs in zip(
+            self.all_ts, self.all_ys, self.all_models, self.all_inputs
+        ):
+            if isinstance(ys, casadi.DM):
+                ys = ys.full()
+            n_states = ys.shape[0]
+            y_start = y_starts.get(n_states, 0)
+            states.setdefault(n_states, []).append(ys)
+            y_starts[n_states] = y_start + ys.shape[1]
+            sub_solutions.append(
+                {
+                    "model": fingerprints[id(model)],
+                    "inputs": inputs,
+                    "t": (t_start, t_start + len(ts)),
+                    "y": (n_states, y_start, y_start + ys.shape[1]),
+                }
+            )
+            t_start += len(ts)
+        np.save(os.path.join(directory, "t.npy"), np.concatenate(self.all_ts))
+        for n_states, blocks in states.items():
+            np.save(
+                os.path.join(directory, "y_{}.npy".format(n_states)),
+                np.ascontiguousarray(np.hstack(blocks).T),
+            )
+
+        # Cycles and steps are stored as references to the sub-solutions of this
+        # solution, which are matched by their identifiers. When the solutions were
+        # added together, the first time point of each solution after the first was
+        # skipped if it was repeated, so the first sub-solution of a step may start
+        # one time point before the corresponding sub-solution of this solution: this
+        # time point is then stored separately.
+        indices = {sub_id: i for i, sub_id in enumerate(self._all_ids)}
+
+        def point(ts, ys, model, inputs):
+            if model is not None and id(model) not in fingerprints:
+                fingerprints[id(model)] = cache.key(model)
+                models.setdefault(fingerprints[id(model)], model)
+            y = ys[:, :1]
+            if isinstance(y, casadi.DM):
+                y = y.full()
+            return ("point", ts[:1].copy(), y, fingerprints[id(model)], inputs)
+
+        def parts(solution):
+            parts = []
+            for sub_id, ts, ys, model, inputs in zip(
+                solution._all_ids,
+                solution.all_ts,
+                solution.all_ys,
+                solution.all_models,
+                solution.all_inputs,
+            ):
+                i = indices.get(sub_id)
+                if i is not None and len(self.all_ts[i]) == len(ts):
+                    parts.append(("ref", i))
+                elif i is not None and len(self.all_ts[i]) == len(ts) - 1:
+                    parts.append(point(ts, ys, model, inputs))
+                    parts.append(("ref", i))
+                elif len(ts) == 1:
+                    parts.append(point(ts, ys, model, inputs))
+                else:
+                    raise KeyError
+            return parts
+
+        try:
+            cycles = [
+                None
+                if cycle is None
+                else {
+                    "parts": parts(cycle),
+                    "steps": [parts(step) for step in getattr(cycle, "steps", [])],
+                    "summary_variables": getattr(
+                        cycle, "cycle_summary_variables", None
+                    ),
+                }
+                for cycle in self.cycles
+            ]
+        except KeyError:
+            pybamm.logger.warning(
+                "Not saving the cycles of the solution, as they are not made of its "
+                "sub-solutions"
+            )
+            cycles = []
+
+        metadata = {
+            "pybamm_version": pybamm.__version__,
+            "models": models,
+            "sub_solutions": sub_solutions,
+            "t_event": self.t_event,
+            "y_event": self.y_event,
+            "termination": self.termination,
+            "timescale_eval": self.timescale_eval,
+            "length_scales_eval": self.length_scales_eval,
+            "set_up_time": self.set_up_time,
+            "solve_time": self.solve_time,
+            "integration_time": self.integration_time,
+            "all_summary_variables": getattr(self, "all_summary_variables", None),
+            "cycles": cycles,
+        }
+        with open(os.path.join(directory, "solution.pkl"), "wb") as f:
+            pickle.dump(metadata, f, pickle.HIGHEST_PROTOCOL)
 
-    def save_data(self, filename, variables=None, to_format="pickle", short_names=None):
+    def save_data(
+        self,
+        filename,
+        variables=None,
+        to_format="pickle",
+        short_names=None,
+        chunk_size=10000,
+    ):
         """
         Save solution data only (raw arrays)
 
@@ -567,13 +901,50 @@ class Solution(object):
             - 'pickle' (default): creates a pickle file with the data dictionary
             - 'matlab': creates a .mat file, for loading in matlab
             - 'csv': creates a csv file (0D variables only)
+            - 'hdf5': creates an HDF5 file (requires `h5py`), with a chunked,
+              compressed dataset for each variable, with the spatial dimensions
+              first and time last. The dimensions of each dataset (e.g. ["x", "t"])
+              are given by its "dimensions" attribute, and the points of each
+              spatial dimension by the attribute of the same name. The time points
+              are in the dataset "t", which is attached to the last dimension of
+              each variable.
+            - 'parquet': creates a Parquet file (requires `pyarrow`), with a column
+              "t" for the time points and a column for each variable. Variables that
+              depend on space are stored as fixed-size lists (flattened in C order),
+              and the metadata of each column gives its dimensions, shape and the
+              points of each spatial dimension.
+
+            The 'hdf5' and 'parquet' formats do not require the variables to have been
+            created (and held in memory) first: they are processed and written
+            `chunk_size` time points at a time (variable by variable for 'hdf5').
         short_names : dict, optional
             Dictionary of shortened names to use when saving. This may be necessary when
             saving to MATLAB, since no spaces or special characters are allowed in
             MATLAB variable names. Note that not all the variables need to be given
             a short name.
+        chunk_size : int, optional
+            The maximum number of time points processed and written at a time, for
+            the 'hdf5' and 'parquet' formats. Default is 10000.
 
         """
+        if to_format in ["hdf5", "parquet"]:
+            if variables is None:
+                variables = list(self._variables.keys())
+            if len(variables) == 0:
+                raise ValueError(
+                    """
+                    Solution does not have any data. Please provide a list of variables
+                    to save.
+                    """
+                )
+            short_names = short_names or {}
+            names = {name: short_names.get(name, name) for name in variables}
+            if to_format == "hdf5":
+                self._save_data_hdf5(filename, names, chunk_size)
+            else:
+                self._save_data_parquet(filename, names, chunk_size)
+            return
+
         if variables is None:
             # variables not explicitly provided -> save all variables that have been
             # computed
@@ -643,6 +1014,114 @@ class Solution(object):
         else:
             raise ValueError("format '{}' not recognised".format(to_format))
 
+    def _chunk_variable(self, name, start, chunk):
+        """
+        Return the entries and the grid of the variable `name` in `chunk`, the window
+        of the solution starting at time index `start`
+        """
+        if name in self._variables:
+            # The variable has already been processed
+            var = self._variables[name]
+            entries = var.entries[..., start : start + len(chunk.t)]
+        else:
+            var = chunk._process_variable(name)
+            entries = var.entries
+        return entries, var.grid
+
+    def _save_data_hdf5(self, filename, names, chunk_size):
+        """Stream the variables `names` (a dict of short names) to an HDF5 file"""
+        import h5py
+
+        chunks = list(self._chunks(chunk_size))
+        n_t = len(self.t)
+        with h5py.File(filename, "w") as f:
+            f.attrs["pybamm_version"] = pybamm.__version__
+            f.attrs["termination"] = self.termination
+            t = f.create_dataset(
+                "t",
+                data=self.t * self.timescale_eval,
+                chunks=(min(n_t, chunk_size),),
+                compression="gzip",
+            )
+            t.make_scale("t")
+            for name, short_name in names.items():
+                dataset = None
+                for start, chunk in chunks:
+                    entries, grid = self._chunk_variable(name, start, chunk)
+                    if dataset is None:
+                        space_shape = entries.shape[:-1]
+                        # Aim for chunks of about a million values
+                        chunk_t = max(1, min(n_t, 2 ** 20 // int(np.prod(space_shape))))
+                        dataset = f.create_dataset(
+                            short_name,
+                            shape=space_shape + (n_t,),
+                            dtype="f8",
+                            chunks=space_shape + (chunk_t,),
+                            compression="gzip",
+                            shuffle=True,
+                        )
+                        dataset.attrs["name"] = name
+                        dataset.attrs["dimensions"] = list(grid.keys())
+                        for dim, pts in grid.items():
+                            if dim != "t":
+                                dataset.attrs[dim] = pts
+                        dataset.dims[len(space_shape)].attach_scale(t)
+                    dataset[..., start : start + entries.shape[-1]] = entries
+
+    def _save_data_parquet(self, filename, names, chunk_size):
+        """Stream the variables `names` (a dict of short names) to a Parquet file"""
+        import json
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for start, chunk in self._chunks(chunk_size):
+                n = len(chunk.t)
+                columns = {"t": pa.array(chunk.t * self.timescale_eval)}
+                fields = [pa.field("t", pa.float64())]
+                for name, short_name in names.items():
+                    entries, grid = self._chunk_variable(name, start, chunk)
+                    space_shape = entries.shape[:-1]
+                    if space_shape == ():
+                        columns[short_name] = pa.array(entries)
+                        field = pa.field(short_name, pa.float64())
+                    else:
+                        # one row per time point
+                        size = int(np.prod(space_shape))
+                        values = np.moveaxis(entries, -1, 0).reshape(n * size)
+                        columns[short_name] = pa.FixedSizeListArray.from_arrays(
+                            pa.array(values), size
+                        )
+                        field = pa.field(short_name, pa.list_(pa.float64(), size))
+                    if writer is None:
+                        metadata = {
+                            "name": name,
+                            "dimensions": json.dumps(list(grid.keys())),
+                            "shape": json.dumps(list(space_shape)),
+                        }
+                        for dim, pts in grid.items():
+                            if dim != "t":
+                                metadata[dim] = json.dumps(pts.tolist())
+                        field = field.with_metadata(metadata)
+                    fields.append(field)
+                if writer is None:
+                    schema = pa.schema(
+                        fields,
+                        metadata={
+                            "pybamm_version": pybamm.__version__,
+                            "termination": self.termination,
+                        },
+                    )
+                    writer = pq.ParquetWriter(filename, schema, compression="zstd")
+                table = pa.Table.from_arrays(
+                    list(columns.values()), schema=writer.schema
+                )
+                writer.write_table(table, row_group_size=chunk_size)
+        finally:
+            if writer is not None:
+                writer.close()
+
     @property
     def sub_solutions(self):
         """List of sub solutions that have been
@@ -697,6 +1176,10 @@ class Solution(object):
 
         # Set sub_solutions
         new_sol._sub_solutions = self.sub_solutions + other.sub_solutions
+        new_sol._all_ids = self._all_ids + other._all_ids
+
+        # Keep the store of the states alive
+        new_sol._store = self._store or other._store
 
         return new_sol
 
@@ -724,6 +1207,8 @@ class Solution(object):
         )
         new_sol._all_inputs_casadi = self.all_inputs_casadi
         new_sol._sub_solutions = self.sub_solutions
+        new_sol._all_ids = self._all_ids
+        new_sol._store = self._store
 
         new_sol.solve_time = self.solve_time
         new_sol.integration_time = self.integration_time
@@ -732,6 +1217,39 @@ class Solution(object):
         return new_sol
 
 
+_degradation_variables = [
+    "Negative electrode capacity [A.h]",
+    "Positive electrode capacity [A.h]",
+    # LAM, LLI
+    "Loss of active material in negative electrode [%]",
+    "Loss of active material in positive electrode [%]",
+    "Loss of lithium inventory [%]",
+    "Loss of lithium inventory, including electrolyte [%]",
+    # Total lithium
+    "Total lithium [mol]",
+    "Total lithium in electrolyte [mol]",
+    "Total lithium in positive electrode [mol]",
+    "Total lithium in negative electrode [mol]",
+    "Total lithium in particles [mol]",
+    # Lithium lost
+    "Total lithium lost [mol]",
+    "Total lithium lost from particles [mol]",
+    "Total lithium lost from electrolyte [mol]",
+    "Loss of lithium to negative electrode SEI [mol]",
+    "Loss of lithium to positive electrode SEI [mol]",
+    "Loss of lithium to negative electrode lithium plating [mol]",
+    "Loss of lithium to positive electrode lithium plating [mol]",
+    "Loss of capacity to negative electrode SEI [A.h]",
+    "Loss of capacity to positive electrode SEI [A.h]",
+    "Loss of capacity to negative electrode lithium plating [A.h]",
+    "Loss of capacity to positive electrode lithium plating [A.h]",
+    "Total lithium lost to side reactions [mol]",
+    "Total capacity lost to side reactions [A.h]",
+    # Resistance
+    "Local ECM resistance [Ohm]",
+]
+
+
 def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
     """
     Function to create a Solution for an entire cycle, and associated summary variables
@@ -763,9 +1281,24 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
     expansion. Journal of Power Sources, 427, 101-111.
 
     """
-    sum_sols = step_solutions[0].copy()
-    for step_solution in step_solutions[1:]:
-        sum_sols = sum_sols + step_solution
+    cycle_solution = _build_cycle_solution(step_solutions)
+
+    cycle_summary_variables = get_cycle_summary_variables(cycle_solution, esoh_sim)
+
+    if save_this_cycle:
+        cycle_solution.cycle_summary_variables = cycle_summary_variables
+    else:
+        cycle_solution = None
+
+    return cycle_solution, cycle_summary_variables
+
+
+def _build_cycle_solution(step_solutions):
+    """Concatenate the step solutions of a cycle into a single Solution"""
+    builder = pybamm.SolutionBuilder()
+    for step_solution in step_solutions:
+        builder.append(step_solution)
+    sum_sols = builder.build()
 
     cycle_solution = Solution(
         sum_sols.all_ts,
@@ -778,6 +1311,7 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
     )
     cycle_solution._all_inputs_casadi = sum_sols.all_inputs_casadi
     cycle_solution._sub_solutions = sum_sols.sub_solutions
+    cycle_solution._all_ids = sum_sols._all_ids
 
     cycle_solution.solve_time = sum_sols.solve_time
     cycle_solution.integration_time = sum_sols.integration_time
@@ -785,105 +1319,35 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
 
     cycle_solution.steps = step_solutions
 
-    cycle_summary_variables = get_cycle_summary_variables(cycle_solution, esoh_sim)
-
-    if save_this_cycle:
-        cycle_solution.cycle_summary_variables = cycle_summary_variables
-    else:
-        cycle_solution = None
-
-    return cycle_solution, cycle_summary_variables
+    return cycle_solution
 
 
 def get_cycle_summary_variables(cycle_solution, esoh_sim):
-    Q = cycle_solution["Discharge capacity [A.h]"].data
-    min_Q = np.min(Q)
-    max_Q = np.max(Q)
-
-    cycle_summary_variables = pybamm.FuzzyDict(
-        {
-            "Minimum measured discharge capacity [A.h]": min_Q,
-            "Maximum measured discharge capacity [A.h]": max_Q,
-            "Measured capacity [A.h]": max_Q - min_Q,
-        }
-    )
-
-    degradation_variables = [
-        "Negative electrode capacity [A.h]",
-        "Positive electrode capacity [A.h]",
-        # LAM, LLI
-        "Loss of active material in negative electrode [%]",
-        "Loss of active material in positive electrode [%]",
-        "Loss of lithium inventory [%]",
-        "Loss of lithium inventory, including electrolyte [%]",
-        # Total lithium
-        "Total lithium [mol]",
-        "Total lithium in electrolyte [mol]",
-        "Total lithium in positive electrode [mol]",
-        "Total lithium in negative electrode [mol]",
-        "Total lithium in particles [mol]",
-        # Lithium lost
-        "Total lithium lost [mol]",
-        "Total lithium lost from particles [mol]",
-        "Total lithium lost from electrolyte [mol]",
-        "Loss of lithium to negative electrode SEI [mol]",
-        "Loss of lithium to positive electrode SEI [mol]",
-        "Loss of lithium to negative electrode lithium plating [mol]",
-        "Loss of lithium to positive electrode lithium plating [mol]",
-        "Loss of capacity to negative electrode SEI [A.h]",
-        "Loss of capacity to positive electrode SEI [A.h]",
-        "Loss of capacity to negative electrode lithium plating [A.h]",
-        "Loss of capacity to positive electrode lithium plating [A.h]",
-        "Total lithium lost to side reactions [mol]",
-        "Total capacity lost to side reactions [A.h]",
-        # Resistance
-        "Local ECM resistance [Ohm]",
-    ]
-    first_state = cycle_solution.first_state
-    last_state = cycle_solution.last_state
-    for var in degradation_variables:
-        data_first = first_state[var].data
-        data_last = last_state[var].data
-        cycle_summary_variables[var] = data_last[0]
-        var_lowercase = var[0].lower() + var[1:]
-        cycle_summary_variables["Change in " + var_lowercase] = (
-            data_last[0] - data_first[0]
-        )
+    cycle_summary_variables = _get_degradation_summary_variables([cycle_solution])[0]
+    min_Q = cycle_summary_variables["Minimum measured discharge capacity [A.h]"]
+    max_Q = cycle_summary_variables["Maximum measured discharge capacity [A.h]"]
 
     if esoh_sim is not None:
         V_min = esoh_sim.parameter_values["Lower voltage cut-off [V]"]
         V_max = esoh_sim.parameter_values["Upper voltage cut-off [V]"]
-        C_n = last_state["Negative electrode capacity [A.h]"].data[0]
-        C_p = last_state["Positive electrode capacity [A.h]"].data[0]
-        n_Li = last_state["Total lithium in particles [mol]"].data[0]
+        C_n = cycle_summary_variables["Negative electrode capacity [A.h]"]
+        C_p = cycle_summary_variables["Positive electrode capacity [A.h]"]
+        n_Li = cycle_summary_variables["Total lithium in particles [mol]"]
         if esoh_sim.solution is not None:
             # initialize with previous solution if it is available
             esoh_sim.built_model.set_initial_conditions_from(esoh_sim.solution)
             solver = None
         else:
-            x_100_init = np.max(cycle_solution["Negative electrode SOC"].data)
+            x_100_init = _get_esoh_x_100_init(
+                esoh_sim, cycle_solution, C_n, C_p, n_Li
+            )
             # make sure x_0 > 0
             C_init = np.minimum(0.95 * (C_n * x_100_init), max_Q - min_Q)
 
             # Solve the esoh model and add outputs to the summary variables
             # use CasadiAlgebraicSolver if there are interpolants
-            if isinstance(
-                esoh_sim.parameter_values["Negative electrode OCP [V]"], tuple
-            ) or isinstance(
-                esoh_sim.parameter_values["Positive electrode OCP [V]"], tuple
-            ):
+            if _has_ocp_data(esoh_sim):
                 solver = pybamm.CasadiAlgebraicSolver()
-                # Choose x_100_init so as not to violate the interpolation limits
-                if isinstance(
-                    esoh_sim.parameter_values["Positive electrode OCP [V]"], tuple
-                ):
-                    y_100_min = np.min(
-                        esoh_sim.parameter_values["Positive electrode OCP [V]"][1][:, 0]
-                    )
-                    x_100_max = (
-                        n_Li * pybamm.constants.F.value / 3600 - y_100_min * C_p
-                    ) / C_n
-                    x_100_init = np.minimum(x_100_init, 0.99 * x_100_max)
             else:
                 solver = None
             # Update initial conditions using the cycle solution
@@ -909,9 +1373,465 @@ def get_cycle_summary_variables(cycle_solution, esoh_sim):
                 "Could not solve for summary variables, run "
                 "`sim.solve(calc_esoh=False)` to skip this step"
             )
-        for var in esoh_sim.built_model.variables:
-            cycle_summary_variables[var] = esoh_sol[var].data[0]
+        esoh_variables = esoh_sol.evaluate_variables(
+            list(esoh_sim.built_model.variables.keys())
+        )
+        for var, value in esoh_variables.items():
+            cycle_summary_variables[var] = value.flat[0]
 
         cycle_summary_variables["Capacity [A.h]"] = cycle_summary_variables["C"]
 
     return cycle_summary_variables
+
+
+def _has_ocp_data(esoh_sim):
+    """Whether either of the open-circuit potentials is given as data"""
+    return isinstance(
+        esoh_sim.parameter_values["Negative electrode OCP [V]"], tuple
+    ) or isinstance(esoh_sim.parameter_values["Positive electrode OCP [V]"], tuple)
+
+
+def _get_esoh_x_100_init(esoh_sim, cycle_solution, C_n, C_p, n_Li):
+    """Initial guess for x_100 in the eSOH model, from the cycle solution"""
+    x_100_init = np.max(
+        cycle_solution.evaluate_variables(["Negative electrode SOC"])[
+            "Negative electrode SOC"
+        ]
+    )
+    # Choose x_100_init so as not to violate the interpolation limits
+    if isinstance(esoh_sim.parameter_values["Positive electrode OCP [V]"], tuple):
+        y_100_min = np.min(
+            esoh_sim.parameter_values["Positive electrode OCP [V]"][1][:, 0]
+        )
+        x_100_max = (n_Li * pybamm.constants.F.value / 3600 - y_100_min * C_p) / C_n
+        x_100_init = np.minimum(x_100_init, 0.99 * x_100_max)
+    return x_100_init
+
+
+def make_cycle_solutions(all_step_solutions, esoh_sim=None, save_cycles=None):
+    """
+    Batched version of :func:`make_cycle_solution`: create the Solutions for several
+    cycles, and calculate their summary variables together with
+    :func:`get_batched_cycle_summary_variables`
+
+    Parameters
+    ----------
+    all_step_solutions : list of lists of :class:`Solution`
+        The step solutions that form each cycle
+    esoh_sim : :class:`pybamm.Simulation`, optional
+        A simulation, whose model should be a :class:`pybamm.lithium_ion.ElectrodeSOH`
+        model, which is used to calculate some of the summary variables. If `None`
+        (default) then only summary variables that do not require the eSOH calculation
+        are calculated.
+    save_cycles : list of bool, optional
+        Whether to save the entire cycle variables or just the summary variables, for
+        each cycle. Default is to save all the cycles.
+
+    Returns
+    -------
+    cycle_solutions : list of :class:`pybamm.Solution` or None
+        The Solution object for each cycle, or None (for the cycles that are not
+        saved)
+    all_cycle_summary_variables : list of dict
+        Dictionary of summary variables for each cycle
+    """
+    if save_cycles is None:
+        save_cycles = [True] * len(all_step_solutions)
+
+    cycle_solutions = [
+        _build_cycle_solution(step_solutions) for step_solutions in all_step_solutions
+    ]
+    all_cycle_summary_variables = get_batched_cycle_summary_variables(
+        cycle_solutions, esoh_sim
+    )
+
+    for i, (cycle_solution, cycle_summary_variables, save_this_cycle) in enumerate(
+        zip(cycle_solutions, all_cycle_summary_variables, save_cycles)
+    ):
+        if save_this_cycle:
+            cycle_solution.cycle_summary_variables = cycle_summary_variables
+        else:
+            cycle_solutions[i] = None
+
+    return cycle_solutions, all_cycle_summary_variables
+
+
+def get_batched_cycle_summary_variables(cycle_solutions, esoh_sim):
+    """
+    Calculate the summary variables of several cycles in a single pass, giving the
+    same results as calling :func:`get_cycle_summary_variables` for each cycle.
+
+    The discharge capacity (at all the time points of all the cycles) and the
+    degradation variables (at the first and last state of each cycle) are evaluated
+    with a single function per model, mapped over all the points at once, instead of
+    processing each variable for each cycle. The eSOH problems of all the cycles are
+    stacked into a single (block-diagonal) algebraic system, which is solved with one
+    call to the CasADi rootfinder.
+
+    Parameters
+    ----------
+    cycle_solutions : list of :class:`pybamm.Solution`
+        The solutions of the cycles
+    esoh_sim : :class:`pybamm.Simulation`
+        A simulation, whose model should be a :class:`pybamm.lithium_ion.ElectrodeSOH`
+        model, or None to skip the eSOH calculation. The eSOH problems are
+        initialised with the solution of the last cycle of the previous call, which
+        is stored in the initial conditions of the built eSOH model (or, the first
+        time, with the solution of the first cycle).
+
+    Returns
+    -------
+    list of dict
+        Dictionary of summary variables for each cycle
+    """
+    all_cycle_summary_variables = _get_degradation_summary_variables(
+        cycle_solutions
+    )
+
+    if esoh_sim is not None and len(cycle_solutions) > 0:
+        esoh_summary_variables = _solve_batched_esoh(
+            esoh_sim, cycle_solutions, all_cycle_summary_variables
+        )
+        for cycle_summary_variables, esoh_variables in zip(
+            all_cycle_summary_variables, esoh_summary_variables
+        ):
+            cycle_summary_variables.update(esoh_variables)
+            cycle_summary_variables["Capacity [A.h]"] = cycle_summary_variables["C"]
+
+    return all_cycle_summary_variables
+
+
+def _get_degradation_summary_variables(cycle_solutions):
+    """
+    Calculate the summary variables that do not require the eSOH calculation for
+    each cycle. The discharge capacity (at all the time points of all the cycles) and
+    the degradation variables (at the first and last state of each cycle) are each
+    evaluated in a single pass.
+    """
+    points = []
+    for cycle_solution in cycle_solutions:
+        points.extend(
+            zip(
+                cycle_solution.all_models,
+                cycle_solution.all_ts,
+                cycle_solution.all_ys,
+                cycle_solution.all_inputs,
+                cycle_solution.all_inputs_casadi,
+            )
+        )
+    Q_values = iter(_evaluate_variables(["Discharge capacity [A.h]"], points))
+
+    points = []
+    for cycle_solution in cycle_solutions:
+        for state in [cycle_solution.first_state, cycle_solution.last_state]:
+            points.append(
+                (
+                    state.all_models[0],
+                    state.all_ts[0],
+                    state.all_ys[0],
+                    state.all_inputs[0],
+                    state.all_inputs_casadi[0],
+                )
+            )
+    degradation_values = iter(_evaluate_variables(_degradation_variables, points))
+
+    all_cycle_summary_variables = []
+    for cycle_solution in cycle_solutions:
+        Q = np.concatenate(
+            [next(Q_values)[0] for _ in range(len(cycle_solution.all_ts))], axis=1
+        )
+        min_Q = np.min(Q)
+        max_Q = np.max(Q)
+
+        cycle_summary_variables = pybamm.FuzzyDict(
+            {
+                "Minimum measured discharge capacity [A.h]": min_Q,
+                "Maximum measured discharge capacity [A.h]": max_Q,
+                "Measured capacity [A.h]": max_Q - min_Q,
+            }
+        )
+        data_first = next(degradation_values)
+        data_last = next(degradation_values)
+        for var, value_first, value_last in zip(
+            _degradation_variables, data_first, data_last
+        ):
+            cycle_summary_variables[var] = value_last.flat[0]
+            var_lowercase = var[0].lower() + var[1:]
+            cycle_summary_variables["Change in " + var_lowercase] = (
+                value_last.flat[0] - value_first.flat[0]
+            )
+        all_cycle_summary_variables.append(cycle_summary_variables)
+
+    return all_cycle_summary_variables
+
+
+def _evaluate_variables(names, points):
+    """
+    Evaluate the variables `names` at a list of points, with a single call for each
+    model to the function returned by
+    :meth:`pybamm.BaseModel.get_stacked_variables_casadi`, mapped over all the time
+    points of that model.
+
+    Parameters
+    ----------
+    names : list of str
+        The names of the variables to evaluate
+    points : list of tuples
+        Tuples (model, t, y, inputs, inputs_casadi) of the model, the times, the
+        states (one column for each time), the inputs dictionary and the inputs as a
+        casadi vector (or as a matrix with one column for each time) for each point
+
+    Returns
+    -------
+    list of lists of :class:`numpy.array`
+        For each point, the values of each variable (one column for each time)
+    """
+    groups = {}
+    for i, point in enumerate(points):
+        groups.setdefault(id(point[0]), []).append(i)
+
+    values = [None] * len(points)
+    for idxs in groups.values():
+        model, _, ys, inputs, _ = points[idxs[0]]
+        func = model.get_stacked_variables_casadi(names, ys.shape[0], inputs)
+
+        ts = [points[i][1] for i in idxs]
+        t = np.concatenate(ts)
+        y = np.hstack([points[i][2] for i in idxs])
+        inputs_casadi = casadi.horzcat(
+            *[
+                inp
+                if inp.shape[1] == len(t_i)
+                else casadi.repmat(casadi.DM(inp), 1, len(t_i))
+                for t_i, inp in zip(ts, [points[i][4] for i in idxs])
+            ]
+        )
+        # Evaluate all the points at once
+        results = func.map(len(t))(t[np.newaxis, :], y, inputs_casadi)
+        if len(names) == 1:
+            results = [results]
+        splits = np.cumsum([len(t_i) for t_i in ts])[:-1]
+        results = [np.split(result.full(), splits, axis=1) for result in results]
+        for j, i in enumerate(idxs):
+            values[i] = [result[j] for result in results]
+
+    return values
+
+
+def _solve_batched_esoh(esoh_sim, cycle_solutions, all_cycle_summary_variables):
+    """
+    Solve the eSOH problems for several cycles as a single algebraic system, and
+    return the eSOH variables for each cycle
+    """
+    V_min = esoh_sim.parameter_values["Lower voltage cut-off [V]"]
+    V_max = esoh_sim.parameter_values["Upper voltage cut-off [V]"]
+    n_cycles = len(cycle_solutions)
+    input_names = ["V_min", "V_max", "C_n", "C_p", "n_Li"]
+    inputs = np.array(
+        [
+            [
+                V_min,
+                V_max,
+                summary_variables["Negative electrode capacity [A.h]"],
+                summary_variables["Positive electrode capacity [A.h]"],
+                summary_variables["Total lithium in particles [mol]"],
+            ]
+            for summary_variables in all_cycle_summary_variables
+        ]
+    ).T
+    inputs_dict = {name: inputs[i, :1] for i, name in enumerate(input_names)}
+
+    if esoh_sim.built_model is None:
+        # Use the same initial guess as get_cycle_summary_variables for the first
+        # cycle
+        esoh_sim.build()
+        _, _, C_n, C_p, n_Li = inputs[:, 0]
+        x_100_init = _get_esoh_x_100_init(
+            esoh_sim, cycle_solutions[0], C_n, C_p, n_Li
+        )
+        # make sure x_0 > 0
+        C_init = np.minimum(
+            0.95 * (C_n * x_100_init),
+            all_cycle_summary_variables[0]["Measured capacity [A.h]"],
+        )
+        esoh_sim.built_model.set_initial_conditions_from(
+            {"x_100": x_100_init, "C": C_init}
+        )
+        if n_cycles > 1:
+            # Solve the first cycle on its own, and initialize the other cycles with
+            # its solution, as the eSOH problem can have several solutions
+            return _solve_batched_esoh(
+                esoh_sim, cycle_solutions[:1], all_cycle_summary_variables[:1]
+            ) + _solve_batched_esoh(
+                esoh_sim, cycle_solutions[1:], all_cycle_summary_variables[1:]
+            )
+
+    # initialize with the solution of the last cycle if it is available
+    model = esoh_sim.built_model
+    y0 = model.concatenated_initial_conditions.evaluate(inputs=inputs_dict)
+    y0 = np.tile(y0, (1, n_cycles))
+
+    # Stack the algebraic equations of all the cycles into one system
+    n_states = model.len_rhs_and_alg
+    t_MX = casadi.MX.sym("t")
+    y_MX = casadi.MX.sym("y", n_states)
+    symbolic_inputs_dict = {name: casadi.MX.sym(name) for name in input_names}
+    symbolic_inputs = casadi.vertcat(*symbolic_inputs_dict.values())
+    algebraic = casadi.Function(
+        "esoh_algebraic",
+        [t_MX, y_MX, symbolic_inputs],
+        [
+            model.concatenated_algebraic.to_casadi(
+                t_MX, y_MX, inputs=symbolic_inputs_dict
+            )
+        ],
+    )
+    y_all = casadi.MX.sym("y", n_states * n_cycles)
+    inputs_all = casadi.MX.sym("inputs", len(input_names) * n_cycles)
+    algebraic_all = casadi.vec(
+        algebraic.map(n_cycles)(
+            0,
+            casadi.reshape(y_all, n_states, n_cycles),
+            casadi.reshape(inputs_all, len(input_names), n_cycles),
+        )
+    )
+
+    # Constrain the unknowns to be positive if their lower bound is positive, as in
+    # the CasadiAlgebraicSolver
+    tol = 1e-6
+    constraints = np.zeros_like(model.bounds[0], dtype=int)
+    constraints[model.bounds[0] >= 0] = 1
+    roots = casadi.rootfinder(
+        "esoh",
+        "newton",
+        dict(x=y_all, p=inputs_all, g=algebraic_all),
+        {"abstol": tol, "constraints": list(np.tile(constraints, n_cycles))},
+    )
+    error_message = (
+        "Could not solve for summary variables, run "
+        "`sim.solve(calc_esoh=False)` to skip this step"
+    )
+    p = inputs.flatten(order="F")
+    try:
+        y_sol = roots(y0.flatten(order="F"), p)
+    except RuntimeError:  # pragma: no cover
+        raise pybamm.SolverError(error_message)
+    residual = casadi.Function("residual", [y_all, inputs_all], [algebraic_all])(
+        y_sol, p
+    ).full()
+    if np.any(np.isnan(residual)) or np.any(np.abs(residual) > tol):
+        raise pybamm.SolverError(error_message)  # pragma: no cover
+    y_sol = y_sol.full().reshape((n_states, n_cycles), order="F")
+
+    # Store the solution of the last cycle to initialize the next batch
+    model.set_initial_conditions_from(
+        {
+            name: model.variables[name].evaluate(y=y_sol[:, -1:], inputs=inputs_dict)
+            for name in ["x_100", "C"]
+        }
+    )
+
+    esoh_names = list(model.variables.keys())
+    esoh_values = _evaluate_variables(
+        esoh_names,
+        [(model, np.zeros(n_cycles), y_sol, inputs_dict, casadi.DM(inputs))],
+    )[0]
+    return [
+        {name: value[0, i] for name, value in zip(esoh_names, esoh_values)}
+        for i in range(n_cycles)
+    ]
+
+
+def load_compact(directory):
+    """
+    Load a solution saved in the 'compact' format (see :meth:`Solution.save`), with
+    memory-mapped times and states. :func:`pybamm.load` calls this function if it is
+    given a directory.
+
+    Parameters
+    ----------
+    directory : str
+        The directory that the solution was saved to
+
+    Returns
+    -------
+    :class:`pybamm.Solution`
+        The loaded solution
+    """
+    with open(os.path.join(directory, "solution.pkl"), "rb") as f:
+        metadata = pickle.load(f)
+    t = np.load(os.path.join(directory, "t.npy"), mmap_mode="r")
+    states = {}
+    for sub in metadata["sub_solutions"]:
+        n_states = sub["y"][0]
+        if n_states not in states:
+            states[n_states] = np.load(
+                os.path.join(directory, "y_{}.npy".format(n_states)), mmap_mode="r"
+            ).T
+
+    all_ts = []
+    all_ys = []
+    all_models = []
+    all_inputs = []
+    all_ids = []
+    for sub in metadata["sub_solutions"]:
+        n_states, start, end = sub["y"]
+        all_ts.append(t[sub["t"][0] : sub["t"][1]])
+        all_ys.append(states[n_states][:, start:end])
+        all_models.append(metadata["models"][sub["model"]])
+        all_inputs.append(sub["inputs"])
+        all_ids.append(object())
+
+    def new_solution(parts):
+        ts, ys, models, inputs, ids = [], [], [], [], []
+        for part in parts:
+            if part[0] == "ref":
+                i = part[1]
+                ts.append(all_ts[i])
+                ys.append(all_ys[i])
+                models.append(all_models[i])
+                inputs.append(all_inputs[i])
+                ids.append(all_ids[i])
+            else:
+                ts.append(part[1])
+                ys.append(part[2])
+                models.append(metadata["models"][part[3]])
+                inputs.append(part[4])
+                ids.append(object())
+        solution = Solution(
+            ts,
+            ys,
+            models,
+            inputs,
+            metadata["t_event"],
+            metadata["y_event"],
+            metadata["termination"],
+        )
+        solution.timescale_eval = metadata["timescale_eval"]
+        solution.length_scales_eval = metadata["length_scales_eval"]
+        solution.set_up_time = metadata["set_up_time"]
+        solution.solve_time = metadata["solve_time"]
+        solution.integration_time = metadata["integration_time"]
+        # The cycles and steps share the identifiers of the sub-solutions of the
+        # full solution, so that the loaded solution can be saved again
+        solution._all_ids = ids
+        return solution
+
+    solution = new_solution([("ref", i) for i in range(len(all_ts))])
+
+    cycles = []
+    for cycle in metadata["cycles"]:
+        if cycle is None:
+            cycles.append(None)
+            continue
+        cycle_solution = new_solution(cycle["parts"])
+        cycle_solution.steps = [new_solution(step) for step in cycle["steps"]]
+        if cycle["summary_variables"] is not None:
+            cycle_solution.cycle_summary_variables = cycle["summary_variables"]
+        cycles.append(cycle_solution)
+    solution.cycles = cycles
+    if metadata["all_summary_variables"]:
+        solution.set_summary_variables(metadata["all_summary_variables"])
+
+    return solution
+
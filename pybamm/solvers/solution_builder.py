@@ -0,0 +1,251 @@
+#
+# Append-only accumulator of solutions
+#
+import collections.abc
+import itertools
+
+import numpy as np
+
+import pybamm
+
+
+class SolutionBuilder(object):
+    """
+    A mutable, append-only accumulator of solutions, used to join many solutions
+    together (e.g. the steps of an experiment) without creating a new
+    :class:`pybamm.Solution` after each one.
+
+    Appending a solution with :meth:`SolutionBuilder.append` has the same effect as
+    adding it with `+` (see :meth:`pybamm.Solution.__add__`), but only extends the
+    lists of sub-solutions held by the builder, so that accumulating `n` solutions
+    takes O(n) time rather than O(n^2). The concatenated time vector is also updated
+    in place (with amortised O(1) appends), so that it does not have to be computed
+    again for each new solution. :meth:`SolutionBuilder.build` returns the
+    accumulated :class:`pybamm.Solution`, which is cached until the next append. The
+    lists of the solution are views of the first items of the lists of the builder,
+    so building a solution after each append does not copy them.
+
+    Parameters
+    ----------
+    solution : :class:`pybamm.Solution`, optional
+        The first solution to append
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> sim = pybamm.Simulation(pybamm.lithium_ion.SPM())
+    >>> builder = pybamm.SolutionBuilder()
+    >>> for _ in range(10):
+    ...     builder.append(sim.step(60, save=False))
+    >>> solution = builder.build()
+    """
+
+    def __init__(self, solution=None):
+        self.all_ts = []
+        self.all_ys = []
+        self.all_models = []
+        self.all_inputs = []
+        self.all_inputs_casadi = []
+        self.sub_solutions = []
+        self.all_ids = []
+
+        self.t_event = None
+        self.y_event = None
+        self.termination = None
+        self.set_up_time = None
+        self.solve_time = None
+        self.integration_time = None
+
+        # Buffer holding the concatenated time vector, which grows geometrically
+        self._t_buffer = np.empty(0)
+        self._len_t = 0
+        self._t_increasing = True
+
+        self._solution = None
+
+        if solution is not None:
+            self.append(solution)
+
+    @classmethod
+    def from_solution(cls, solution):
+        """
+        Return the builder that built `solution`, if `solution` is the latest
+        solution that it built, so that appending to the builder continues from
+        `solution`. Otherwise, return a new builder starting from `solution`.
+        """
+        builder = getattr(solution, "_builder", None)
+        if builder is not None and builder._solution is solution:
+            return builder
+        return cls(solution)
+
+    def __len__(self):
+        """Number of sub-solutions in the builder"""
+        return len(self.all_ts)
+
+    def append(self, solution):
+        """
+        Append `solution` to the accumulated solution. As when adding solutions,
+        the first time point of `solution` is skipped if it is the same as the last
+        time point of the accumulated solution.
+        """
+        if not isinstance(solution, pybamm.Solution):
+            raise pybamm.SolverError(
+                "Only a Solution or None can be added to a Solution"
+            )
+        self._solution = None
+
+        if len(self.all_ts) == 0:
+            # Same as None + solution
+            self.all_ts.extend(solution.all_ts)
+            self.all_ys.extend(solution.all_ys)
+            self.all_models.extend(solution.all_models)
+            self.all_inputs.extend(solution.all_inputs)
+            self.all_inputs_casadi.extend(solution.all_inputs_casadi)
+            self.sub_solutions.extend(solution.sub_solutions)
+            self.all_ids.extend(solution._all_ids)
+            self.set_up_time = solution.set_up_time
+            self.solve_time = solution.solve_time
+            self.integration_time = solution.integration_time
+            for ts in solution.all_ts:
+                self._append_t(ts)
+
+        # Special case: new solution only has one timestep and it is already in the
+        # existing solution. In this case, only the termination is updated
+        elif (
+            len(solution.all_ts) == 1
+            and len(solution.all_ts[0]) == 1
+            and solution.all_ts[0][0] == self.all_ts[-1][-1]
+        ):
+            pass
+
+        else:
+            if solution.all_ts[0][0] == self.all_ts[-1][-1]:
+                # Skip first time step if it is repeated
+                self.all_ts.append(solution.all_ts[0][1:])
+                self.all_ys.append(solution.all_ys[0][:, 1:])
+                self.all_ts.extend(solution.all_ts[1:])
+                self.all_ys.extend(solution.all_ys[1:])
+            else:
+                self.all_ts.extend(solution.all_ts)
+                self.all_ys.extend(solution.all_ys)
+            for ts in self.all_ts[-len(solution.all_ts) :]:
+                self._append_t(ts)
+            self.all_models.extend(solution.all_models)
+            self.all_inputs.extend(solution.all_inputs)
+            self.all_inputs_casadi.extend(solution.all_inputs_casadi)
+            self.sub_solutions.extend(solution.sub_solutions)
+            self.all_ids.extend(solution._all_ids)
+            self.solve_time = self.solve_time + solution.solve_time
+            self.integration_time = self.integration_time + solution.integration_time
+
+        # Update termination using the latter solution
+        self.t_event = solution.t_event
+        self.y_event = solution.y_event
+        self.termination = solution.termination
+
+    def _append_t(self, ts):
+        ts = np.asarray(ts, dtype=float).reshape(-1)
+        new_len_t = self._len_t + ts.size
+        if new_len_t > self._t_buffer.size:
+            new_buffer = np.empty(max(new_len_t, 2 * self._t_buffer.size))
+            new_buffer[: self._len_t] = self._t_buffer[: self._len_t]
+            self._t_buffer = new_buffer
+        if ts.size > 0:
+            if self._len_t > 0:
+                self._t_increasing &= ts[0] > self._t_buffer[self._len_t - 1]
+            self._t_increasing &= bool(np.all(np.diff(ts) > 0))
+        self._t_buffer[self._len_t : new_len_t] = ts
+        self._len_t = new_len_t
+
+    def build(self):
+        """
+        Return the accumulated solution (None if nothing has been appended). The
+        solution is cached, and is only created again after the next append.
+        """
+        if len(self.all_ts) == 0:
+            return None
+        if self._solution is None:
+            # The lists are only appended to, so views of their current items are not
+            # affected by later appends
+            length = len(self.all_ts)
+            solution = pybamm.Solution(
+                _ListView(self.all_ts, length),
+                _ListView(self.all_ys, length),
+                _ListView(self.all_models, length),
+                _ListView(self.all_inputs, length),
+                self.t_event,
+                self.y_event,
+                self.termination,
+            )
+            solution._all_inputs_casadi = _ListView(self.all_inputs_casadi, length)
+            solution._sub_solutions = _ListView(
+                self.sub_solutions, len(self.sub_solutions)
+            )
+            solution._all_ids = _ListView(self.all_ids, length)
+
+            solution.set_up_time = self.set_up_time
+            solution.solve_time = self.solve_time
+            solution.integration_time = self.integration_time
+
+            # Use the time vector that has already been concatenated (appends only
+            # write beyond the end of this view). If the times are not increasing,
+            # leave it to the solution to raise an error when `t` is accessed
+            if self._t_increasing:
+                t = self._t_buffer[: self._len_t]
+                t.flags.writeable = False
+                solution._t = t
+
+            solution._builder = self
+            self._solution = solution
+        return self._solution
+
+
+class _ListView(collections.abc.Sequence):
+    """
+    View of the first `length` items of a list that is only appended to. Replacing
+    an item copies these items first, so that the list itself is not modified.
+    Pickling a view pickles a list of its items.
+    """
+
+    def __init__(self, items, length):
+        self._items = items
+        self._length = length
+        self._copied = False
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("list index out of range")
+        return self._items[index]
+
+    def __setitem__(self, index, value):
+        if not self._copied:
+            self._items = list(self)
+            self._copied = True
+        self._items[index] = value
+
+    def __iter__(self):
+        return itertools.islice(self._items, self._length)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,149 @@
+#
+# Out-of-core storage for the states of solutions
+#
+import os
+import shutil
+import tempfile
+
+import casadi
+import numpy as np
+
+import pybamm
+
+
+class SolutionStore(object):
+    """
+    Out-of-core storage for the states of solutions, used to limit the memory used by
+    long simulations (e.g. many cycles of an experiment).
+
+    :meth:`SolutionStore.write` moves the states (`all_ys`) of a solution to disk, as
+    a `.npy` file, and replaces them with read-only memory-mapped arrays. The
+    solution can be used as before, but the states are only read back from disk when
+    they are needed: post-processing a variable only reads the time points that it is
+    evaluated at, and :meth:`pybamm.Solution.get_window` can be used to only process
+    a given time window. The states are stored time-major, so that the state at a
+    given time is contiguous on disk.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory in which to write the files. If None (default), a temporary
+        directory is created, which is removed when the store is deleted. Solutions
+        written by the store keep a reference to it, so the store is only deleted
+        once none of these solutions are in use.
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> experiment = pybamm.Experiment(
+    ...     ["Discharge at 1C until 3V", "Charge at 1C until 4.2V"] * 100
+    ... )
+    >>> sim = pybamm.Simulation(pybamm.lithium_ion.SPM(), experiment=experiment)
+    >>> solution = sim.solve(solution_store=pybamm.SolutionStore())
+    >>> voltage = solution.get_window(3600, 7200)["Terminal voltage [V]"].entries
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="pybamm-solution-")
+            self._temporary = True
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self._temporary = False
+        self.directory = directory
+        self._paths = []
+
+    def __getstate__(self):
+        # Only the original store is responsible for removing the temporary directory
+        state = self.__dict__.copy()
+        state["_temporary"] = False
+        return state
+
+    def __del__(self):
+        try:
+            if self._temporary:
+                self.clear()
+        except Exception:  # pragma: no cover
+            pass
+
+    @property
+    def size(self):
+        """Total size of the files written by the store, in bytes"""
+        return sum(
+            os.path.getsize(path) for path in self._paths if os.path.exists(path)
+        )
+
+    def write(self, solution):
+        """
+        Move the states of `solution` (and of its sub-solutions) to disk, replacing
+        them with memory-mapped arrays. States that are already memory-mapped, or
+        symbolic, are left unchanged. Returns `solution`.
+
+        The solution should be written before it is added to other solutions, since
+        the sum of two solutions keeps references to the states of both.
+        """
+        # Make sure that any explicit sensitivities have been extracted from the
+        # states before they are moved
+        solution.sensitivities
+
+        # Collect the states that are still held in memory
+        arrays = {}
+        for sol in [solution] + solution.sub_solutions:
+            for y in sol.all_ys:
+                if not isinstance(y, (np.memmap, casadi.MX)):
+                    arrays[id(y)] = y
+        written = self._write_arrays(list(arrays.values()))
+
+        for sol in [solution] + solution.sub_solutions:
+            # Update the list in place so that solutions sharing the list (e.g.
+            # copies of this solution) also use the memory-mapped states
+            for i, y in enumerate(sol.all_ys):
+                sol.all_ys[i] = written.get(id(y), y)
+            # The files must not be removed while the solution is in use
+            sol._store = self
+            # Remove any cached objects that refer to the states held in memory
+            for attr in ["_y", "_first_state", "_last_state"]:
+                sol.__dict__.pop(attr, None)
+        return solution
+
+    def _write_arrays(self, arrays):
+        """
+        Write `arrays` to disk, in one file per number of states, and return a
+        dictionary of memory-mapped views of the written arrays, keyed by the id of
+        the original arrays
+        """
+        groups = {}
+        for y in arrays:
+            groups.setdefault(y.shape[0], []).append(y)
+
+        written = {}
+        for group in groups.values():
+            values = [y.full() if isinstance(y, casadi.DM) else y for y in group]
+            fd, path = tempfile.mkstemp(suffix=".npy", dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(np.hstack(values).T))
+            self._paths.append(path)
+            pybamm.logger.debug("Wrote {} states to {}".format(len(values), path))
+
+            y_stored = np.load(path, mmap_mode="r").T
+            start = 0
+            for y, value in zip(group, values):
+                end = start + value.shape[1]
+                written[id(y)] = y_stored[:, start:end]
+                start = end
+        return written
+
+    def clear(self):
+        """
+        Remove the files written by the store (and the directory, if it is
+        temporary). Solutions whose states were written by the store must not be
+        used afterwards.
+        """
+        for path in self._paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # pragma: no cover
+                pass
+        self._paths = []
+        if self._temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
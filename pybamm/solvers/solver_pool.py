@@ -0,0 +1,314 @@
+#
+# Persistent pool of worker processes for solving with many sets of inputs
+#
+import collections
+import itertools
+import multiprocessing as mp
+import os
+import pickle
+import queue
+
+import pybamm
+
+
+class SolverPool(object):
+    """
+    A persistent pool of worker processes, used to solve the same model with many
+    different sets of input parameters.
+
+    Unlike the `multiprocessing.Pool` that :meth:`pybamm.BaseSolver.solve` creates
+    when it is given a list of inputs, the worker processes of a `SolverPool` are
+    started once and reused across calls. Each (solver, model) pair is only sent to
+    each worker the first time it is needed, and is then kept resident in that
+    worker, together with any functions that the solver compiles during set-up (e.g.
+    CasADi functions and integrators). Subsequent calls only send the input
+    parameters, in chunks, and receive the solutions as soon as they are finished.
+
+    If the model or solver is modified after having been sent to the pool, call
+    :meth:`SolverPool.clear` so that the updated version is sent again.
+
+    Parameters
+    ----------
+    nproc : int, optional
+        Number of worker processes. Defaults to value returned by "os.cpu_count()".
+    chunksize : int, optional
+        Number of sets of inputs sent to a worker at a time. Default is 1.
+
+    Examples
+    --------
+    >>> import pybamm
+    >>> model = pybamm.lithium_ion.SPM()
+    >>> param = model.default_parameter_values
+    >>> param["Current function [A]"] = "[input]"
+    >>> sim = pybamm.Simulation(model, parameter_values=param)
+    >>> inputs = [{"Current function [A]": I} for I in [0.5, 1, 2]]
+    >>> with pybamm.SolverPool(nproc=2) as pool:
+    ...     solutions = sim.solve([0, 3600], inputs=inputs, pool=pool)
+    """
+
+    def __init__(self, nproc=None, chunksize=1):
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        self.nproc = nproc or os.cpu_count()
+        self.chunksize = chunksize
+
+        self._workers = None
+        self._result_queue = None
+        # (solver, model) pairs that have been sent to the workers, keyed by id
+        self._resident = {}
+        self._token_counter = itertools.count()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:  # pragma: no cover
+            pass
+
+    @property
+    def is_running(self):
+        return self._workers is not None
+
+    def start(self):
+        """Start the worker processes (if they are not already running)"""
+        if self.is_running:
+            return
+        pybamm.logger.verbose("Starting solver pool with {} workers".format(self.nproc))
+        ctx = mp.get_context()
+        self._result_queue = ctx.Queue()
+        self._workers = []
+        for worker_id in range(self.nproc):
+            task_queue = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_loop,
+                args=(worker_id, task_queue, self._result_queue),
+                daemon=True,
+            )
+            process.start()
+            self._workers.append(_WorkerHandle(process, task_queue))
+
+    def close(self):
+        """Stop the worker processes and forget all resident models"""
+        if self._workers is not None:
+            for worker in self._workers:
+                if worker.process.is_alive():
+                    worker.task_queue.put(None)
+            for worker in self._workers:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():  # pragma: no cover
+                    worker.process.terminate()
+                worker.task_queue.close()
+            self._result_queue.close()
+        self._workers = None
+        self._result_queue = None
+        self._resident = {}
+
+    def clear(self, model=None):
+        """
+        Forget the resident copies of `model` (or of all models, if `model` is None),
+        so that they are sent to the workers again the next time they are needed.
+        """
+        if model is None:
+            to_clear = list(self._resident.keys())
+        else:
+            to_clear = [key for key in self._resident if key[1] == id(model)]
+        for key in to_clear:
+            token = self._resident.pop(key)[0]
+            for worker in self._workers or []:
+                if token in worker.tokens:
+                    worker.task_queue.put(("drop", token))
+                    worker.tokens.discard(token)
+
+    def map(self, solver, model, t_eval, inputs_list, **kwargs):
+        """
+        Solve `model` with `solver` for each set of inputs in `inputs_list`.
+
+        Parameters
+        ----------
+        solver : :class:`pybamm.BaseSolver`
+            The solver to use
+        model : :class:`pybamm.BaseModel`
+            The model to solve
+        t_eval : numeric type
+            The times (in seconds) at which to compute the solution
+        inputs_list : list of dict
+            The sets of input parameters
+        **kwargs
+            Additional key-word arguments passed to `solver.solve` in each worker.
+            See :meth:`pybamm.BaseSolver.solve`.
+
+        Returns
+        -------
+        list of :class:`pybamm.Solution`
+            The solutions, in the same order as `inputs_list`
+        """
+        solutions = [None] * len(inputs_list)
+        for idx, solution in self.imap(solver, model, t_eval, inputs_list, **kwargs):
+            solutions[idx] = solution
+        return solutions
+
+    def imap(self, solver, model, t_eval, inputs_list, **kwargs):
+        """
+        Same as :meth:`SolverPool.map`, but returns a generator that yields
+        `(index, solution)` pairs as soon as each solution is finished, where `index`
+        is the position of the corresponding inputs in `inputs_list`.
+        """
+        self.start()
+        token = self._get_token(solver, model)
+
+        tasks = collections.deque(_chunks(list(enumerate(inputs_list)), self.chunksize))
+        n_tasks = len(tasks)
+        payload = None
+        outstanding = 0
+        error = None
+
+        def submit(worker):
+            nonlocal payload, outstanding
+            if token not in worker.tokens:
+                # The model is pickled at most once per call, and only sent to the
+                # workers that do not have it yet
+                if payload is None:
+                    payload = pickle.dumps(
+                        (solver.copy(), model), pickle.HIGHEST_PROTOCOL
+                    )
+                worker.task_queue.put(("load", token, payload))
+                worker.tokens.add(token)
+            worker.task_queue.put(("solve", token, t_eval, tasks.popleft(), kwargs))
+            outstanding += 1
+
+        try:
+            # Keep (at most) two chunks queued on each worker, so that workers never
+            # wait for the next chunk to be sent
+            for worker in self._workers * 2:
+                if not tasks:
+                    break
+                submit(worker)
+
+            for _ in range(n_tasks):
+                worker_id, results = self._get_result()
+                outstanding -= 1
+                if tasks and error is None:
+                    submit(self._workers[worker_id])
+                for idx, solution, exception in results:
+                    if exception is not None:
+                        # Stop sending new chunks and raise once the workers are
+                        # done with the chunks that they have already received
+                        error = error or exception
+                    elif error is None:
+                        _attach_model(solution, model)
+                        yield idx, solution
+                if error is not None and outstanding == 0:
+                    break
+        finally:
+            # Collect any results that are still in flight (e.g. if the generator is
+            # closed early), so that they are not picked up by the next call
+            while outstanding > 0 and self.is_running:
+                self._get_result()
+                outstanding -= 1
+        if error is not None:
+            raise error
+
+    def _get_token(self, solver, model):
+        """
+        Return the token identifying the resident copy of (solver, model) in the
+        workers, creating a new token if the pair has not been seen before or if the
+        equations of the model have changed since it was sent.
+        """
+        key = (id(solver), id(model))
+        marker = _model_marker(model)
+        if key in self._resident:
+            token, old_marker, _, _ = self._resident[key]
+            if old_marker == marker:
+                return token
+            self.clear(model)
+        token = next(self._token_counter)
+        # keep references to the solver and model so that their ids are not reused
+        self._resident[key] = (token, marker, solver, model)
+        return token
+
+    def _get_result(self):
+        while True:
+            try:
+                return self._result_queue.get(timeout=1)
+            except queue.Empty:
+                if not all(worker.process.is_alive() for worker in self._workers):
+                    self.close()
+                    raise pybamm.SolverError(
+                        "A worker process of the solver pool exited unexpectedly"
+                    )
+
+
+class _WorkerHandle(object):
+    """Parent-side record of a worker process and the tokens it holds"""
+
+    def __init__(self, process, task_queue):
+        self.process = process
+        self.task_queue = task_queue
+        self.tokens = set()
+
+
+def _chunks(items, chunksize):
+    return [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+def _model_marker(model):
+    """Ids of the model equations, used to detect whether a model has changed"""
+    return tuple(
+        getattr(getattr(model, name, None), "id", None)
+        for name in [
+            "concatenated_rhs",
+            "concatenated_algebraic",
+            "concatenated_initial_conditions",
+        ]
+    ) + (len(model.events),)
+
+
+def _detach_model(solution):
+    """Remove references to the model, which should not be sent back to the parent"""
+    for sol in [solution] + solution.sub_solutions:
+        sol._all_models = [None] * len(sol._all_models)
+
+
+def _attach_model(solution, model):
+    for sol in [solution] + solution.sub_solutions:
+        sol._all_models = [model] * len(sol._all_models)
+
+
+def _worker_loop(worker_id, task_queue, result_queue):
+    """Main loop of a worker process"""
+    resident = {}
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        kind, token = task[:2]
+        if kind == "load":
+            resident[token] = pickle.loads(task[2])
+        elif kind == "drop":
+            resident.pop(token, None)
+        elif kind == "solve":
+            solver, model = resident[token]
+            t_eval, chunk, kwargs = task[2:]
+            results = []
+            for idx, inputs in chunk:
+                try:
+                    solution = solver.solve(model, t_eval, inputs=inputs, **kwargs)
+                    _detach_model(solution)
+                    results.append((idx, solution, None))
+                except Exception as e:
+                    results.append((idx, None, _picklable_exception(e)))
+            result_queue.put((worker_id, results))
+
+
+def _picklable_exception(e):
+    try:
+        pickle.loads(pickle.dumps(e))
+        return e
+    except Exception:  # pragma: no cover
+        return pybamm.SolverError("{}: {}".format(type(e).__name__, e))
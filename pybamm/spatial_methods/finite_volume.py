@@ -16,6 +16,8 @@ from scipy.sparse import (
 )
 import numpy as np
 
+from .spatial_method import cached_operator
+
 
 class FiniteVolume(pybamm.SpatialMethod):
     """
@@ -123,6 +125,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return new_bcs
 
+    @cached_operator
     def gradient_matrix(self, domain, auxiliary_domains):
         """
         Gradient matrix for finite volumes in the appropriate domain.
@@ -188,6 +191,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_operator
     def divergence_matrix(self, domains):
         """
         Divergence matrix for finite volumes in the appropriate domain.
@@ -248,6 +252,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_operator
     def definite_integral_matrix(
         self, child, vector_type="row", integration_dimension="primary"
     ):
@@ -361,6 +366,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_operator
     def indefinite_integral_matrix_edges(self, domains, direction):
         """
         Matrix for finite-volume implementation of the indefinite integral where the
@@ -461,6 +467,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return pybamm.Matrix(matrix)
 
+    @cached_operator
     def indefinite_integral_matrix_nodes(self, domains, direction):
         """
         Matrix for finite-volume implementation of the (backward) indefinite integral
@@ -1212,40 +1219,10 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         def arithmetic_mean(array):
             """Calculate the arithmetic mean of an array using matrix multiplication"""
-            # Create appropriate submesh by combining submeshes in domain
-            submesh = self.mesh.combine_submeshes(*array.domain)
-
-            # Create 1D matrix using submesh
-            n = submesh.npts
-
-            if shift_key == "node to edge":
-                sub_matrix_left = csr_matrix(
-                    ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
-                )
-                sub_matrix_center = diags([0.5, 0.5], [0, 1], shape=(n - 1, n))
-                sub_matrix_right = csr_matrix(
-                    ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
-                )
-                sub_matrix = vstack(
-                    [sub_matrix_left, sub_matrix_center, sub_matrix_right]
-                )
-            elif shift_key == "edge to node":
-                sub_matrix = diags([0.5, 0.5], [0, 1], shape=(n, n + 1))
-            else:
-                raise ValueError("shift key '{}' not recognised".format(shift_key))
-            # Second dimension length
-            second_dim_repeats = self._get_auxiliary_domain_repeats(
-                discretised_symbol.domains
+            matrix = self.arithmetic_mean_matrix(
+                array.domain, discretised_symbol.domains, shift_key
             )
-
-            # Generate full matrix from the submatrix
-            # Convert to csr_matrix so that we can take the index (row-slicing), which
-            # is not supported by the default kron format
-            # Note that this makes column-slicing inefficient, but this should not be an
-            # issue
-            matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
-            return pybamm.Matrix(matrix) @ array
+            return matrix @ array
 
         def harmonic_mean(array):
             """
@@ -1389,6 +1366,56 @@ class FiniteVolume(pybamm.SpatialMethod):
             raise ValueError("method '{}' not recognised".format(method))
         return out
 
+    @cached_operator
+    def arithmetic_mean_matrix(self, domain, domains, shift_key):
+        """
+        Matrix for the arithmetic mean of a symbol evaluated at nodes/edges, to shift
+        it to edges/nodes (see :meth:`FiniteVolume.shift`)
+
+        Parameters
+        ----------
+        domain : list
+            The domain of the symbol to be averaged
+        domains : dict
+            The domain(s) and auxiliary domains of the discretised symbol
+        shift_key : str
+            Whether to shift from nodes to edges ("node to edge"), or from edges to
+            nodes ("edge to node")
+
+        Returns
+        -------
+        :class:`pybamm.Matrix`
+            The (sparse) arithmetic mean matrix
+        """
+        # Create appropriate submesh by combining submeshes in domain
+        submesh = self.mesh.combine_submeshes(*domain)
+
+        # Create 1D matrix using submesh
+        n = submesh.npts
+
+        if shift_key == "node to edge":
+            sub_matrix_left = csr_matrix(([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n))
+            sub_matrix_center = diags([0.5, 0.5], [0, 1], shape=(n - 1, n))
+            sub_matrix_right = csr_matrix(
+                ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
+            )
+            sub_matrix = vstack([sub_matrix_left, sub_matrix_center, sub_matrix_right])
+        elif shift_key == "edge to node":
+            sub_matrix = diags([0.5, 0.5], [0, 1], shape=(n, n + 1))
+        else:
+            raise ValueError("shift key '{}' not recognised".format(shift_key))
+        # Second dimension length
+        second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
+
+        # Generate full matrix from the submatrix
+        # Convert to csr_matrix so that we can take the index (row-slicing), which is
+        # not supported by the default kron format
+        # Note that this makes column-slicing inefficient, but this should not be an
+        # issue
+        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
+
+        return pybamm.Matrix(matrix)
+
     def upwind_or_downwind(self, symbol, discretised_symbol, bcs, direction):
         """
         Implement an upwinding operator. Currently, this requires the symbol to have
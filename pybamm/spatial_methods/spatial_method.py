@@ -1,11 +1,54 @@
 #
 # A general spatial method class
 #
+import functools
 import pybamm
 import numpy as np
 from scipy.sparse import eye, kron, coo_matrix, csr_matrix, vstack
 
 
+def _get_operator_key(value):
+    """
+    Convert an argument of a method that creates an operator matrix to a hashable key.
+    Symbols are identified by their domains and whether they evaluate on edges, which
+    is all that the operator matrices depend on.
+    """
+    if isinstance(value, dict):
+        return tuple((k, _get_operator_key(v)) for k, v in sorted(value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_get_operator_key(v) for v in value)
+    elif isinstance(value, pybamm.Symbol):
+        return (
+            "symbol",
+            _get_operator_key(value.domains),
+            value.evaluates_on_edges("primary"),
+        )
+    else:
+        return value
+
+
+def cached_operator(method):
+    """
+    Decorator for the methods of a spatial method that create operator matrices. The
+    matrices are stored in the mesh (see :meth:`pybamm.Mesh.get_operator`), keyed on
+    the class of the spatial method, the name of the method and its arguments (e.g.
+    the domains and auxiliary domains), so that each matrix is only created once for
+    all the discretisations that use the same mesh.
+    """
+
+    @functools.wraps(method)
+    def cached_method(self, *args, **kwargs):
+        key = (
+            type(self),
+            method.__name__,
+            _get_operator_key(args),
+            _get_operator_key(kwargs),
+        )
+        return self.mesh.get_operator(key, lambda: method(self, *args, **kwargs))
+
+    return cached_method
+
+
 class SpatialMethod:
     """
     A general spatial methods class, with default (trivial) behaviour for some spatial
@@ -124,6 +124,137 @@ class FuzzyDict(dict):
             print("\n".join("{}".format(k) for k in results.keys()))
 
 
+class _LazyValue(object):
+    """An unprocessed value of a :class:`LazyFuzzyDict`"""
+
+    __slots__ = ["value", "processors"]
+
+    def __init__(self, value, processors):
+        self.value = value
+        self.processors = processors
+
+    def process(self):
+        value = self.value
+        for processor in self.processors:
+            value = processor(value)
+        return value
+
+
+class LazyFuzzyDict(FuzzyDict):
+    """
+    A :class:`FuzzyDict` whose values are only processed when they are first
+    accessed, e.g. the variables of a model after setting parameters and
+    discretising. Each unprocessed value is stored together with the functions that
+    process it (applied in order), and replaced by the processed value the first time
+    it is accessed. Keys, membership and length do not process any values.
+
+    Parameters
+    ----------
+    values : dict, optional
+        The values. Values that are already processed are stored as they are.
+    processors : list of callable, optional
+        The functions to apply, in order, to the values when they are accessed
+    """
+
+    def __init__(self, values=None, processors=None):
+        super().__init__()
+        values = values or {}
+        processors = tuple(processors or ())
+        for key, value in values.items():
+            if value is not None:
+                value = _LazyValue(value, processors)
+            dict.__setitem__(self, key, value)
+
+    @classmethod
+    def from_processed(cls, values, processor):
+        """
+        Create a :class:`LazyFuzzyDict` that applies `processor` to the values of
+        `values` when they are accessed. If `values` is itself a
+        :class:`LazyFuzzyDict`, values that have not been processed yet are
+        processed all the way in one go when they are first accessed.
+
+        Parameters
+        ----------
+        values : dict
+            The values to process
+        processor : callable
+            The function to apply to each value
+
+        Returns
+        -------
+        :class:`LazyFuzzyDict`
+            The lazily-processed values
+        """
+        new_dict = cls()
+        if isinstance(values, LazyFuzzyDict):
+            raw_items = dict.items(values)
+        else:
+            raw_items = values.items()
+        for key, value in raw_items:
+            # Missing values (None) are kept as they are, see
+            # :meth:`pybamm.BaseModel.check_default_variables_dictionaries`
+            if isinstance(value, _LazyValue):
+                value = _LazyValue(value.value, value.processors + (processor,))
+            elif value is not None:
+                value = _LazyValue(value, (processor,))
+            dict.__setitem__(new_dict, key, value)
+        return new_dict
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, _LazyValue):
+            value = value.process()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *args):
+        value = super().pop(key, *args)
+        if isinstance(value, _LazyValue):
+            value = value.process()
+        return value
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def copy(self):
+        new_dict = type(self)()
+        dict.update(new_dict, dict.items(self))
+        return new_dict
+
+    def is_processed(self, key):
+        """Whether the value of `key` has already been processed"""
+        return not isinstance(dict.__getitem__(self, key), _LazyValue)
+
+    def processed_values(self):
+        """The values that have already been processed"""
+        return [
+            value
+            for value in dict.values(self)
+            if not isinstance(value, _LazyValue)
+        ]
+
+    def unprocessed_values(self):
+        """The values that have not been processed yet, before processing"""
+        return [
+            value.value
+            for value in dict.values(self)
+            if isinstance(value, _LazyValue)
+        ]
+
+    def __reduce__(self):
+        # Pickle the processed values, since the functions that process them (e.g.
+        # bound methods of a discretisation) may not be picklable
+        return (FuzzyDict, (dict(self.items()),))
+
+
 class Timer(object):
     """
     Provides accurate timing.
@@ -309,6 +440,16 @@ def get_infinite_nested_dict():
 
 def load(filename):
     """Load a saved object"""
+    if os.path.isdir(filename):
+        if os.path.exists(os.path.join(filename, "simulation.pkl")):
+            # Simulation saved in the "compact" format
+            with open(os.path.join(filename, "simulation.pkl"), "rb") as f:
+                sim = pickle.load(f)
+            if os.path.isdir(os.path.join(filename, "solution")):
+                sim._solution = pybamm.load_compact(os.path.join(filename, "solution"))
+            return sim
+        # Solution saved in the "compact" format
+        return pybamm.load_compact(filename)
     with open(filename, "rb") as f:
         obj = pickle.load(f)
     return obj
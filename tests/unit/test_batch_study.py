@@ -2,6 +2,9 @@
 Tests for the batch_study.py
 """
 import pybamm
+import numpy as np
+import os
+import tempfile
 import unittest
 
 spm = pybamm.lithium_ion.SPM()
@@ -122,6 +125,80 @@ class TestBatchStudy(unittest.TestCase):
             models_list = [model.name for model in bs_true.models.values()]
             self.assertIn(output_model, models_list)
 
+    def test_executor(self):
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm, "SPMe": pybamm.lithium_ion.SPMe()},
+            solvers={"casadi safe": casadi_safe, "casadi fast": casadi_fast},
+            permutations=True,
+        )
+        bs.solve(t_eval=[0, 3600])
+        voltages = [sim.solution["Terminal voltage [V]"].entries for sim in bs.sims]
+
+        # combinations that only differ in solver share the built model
+        self.assertIs(bs.sims[0].built_model, bs.sims[1].built_model)
+        self.assertIsNot(bs.sims[0].built_model, bs.sims[2].built_model)
+
+        for executor in ["thread", "process"]:
+            bs.solve(t_eval=[0, 3600], executor=executor, max_workers=2)
+            self.assertEqual(len(bs.sims), 4)
+            for sim, voltage in zip(bs.sims, voltages):
+                np.testing.assert_array_equal(
+                    sim.solution["Terminal voltage [V]"].entries, voltage
+                )
+            self.assertEqual(
+                [sim.solver.mode for sim in bs.sims], ["safe", "fast", "safe", "fast"]
+            )
+
+        with self.assertRaisesRegex(ValueError, "executor must be"):
+            bs.solve(t_eval=[0, 3600], executor="gpu")
+        with pybamm.SolverPool(nproc=1) as pool:
+            with self.assertRaisesRegex(ValueError, "pool"):
+                bs.solve(t_eval=[0, 3600], executor="thread", pool=pool)
+
+        # models in the python format can't be sent back from worker processes
+        model = pybamm.lithium_ion.SPM()
+        model.convert_to_format = "python"
+        bs = pybamm.BatchStudy(models={"SPM": model, "SPMe": pybamm.lithium_ion.SPMe()})
+        with self.assertRaisesRegex(ValueError, "'python' format"):
+            bs.solve(t_eval=[0, 3600], executor="process")
+
+    def test_checkpoint(self):
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm}, solvers={"casadi safe": casadi_safe}, repeats=2
+        )
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            bs.solve(t_eval=[0, 3600], checkpoint_dir=checkpoint_dir)
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 1)
+            solution = bs.sims[0].solution
+
+            # finished simulations are loaded instead of being solved again
+            bs.solve(t_eval=[0, 3600], checkpoint_dir=checkpoint_dir)
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 1)
+            self.assertEqual(bs.sims[0].solution.solve_time, solution.solve_time)
+            np.testing.assert_array_equal(bs.sims[0].solution.t, solution.t)
+
+            # different arguments are solved again
+            bs.solve(t_eval=[0, 1800], checkpoint_dir=checkpoint_dir)
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 2)
+            self.assertEqual(bs.sims[0].solution.t[-1], solution.t[-1] / 2)
+
+            # unreadable checkpoints are ignored
+            for filename in os.listdir(checkpoint_dir):
+                with open(os.path.join(checkpoint_dir, filename), "w") as f:
+                    f.write("not a pickle")
+            bs.solve(t_eval=[0, 3600], checkpoint_dir=checkpoint_dir)
+            np.testing.assert_array_equal(bs.sims[0].solution.t, solution.t)
+
+            # failing to save a checkpoint does not stop the batch
+            class UnsavableSimulation:
+                def save(self, filename):
+                    raise OSError("disk full")
+
+            path = os.path.join(checkpoint_dir, "unsavable.pkl")
+            pybamm.batch_study._save_checkpoint(UnsavableSimulation(), path)
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 2)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
@@ -587,6 +587,42 @@ class TestDiscretise(unittest.TestCase):
         disc = get_discretisation_for_testing()
         disc.process_dict(variables)
 
+    def test_process_model_lazy_variables(self):
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        c = pybamm.Variable("c", domain=whole_cell)
+        d = pybamm.Variable("d")
+        model = pybamm.BaseModel()
+        model.rhs = {c: pybamm.div(pybamm.grad(c))}
+        model.initial_conditions = {c: pybamm.Scalar(3)}
+        model.boundary_conditions = {
+            c: {"left": (0, "Neumann"), "right": (1, "Neumann")}
+        }
+        model.variables = {"c": c, "N": pybamm.grad(c), "c_av": pybamm.x_average(c)}
+        model2 = pybamm.BaseModel()
+        model2.rhs = {d: -d, c: pybamm.div(pybamm.grad(c))}
+        model2.initial_conditions = {d: 1, c: 2}
+        model2.boundary_conditions = {
+            c: {"left": (1, "Neumann"), "right": (0, "Neumann")}
+        }
+
+        disc = get_discretisation_for_testing()
+        disc.process_model(model)
+        self.assertIsInstance(model.variables, pybamm.LazyFuzzyDict)
+        self.assertFalse(model.variables.is_processed("N"))
+        self.assertFalse(model.variables.is_processed("c_av"))
+
+        # discretising another model does not change the boundary conditions and
+        # slices used to discretise the variables of the first model
+        disc.process_model(model2)
+        n = disc.mesh.combine_submeshes(*whole_cell).npts
+        y = np.linspace(0, 1, n)
+        self.assertEqual(model.variables["c"].y_slices[0], slice(0, n))
+        N = model.variables["N"].evaluate(None, y)
+        self.assertEqual(N[0], 0)
+        self.assertEqual(N[-1], 1)
+        self.assertTrue(model.variables.is_processed("N"))
+        self.assertFalse(model.variables.is_processed("c_av"))
+
     def test_process_model_ode(self):
         # one equation
         whole_cell = ["negative electrode", "separator", "positive electrode"]
@@ -739,8 +775,10 @@ class TestDiscretise(unittest.TestCase):
         # turn debug mode off to not check well posedness
         debug_mode = pybamm.settings.debug_mode
         pybamm.settings.debug_mode = False
+        # variables are only discretised when they are accessed
+        disc.process_model(model)
         with self.assertRaisesRegex(pybamm.ModelError, "No key set for variable"):
-            disc.process_model(model)
+            model.variables["d"]
         pybamm.settings.debug_mode = debug_mode
 
     def test_process_model_dae(self):
@@ -1250,6 +1288,44 @@ class TestDiscretise(unittest.TestCase):
         disc = get_discretisation_for_testing()
         disc.process_model(model, check_model=False)
 
+    def test_reuse_discretised_symbols(self):
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        c = pybamm.Variable("c", domain=whole_cell)
+        N = pybamm.grad(c)
+
+        def get_model(D, c0, right_bc):
+            model = pybamm.BaseModel()
+            model.rhs = {c: pybamm.div(D * N)}
+            model.initial_conditions = {c: pybamm.Scalar(c0)}
+            model.boundary_conditions = {
+                c: {"left": (0, "Neumann"), "right": (right_bc, "Neumann")}
+            }
+            model.variables = {"c": c, "N": N}
+            return model
+
+        disc = get_discretisation_for_testing()
+        model_1 = disc.process_model(get_model(1, 3, 0), inplace=False)
+        disc_N = disc._discretised_symbols[N.id]
+
+        # same slices and boundary conditions: discretised symbols and mass matrix
+        # are reused
+        model_2 = disc.process_model(get_model(2, 4, 0), inplace=False)
+        self.assertIs(disc._discretised_symbols[N.id], disc_N)
+        self.assertIs(model_2.mass_matrix, model_1.mass_matrix)
+        np.testing.assert_array_equal(
+            model_2.concatenated_initial_conditions.evaluate(), 4
+        )
+
+        # different boundary conditions: symbols are discretised again
+        model_3 = disc.process_model(get_model(2, 4, 1), inplace=False)
+        self.assertIsNot(disc._discretised_symbols[N.id], disc_N)
+        self.assertIsNot(model_3.mass_matrix, model_1.mass_matrix)
+        y = np.ones(model_3.concatenated_rhs.size)
+        self.assertNotEqual(
+            model_3.concatenated_rhs.evaluate(None, y)[-1],
+            model_2.concatenated_rhs.evaluate(None, y)[-1],
+        )
+
     def test_mass_matrix_inverse(self):
         # get mesh
         mesh = get_2p1d_mesh_for_testing(ypts=5, zpts=5)
@@ -201,6 +201,40 @@ class TestExperiment(unittest.TestCase):
         )
         self.assertEqual(experiment.cycle_lengths, [2, 1, 1])
 
+    def test_unique_steps(self):
+        cycle = (
+            "Discharge at 1C until 3.3V",
+            "Charge at C/3 until 4.1V",
+            "Hold at 4.1V until C/50",
+        )
+        experiment = pybamm.Experiment(
+            ["Rest for 1 hour"] + [cycle] * 100, cccv_handling="ode"
+        )
+        self.assertEqual(
+            experiment.unique_operating_conditions_strings,
+            [
+                "Rest for 1 hour",
+                "Discharge at 1C until 3.3V",
+                "Charge at C/3 until 4.1V then Hold at 4.1V until C/50",
+            ],
+        )
+        self.assertEqual(experiment.unique_events, [None, (3.3, "V"), (0.02, "C")])
+        np.testing.assert_array_equal(experiment.schedule, [0] + [1, 2] * 100)
+        self.assertEqual(experiment.cycle_lengths, [1] + [2] * 100)
+
+        # repeated steps share the same operating conditions
+        operating_conditions = experiment.operating_conditions
+        self.assertEqual(len(operating_conditions), 201)
+        self.assertIs(operating_conditions[1], operating_conditions[-2])
+        self.assertIs(
+            operating_conditions[2], experiment.unique_operating_conditions[2]
+        )
+        self.assertEqual(len(experiment.events), 201)
+        self.assertEqual(
+            experiment.operating_conditions_strings[-1],
+            "Charge at C/3 until 4.1V then Hold at 4.1V until C/50",
+        )
+
     def test_str_repr(self):
         conds = ["Discharge at 1 C for 20 seconds", "Charge at 0.5 W for 10 minutes"]
         experiment = pybamm.Experiment(conds)
@@ -75,6 +75,40 @@ class TestSimulationExperiment(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, "experiment must be"):
             pybamm.Simulation(model, experiment=0)
 
+    def test_models_shared_across_setpoints(self):
+        experiment = pybamm.Experiment(
+            [
+                "Discharge at 1C for 5 minutes",
+                "Discharge at 0.5 A for 5 minutes",
+                "Charge at 1 A for 5 minutes",
+                "Hold at 3.9 V for 5 minutes",
+                "Hold at 3.8 V for 5 minutes",
+                "Discharge at 2 W for 5 minutes",
+                "Discharge at 1 W for 5 minutes",
+            ]
+        )
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model, experiment=experiment)
+        # one model for each type of control
+        models = sim.op_conds_to_model_and_param
+        self.assertIs(models[(1.0, "C")], models[(0.5, "A")])
+        self.assertIs(models[(1.0, "C")], models[(-1.0, "A")])
+        self.assertIs(models[(3.9, "V")], models[(3.8, "V")])
+        self.assertIs(models[(2.0, "W")], models[(1.0, "W")])
+        self.assertEqual(len(set(id(model) for model, _ in models.values())), 3)
+
+        sol = sim.solve()
+        self.assertEqual(len(set(sim.op_conds_to_built_models.values())), 3)
+        currents = [step["Current [A]"].entries[-1] for step in sol.cycles]
+        np.testing.assert_array_almost_equal(currents[1:3], [0.5, -1])
+        voltages = [step["Terminal voltage [V]"].entries[-1] for step in sol.cycles]
+        np.testing.assert_array_almost_equal(voltages[3:5], [3.9, 3.8])
+        powers = [
+            step["Terminal voltage [V]"].entries[-1] * step["Current [A]"].entries[-1]
+            for step in sol.cycles[5:]
+        ]
+        np.testing.assert_array_almost_equal(powers, [2, 1])
+
     def test_run_experiment(self):
         experiment = pybamm.Experiment(
             [
@@ -186,6 +220,17 @@ class TestSimulationExperiment(unittest.TestCase):
         pybamm.set_logging_level("WARNING")
         self.assertEqual(sim._solution, None)
 
+    def test_run_experiment_twice(self):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C for 10 minutes", "Rest for 5 minutes")] * 2
+        )
+        sim = pybamm.Simulation(pybamm.lithium_ion.SPM(), experiment=experiment)
+        voltage = sim.solve()["Terminal voltage [V]"].entries
+        # the initial conditions of the built models are reset before solving again
+        np.testing.assert_array_equal(
+            sim.solve()["Terminal voltage [V]"].entries, voltage
+        )
+
     def test_run_experiment_termination(self):
         # with percent
         experiment = pybamm.Experiment(
@@ -264,6 +309,53 @@ class TestSimulationExperiment(unittest.TestCase):
         # Summary variables are not None
         self.assertIsNotNone(sol.summary_variables["Capacity [A.h]"])
 
+    def test_batch_summary_variables(self):
+        cycle = (
+            "Discharge at 1C until 3.3V",
+            "Charge at C/3 until 4.0V",
+            "Hold at 4.0V until C/10",
+        )
+        experiment = pybamm.Experiment([cycle] * 5)
+        model = pybamm.lithium_ion.SPM({"SEI": "ec reaction limited"})
+        param = pybamm.ParameterValues(chemistry=pybamm.parameter_sets.Chen2020)
+        sim = pybamm.Simulation(model, experiment=experiment, parameter_values=param)
+        solver = pybamm.CasadiSolver("fast with events")
+        sol = sim.solve(solver=solver)
+        summary_variables = sol.summary_variables
+        for batch_summary_variables in [True, 2]:
+            sol = sim.solve(
+                solver=solver,
+                save_at_cycles=2,
+                batch_summary_variables=batch_summary_variables,
+            )
+            for name, value in summary_variables.items():
+                np.testing.assert_allclose(
+                    sol.summary_variables[name], value, rtol=1e-5, atol=1e-8
+                )
+            for cycle_num in [2, 4]:
+                self.assertIsNone(sol.cycles[cycle_num])
+            for cycle_num in [0, 1, 3]:
+                self.assertEqual(
+                    sol.cycles[cycle_num].cycle_summary_variables,
+                    sol.all_summary_variables[cycle_num],
+                )
+
+        # without eSOH variables
+        sol = sim.solve(solver=solver, calc_esoh=False, batch_summary_variables=True)
+        self.assertNotIn("C", sol.summary_variables)
+        np.testing.assert_allclose(
+            sol.summary_variables["Measured capacity [A.h]"],
+            summary_variables["Measured capacity [A.h]"],
+        )
+
+        # capacity termination is only checked every N cycles
+        experiment = pybamm.Experiment([cycle] * 5, termination="99.9% capacity")
+        sim = pybamm.Simulation(model, experiment=experiment, parameter_values=param)
+        with self.assertRaisesRegex(ValueError, "capacity termination"):
+            sim.solve(solver=solver, batch_summary_variables=True)
+        sol = sim.solve(solver=solver, batch_summary_variables=2)
+        self.assertIn(len(sol.cycles), [2, 4])
+
     def test_cycle_summary_variables(self):
         # Test cycle_summary_variables works for different combinations of data and
         # function OCPs
@@ -0,0 +1,223 @@
+#
+# Tests for the numba evaluator
+#
+import pybamm
+
+import numpy as np
+import os
+import pickle
+import scipy.sparse
+import tempfile
+import unittest
+from unittest import mock
+from tests import get_discretisation_for_testing
+
+
+def double(arg):
+    return arg + arg
+
+
+@unittest.skipIf(not pybamm.have_numba(), "numba is not installed")
+class TestEvaluatorNumba(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_evaluates(self, expr, t=None, y=None, inputs=None):
+        evaluator = pybamm.EvaluatorNumba(expr, directory=self.tmp_dir.name)
+        result = evaluator.evaluate(t=t, y=y, inputs=inputs)
+        expected = expr.evaluate(t=t, y=y, inputs=inputs)
+        if scipy.sparse.issparse(expected):
+            expected = expected.toarray()
+        np.testing.assert_allclose(result, expected, rtol=1e-14, atol=1e-14)
+        return evaluator
+
+    def test_evaluate(self):
+        a = pybamm.StateVector(slice(0, 3))
+        b = pybamm.StateVector(slice(3, 6))
+        c = pybamm.StateVector(slice(0, 1), slice(4, 6))
+        y = np.linspace(0.5, 3, 6).reshape(-1, 1)
+        dense = pybamm.Matrix(np.array([[1.0, 2, 0], [0, 1, 3], [4, 0, 1]]))
+        sparse = pybamm.Matrix(scipy.sparse.csr_matrix(dense.entries))
+        x = np.linspace(0, 4, 9)
+        expressions = [
+            a + b - 2,
+            a * b / (a + 1),
+            a ** 2 % 3,
+            dense @ a,
+            sparse @ b + a,
+            (a <= b) * a + (a < 1) * b,
+            pybamm.maximum(a, b) - pybamm.minimum(a, 2),
+            -abs(a - 2) + pybamm.sign(b - 2) + pybamm.Floor(b) + pybamm.Ceiling(a),
+            pybamm.exp(a) + pybamm.log(b) + pybamm.sinh(a) + pybamm.erf(b),
+            pybamm.max(a) + pybamm.min(b),
+            pybamm.Index(a, slice(1, 3)),
+            pybamm.NumpyConcatenation(a, b, pybamm.t * c),
+            c * 2,
+            pybamm.Interpolant(x, x ** 2, a, interpolator="linear"),
+            pybamm.Interpolant(x[:3], x[:3] ** 2, b, interpolator="linear"),
+        ]
+        for expr in expressions:
+            self.assert_evaluates(expr, t=2, y=y)
+
+        # input parameters
+        p = pybamm.InputParameter("p")
+        q = pybamm.InputParameter("q", "negative electrode")
+        q.set_expected_size(3)
+        expr = p * a + q * b
+        evaluator = self.assert_evaluates(
+            expr, y=y, inputs={"p": 2, "q": np.array([1, 2, 3])}
+        )
+        self.assertEqual(evaluator._input_sizes, {"p": 1, "q": 3})
+
+        # constant expressions are not compiled
+        evaluator = pybamm.EvaluatorNumba(
+            pybamm.Scalar(2) * pybamm.Scalar(3), directory=self.tmp_dir.name
+        )
+        self.assertEqual(evaluator.evaluate(), 6)
+        result, known_evals = evaluator.evaluate(known_evals={})
+        self.assertEqual(result, 6)
+        self.assertEqual(known_evals, {})
+
+    def test_discretised_expressions(self):
+        disc = get_discretisation_for_testing()
+        var = pybamm.Variable("var", domain=["negative electrode", "separator"])
+        var2 = pybamm.Variable("var2", domain=["positive electrode"])
+        disc.set_variable_slices([var, var2])
+        n = disc.mesh.combine_submeshes("negative electrode", "separator").npts
+        m = disc.mesh["positive electrode"].npts
+        y = np.linspace(1, 2, n + m).reshape(-1, 1)
+        for expr in [
+            pybamm.div(pybamm.grad(var)),
+            pybamm.concatenation(var, 2 * var2),
+            pybamm.boundary_value(var2, "left") * pybamm.boundary_value(var, "right"),
+        ]:
+            disc.bcs = {var.id: {"left": (1, "Neumann"), "right": (2, "Dirichlet")}}
+            self.assert_evaluates(disc.process_symbol(expr), y=y)
+
+    def test_common_subexpressions(self):
+        a = pybamm.StateVector(slice(0, 3))
+        matrix = scipy.sparse.csr_matrix(np.eye(3))
+        # identical subexpressions from different nodes are only computed once,
+        # and identical constants are only stored once
+        expr = pybamm.exp(pybamm.Matrix(matrix) @ a) + pybamm.exp(
+            pybamm.Matrix(matrix.copy()) @ pybamm.StateVector(slice(0, 3))
+        )
+        generator = pybamm.NumbaCodeGenerator()
+        source = generator.generate(expr)
+        self.assertEqual(source.count("csr_matvec"), 1)
+        self.assertEqual(source.count("np.exp"), 1)
+        # data, indices and indptr of the matrix, and the output of the product
+        self.assertEqual(len(generator.constants), 4)
+
+        # preallocated outputs are copied before being returned
+        evaluator = pybamm.EvaluatorNumba(
+            pybamm.Matrix(matrix) @ a, directory=self.tmp_dir.name
+        )
+        result = evaluator.evaluate(y=np.array([1.0, 2, 3]))
+        evaluator.evaluate(y=np.array([4.0, 5, 6]))
+        np.testing.assert_array_equal(result, [[1], [2], [3]])
+
+        # as are views of preallocated outputs
+        evaluator = pybamm.EvaluatorNumba(
+            pybamm.Index(pybamm.Matrix(matrix) @ a, slice(0, 2)),
+            directory=self.tmp_dir.name,
+        )
+        result = evaluator.evaluate(y=np.array([1.0, 2, 3]))
+        evaluator.evaluate(y=np.array([4.0, 5, 6]))
+        np.testing.assert_array_equal(result, [[1], [2]])
+
+    def test_not_implemented(self):
+        a = pybamm.StateVector(slice(0, 3))
+        for expr in [
+            pybamm.Function(double, a),
+            pybamm.Interpolant(np.linspace(0, 1, 5), np.ones(5), a),
+            a @ pybamm.StateVector(slice(3, 6)),
+            pybamm.Equality(a, a),
+        ]:
+            with self.assertRaises(NotImplementedError):
+                pybamm.EvaluatorNumba(expr, directory=self.tmp_dir.name)
+
+        # code that numba fails to compile raises an error when the evaluator is
+        # created, rather than when it is first called
+        source = (
+            "@numba.njit(cache=True)\n"
+            "def evaluate(constants, t, y, p):\n"
+            "    return y.not_an_attribute\n"
+        )
+        with mock.patch.object(
+            pybamm.NumbaCodeGenerator, "generate", return_value=source
+        ):
+            with self.assertRaisesRegex(NotImplementedError, "numba could not"):
+                pybamm.EvaluatorNumba(a, directory=self.tmp_dir.name)
+
+    def test_cache_and_pickle(self):
+        a = pybamm.StateVector(slice(0, 2))
+        expr = pybamm.exp(a) * pybamm.t
+        evaluator = pybamm.EvaluatorNumba(expr, directory=self.tmp_dir.name)
+        files = [f for f in os.listdir(self.tmp_dir.name) if f.endswith(".py")]
+        self.assertEqual(len(files), 1)
+        # the same code is not written again
+        pybamm.EvaluatorNumba(expr, directory=self.tmp_dir.name)
+        self.assertEqual(
+            [f for f in os.listdir(self.tmp_dir.name) if f.endswith(".py")], files
+        )
+
+        y = np.array([1.0, 2.0])
+        unpickled = pickle.loads(pickle.dumps(evaluator))
+        np.testing.assert_array_equal(
+            unpickled.evaluate(t=3, y=y), evaluator.evaluate(t=3, y=y)
+        )
+
+    def test_model(self):
+        cache_home = os.environ.get("XDG_CACHE_HOME")
+        os.environ["XDG_CACHE_HOME"] = self.tmp_dir.name
+        try:
+            solutions = {}
+            for convert_to_format in ["python", "numba"]:
+                model = pybamm.lithium_ion.SPM()
+                model.convert_to_format = convert_to_format
+                model.events = []
+                sim = pybamm.Simulation(model, solver=pybamm.ScipySolver())
+                solutions[convert_to_format] = sim.solve([0, 3600])
+            self.assertIsInstance(
+                sim.built_model.rhs_eval._function.__self__, pybamm.EvaluatorNumba
+            )
+            np.testing.assert_allclose(
+                solutions["python"]["Terminal voltage [V]"].entries,
+                solutions["numba"]["Terminal voltage [V]"].entries,
+                rtol=1e-10,
+            )
+
+            # expressions that cannot be compiled are converted to python instead
+            model = pybamm.BaseModel()
+            model.convert_to_format = "numba"
+            var = pybamm.Variable("var")
+            model.rhs = {var: -pybamm.Function(double, var)}
+            model.initial_conditions = {var: 1}
+            pybamm.Discretisation().process_model(model)
+            solver = pybamm.ScipySolver()
+            solution = solver.solve(model, np.linspace(0, 1, 10))
+            self.assertIsInstance(
+                model.rhs_eval._function.__self__, pybamm.EvaluatorPython
+            )
+            np.testing.assert_allclose(
+                solution.y[0], np.exp(-2 * solution.t), rtol=1e-5
+            )
+        finally:
+            if cache_home is None:
+                del os.environ["XDG_CACHE_HOME"]
+            else:
+                os.environ["XDG_CACHE_HOME"] = cache_home
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,127 @@
+#
+# Tests for the SymbolTable class
+#
+import pybamm
+
+import gc
+import numpy as np
+import unittest
+from tests import get_discretisation_for_testing
+
+
+class TestSymbolTable(unittest.TestCase):
+    def setUp(self):
+        pybamm.settings.intern_symbols = True
+
+    def tearDown(self):
+        pybamm.settings.intern_symbols = False
+
+    def test_intern(self):
+        table = pybamm.SymbolTable()
+        a = pybamm.Parameter("a") * pybamm.Scalar(2)
+        self.assertIs(table.intern(a), a)
+        self.assertIn(a, table)
+        self.assertEqual(len(table), 1)
+
+        # structurally identical nodes are replaced by the canonical node
+        b = pybamm.Parameter("a") * pybamm.Scalar(2)
+        self.assertIsNot(b, a)
+        self.assertIs(table.intern(b), a)
+        self.assertNotIn(b, table)
+        self.assertIsNot(table.intern(pybamm.Parameter("a") * 3), a)
+        self.assertEqual(len(table), 2)
+
+        # canonical nodes are only returned if they have the same attributes
+        mesh = object()
+        c = pybamm.Scalar(1)
+        self.assertIs(table.intern(c, mesh=mesh), c)
+        self.assertIs(c.mesh, mesh)
+        self.assertIs(table.intern(pybamm.Scalar(1), mesh=mesh), c)
+        d = pybamm.Scalar(1)
+        self.assertIs(table.intern(d, mesh=None), d)
+        self.assertIsNone(d.mesh)
+        self.assertIs(c.mesh, mesh)
+
+        # canonical nodes that have been modified are replaced
+        e = pybamm.Variable("e")
+        table.intern(e)
+        e.domain = "negative electrode"
+        f = pybamm.Variable("e")
+        self.assertIs(table.intern(f), f)
+        self.assertIs(table.intern(pybamm.Variable("e")), f)
+
+        # nodes are removed once they are not used anywhere else
+        del a, b, f
+        gc.collect()
+        self.assertEqual(len(table), 1)
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+        # nothing is interned if switched off
+        pybamm.settings.intern_symbols = False
+        g = pybamm.Scalar(1)
+        self.assertIs(table.intern(g), g)
+        self.assertEqual(len(table), 0)
+
+    def test_process_symbol(self):
+        param = pybamm.ParameterValues({"a": 2, "b": 3})
+        # different parameters, with the same value and name, give the same node
+        a = param.process_symbol(pybamm.Parameter("a") * pybamm.Parameter("b"))
+        b = param.process_symbol(pybamm.Parameter("a") * pybamm.Parameter("b"))
+        self.assertIs(a, b)
+        x = param.process_symbol(pybamm.Parameter("a") + 1)
+        y = pybamm.ParameterValues({"a": 2}).process_symbol(pybamm.Parameter("a") + 1)
+        self.assertIs(x, y)
+
+        # symbols with different meshes are not shared
+        disc = get_discretisation_for_testing()
+        mesh = disc.mesh
+        var = pybamm.Variable("var", domain="negative electrode")
+        disc.set_variable_slices([var])
+        grad_var = disc.process_symbol(pybamm.grad(var))
+        other_disc = get_discretisation_for_testing()
+        other_disc.set_variable_slices([var])
+        other_grad_var = other_disc.process_symbol(pybamm.grad(var))
+        self.assertIsNot(grad_var, other_grad_var)
+        self.assertIs(grad_var.mesh, mesh["negative electrode"])
+        self.assertIs(other_grad_var.mesh, other_disc.mesh["negative electrode"])
+        # but the same symbol discretised again is
+        disc._discretised_symbols = {}
+        self.assertIs(disc.process_symbol(pybamm.grad(var)), grad_var)
+
+        # the jacobians of identical expressions are the same
+        y = pybamm.StateVector(slice(0, 4))
+        u = pybamm.StateVector(slice(0, 2))
+        jac_1 = pybamm.Jacobian().jac(u * u, y)
+        jac_2 = pybamm.Jacobian().jac(u * u, y)
+        self.assertIs(jac_1, jac_2)
+        np.testing.assert_array_equal(
+            jac_1.evaluate(y=np.ones(4)).toarray(),
+            [[2, 0, 0, 0], [0, 2, 0, 0]],
+        )
+
+    def test_model(self):
+        model = pybamm.lithium_ion.SPMe()
+        solutions = []
+        for intern_symbols in [False, True]:
+            pybamm.settings.intern_symbols = intern_symbols
+            sim = pybamm.Simulation(model)
+            solutions.append(sim.solve([0, 3600]))
+        np.testing.assert_array_equal(
+            solutions[0]["Terminal voltage [V]"].entries,
+            solutions[1]["Terminal voltage [V]"].entries,
+        )
+        np.testing.assert_array_equal(
+            solutions[0]["Electrolyte concentration"].entries,
+            solutions[1]["Electrolyte concentration"].entries,
+        )
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
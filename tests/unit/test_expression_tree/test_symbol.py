@@ -516,6 +516,19 @@ class TestIsZero(unittest.TestCase):
         self.assertFalse(pybamm.is_matrix_zero(b))
         self.assertFalse(pybamm.is_matrix_zero(c))
 
+    def test_is_matrix_one(self):
+        a = pybamm.Matrix(coo_matrix(np.ones((10, 10))))
+        b = pybamm.Matrix(coo_matrix(([1], ([0], [0])), shape=(5, 5)))
+        c = pybamm.Matrix(coo_matrix(([1] * 5, (range(5), [0] * 5)), shape=(5, 1)))
+        self.assertTrue(pybamm.is_matrix_one(a))
+        self.assertFalse(pybamm.is_matrix_one(b))
+        self.assertTrue(pybamm.is_matrix_one(c))
+
+        a = pybamm.Matrix(np.ones((10, 10)))
+        b = pybamm.Matrix([1, 0, 0])
+        self.assertTrue(pybamm.is_matrix_one(a))
+        self.assertFalse(pybamm.is_matrix_one(b))
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
@@ -3,6 +3,7 @@
 #
 import pybamm
 import numpy as np
+import pickle
 import unittest
 
 
@@ -213,6 +214,17 @@ class TestMesh(unittest.TestCase):
             0,
         )
         np.testing.assert_almost_equal(submesh.internal_boundaries, [0.1 / 0.6])
+        # combined submeshes are only created once
+        self.assertIs(
+            mesh.combine_submeshes("negative electrode", "separator"), submesh
+        )
+        # but are not pickled
+        new_mesh = pickle.loads(pickle.dumps(mesh))
+        self.assertEqual(new_mesh._combined_submeshes, {})
+        np.testing.assert_array_equal(
+            new_mesh.combine_submeshes("negative electrode", "separator").edges,
+            submesh.edges,
+        )
         with self.assertRaises(pybamm.DomainError):
             mesh.combine_submeshes("negative electrode", "positive electrode")
 
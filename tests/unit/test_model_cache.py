@@ -0,0 +1,190 @@
+#
+# Tests for the ModelCache class
+#
+import pybamm
+import numpy as np
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tempdir.name, "models")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_key(self):
+        cache = pybamm.ModelCache(self.directory)
+        model = pybamm.lithium_ion.SPM()
+        param = model.default_parameter_values
+
+        # same content gives the same key, even for different objects
+        key = cache.key(model, param)
+        self.assertEqual(key, cache.key(model, param))
+        self.assertEqual(
+            key, cache.key(pybamm.lithium_ion.SPM(), model.default_parameter_values)
+        )
+
+        # different content gives a different key
+        self.assertNotEqual(key, cache.key(pybamm.lithium_ion.SPMe(), param))
+        param_changed = param.copy()
+        param_changed["Current function [A]"] = 2
+        self.assertNotEqual(key, cache.key(model, param_changed))
+        var_pts = model.default_var_pts
+        x_n = pybamm.standard_spatial_vars.x_n
+        self.assertNotEqual(
+            cache.key(var_pts), cache.key({**var_pts, x_n: var_pts[x_n] + 1})
+        )
+        self.assertNotEqual(
+            cache.key(pybamm.CasadiSolver()), cache.key(pybamm.CasadiSolver(rtol=1e-8))
+        )
+
+        # the key does not depend on the state of the solver
+        solver = pybamm.CasadiSolver()
+        solver_key = cache.key(solver)
+        pybamm.Simulation(model, solver=solver).solve([0, 600])
+        self.assertEqual(solver_key, cache.key(solver))
+
+    def test_key_is_the_same_in_all_processes(self):
+        code = (
+            "import pybamm; model = pybamm.lithium_ion.SPM(); "
+            "print(pybamm.ModelCache().key(model, model.default_parameter_values))"
+        )
+        keys = set()
+        for seed in ["1", "2"]:
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            output = subprocess.run(
+                [sys.executable, "-c", code], env=env, capture_output=True, check=True
+            )
+            keys.add(output.stdout.decode().strip().splitlines()[-1])
+        self.assertEqual(len(keys), 1)
+
+    def test_save_load_clear(self):
+        cache = pybamm.ModelCache(self.directory)
+        self.assertIsNone(cache.load("a"))
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.size, 0)
+
+        self.assertTrue(cache.save("a", {"x": np.ones(10)}))
+        self.assertTrue(cache.save("b", {"x": np.zeros(10)}))
+        self.assertIn("a", cache)
+        np.testing.assert_array_equal(cache.load("a")["x"], np.ones(10))
+        self.assertGreater(cache.size, 0)
+
+        # objects that cannot be pickled are not saved
+        self.assertFalse(cache.save("c", {"x": lambda x: x}))
+        self.assertNotIn("c", cache)
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+        # unreadable entries are removed
+        with open(os.path.join(self.directory, "d.pkl"), "w") as f:
+            f.write("not a pickle")
+        self.assertIsNone(cache.load("d"))
+        self.assertNotIn("d", cache)
+
+        cache.clear("a")
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+
+    def test_evict(self):
+        entry = {"x": np.ones(1000)}
+
+        # by size: least recently used entries are removed first
+        cache = pybamm.ModelCache(self.directory, max_size=None)
+        now = time.time()
+        for key, age in [("a", 100), ("b", 20), ("c", 10)]:
+            cache.save(key, entry)
+            os.utime(cache._path(key), (now - age, now - age))
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+        cache.max_size = 2.5 * cache.size / 3
+        cache.load("b")
+        cache.save("d", entry)
+        self.assertEqual(sorted(os.listdir(self.directory)), ["b.pkl", "d.pkl"])
+
+        # by age
+        cache = pybamm.ModelCache(self.directory, max_size=None, max_age=60)
+        os.utime(cache._path("b"), (now - 100, now - 100))
+        cache.evict()
+        self.assertEqual(os.listdir(self.directory), ["d.pkl"])
+
+    def test_simulation(self):
+        cache = pybamm.ModelCache(self.directory)
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model, cache=cache)
+        sim.build()
+        self.assertIn(sim._cache_key, cache)
+        self.assertIsNone(sim._cache_entry["solver"])
+        solution = sim.solve([0, 600])
+        # the model is saved again once set up by the solver
+        self.assertEqual(sim._cache_entry["solver"], cache.key(sim.solver))
+
+        # an identical simulation loads the model from the cache
+        sim_cached = pybamm.Simulation(pybamm.lithium_ion.SPM(), cache=cache)
+        sim_cached.build()
+        self.assertEqual(sim_cached._cache_key, sim._cache_key)
+        self.assertIsNone(sim_cached.model_with_set_params)
+        self.assertIsNotNone(sim_cached.mesh)
+        self.assertTrue(sim_cached.built_model.is_discretised)
+        solution_cached = sim_cached.solve([0, 600])
+        self.assertIn(sim_cached.built_model, sim_cached.solver.models_set_up)
+        np.testing.assert_allclose(
+            solution_cached["Terminal voltage [V]"].entries,
+            solution["Terminal voltage [V]"].entries,
+        )
+
+        # a different solver sets the model up again
+        sim_cached = pybamm.Simulation(
+            pybamm.lithium_ion.SPM(), cache=cache, solver=pybamm.CasadiSolver("fast")
+        )
+        sim_cached.build()
+        sim_cached._set_up_solver_from_cache(sim_cached.solver)
+        self.assertEqual(sim_cached.solver.models_set_up, {})
+
+        # a different configuration is not loaded from the cache
+        var_pts = model.default_var_pts
+        var_pts[pybamm.standard_spatial_vars.x_n] += 1
+        sim_other = pybamm.Simulation(model, var_pts=var_pts, cache=cache)
+        sim_other.build()
+        self.assertNotEqual(sim_other._cache_key, sim._cache_key)
+        self.assertIsNotNone(sim_other.model_with_set_params)
+
+        # initial_soc changes the parameters, so the model is built again
+        sim_cached.solve([0, 600], initial_soc=0.5)
+        self.assertNotEqual(sim_cached._cache_key, sim._cache_key)
+
+        # default cache directory
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+        os.environ["XDG_CACHE_HOME"] = self.tempdir.name
+        try:
+            sim = pybamm.Simulation(model, cache=True)
+            self.assertEqual(
+                sim.cache.directory,
+                os.path.join(self.tempdir.name, "pybamm", "models"),
+            )
+        finally:
+            if xdg_cache_home is None:
+                del os.environ["XDG_CACHE_HOME"]
+            else:
+                os.environ["XDG_CACHE_HOME"] = xdg_cache_home
+
+        # experiments are not supported
+        experiment = pybamm.Experiment(["Discharge at 1C for 1 minute"])
+        with self.assertRaisesRegex(ValueError, "cache"):
+            pybamm.Simulation(model, experiment=experiment, cache=cache)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -99,6 +99,53 @@ class TestParameterValues(unittest.TestCase):
         with self.assertRaisesRegex(KeyError, "Cannot update parameter"):
             param.update({"b": 1})
 
+    def test_update_keeps_processed_symbols(self):
+        param = pybamm.ParameterValues({"a": 1, "b": 2, "c": pybamm.Parameter("a")})
+        a = pybamm.Parameter("a")
+        b = pybamm.Parameter("b")
+        c = pybamm.Parameter("c")
+        processed_b = param.process_symbol(b)
+        processed_c = param.process_symbol(c)
+        processed_sum = param.process_symbol(a + b)
+        param.update({"a": 3})
+        # symbols that do not depend on "a" are not processed again
+        self.assertIs(param.process_symbol(b), processed_b)
+        self.assertIsNot(param.process_symbol(c), processed_c)
+        self.assertEqual(param.process_symbol(c).evaluate(), 3)
+        self.assertEqual(param.process_symbol(a + b).evaluate(), 5)
+        self.assertEqual(processed_sum.evaluate(), 3)
+
+        # interpolant events are replaced when the data is updated
+        x = np.linspace(0, 1)
+        param = pybamm.ParameterValues({"func": ("data", np.column_stack([x, x]))})
+        func = pybamm.FunctionParameter("func", {"x": pybamm.Scalar(0.5)})
+        param.process_symbol(func)
+        self.assertEqual(len(param.parameter_events), 2)
+        param.update({"func": ("data", np.column_stack([2 * x, x]))})
+        self.assertEqual(param.parameter_events, [])
+        param.process_symbol(func)
+        self.assertEqual(len(param.parameter_events), 2)
+
+        # interpolant events are replaced when a parameter in the argument of the
+        # interpolant is updated
+        param = pybamm.ParameterValues(
+            {"func": ("data", np.column_stack([x, x])), "c_max": 2}
+        )
+        func = pybamm.FunctionParameter(
+            "func", {"x": pybamm.Scalar(1) / pybamm.Parameter("c_max")}
+        )
+        param.process_symbol(func)
+        lower_bound, upper_bound = param.parameter_events
+        self.assertEqual(lower_bound.expression.evaluate(), 0.5)
+        param.update({"c_max": 4})
+        self.assertEqual(param.parameter_events, [])
+        param.process_symbol(func)
+        self.assertEqual(
+            [event.name for event in param.parameter_events],
+            ["Interpolant data lower bound", "Interpolant data upper bound"],
+        )
+        self.assertEqual(param.parameter_events[0].expression.evaluate(), 0.25)
+
     def test_check_parameter_values(self):
         # Cell capacity [A.h] deprecated
         with self.assertRaisesRegex(ValueError, "Cell capacity"):
@@ -763,6 +810,22 @@ class TestParameterValues(unittest.TestCase):
         self.assertEqual(model.timescale.evaluate(), 2)
         self.assertEqual(model.length_scales["test"].evaluate(), 3)
 
+        # variables are only processed when they are accessed, with the parameter
+        # values at the time the model was processed
+        model = pybamm.BaseModel()
+        model.rhs = {var1: a * var1}
+        model.initial_conditions = {var1: b}
+        model.variables = {"d_var1": d * var1, "c": c}
+        parameter_values.process_model(model)
+        self.assertIsInstance(model.variables, pybamm.LazyFuzzyDict)
+        self.assertFalse(model.variables.is_processed("d_var1"))
+        parameter_values.update({"d": 1})
+        self.assertEqual(
+            model.variables["d_var1"].id, (pybamm.Scalar(42, name="d") * var1).id
+        )
+        self.assertTrue(model.variables.is_processed("d_var1"))
+        self.assertFalse(model.variables.is_processed("c"))
+
         # bad boundary conditions
         model = pybamm.BaseModel()
         model.algebraic = {var1: var1}
@@ -0,0 +1,154 @@
+#
+# Tests the Profiler class.
+#
+import pybamm
+import io
+import json
+import os
+import unittest
+
+
+class TestProfiler(unittest.TestCase):
+    def test_disabled(self):
+        profiler = pybamm.Profiler()
+        self.assertFalse(profiler.enabled)
+        with profiler.span("a", size=1) as span:
+            span.set(count=2)
+        self.assertEqual(profiler.spans, [])
+        self.assertEqual(profiler.to_chrome_trace()["traceEvents"], [])
+        self.assertEqual(profiler.get_summary(), [])
+
+    def test_nested_spans(self):
+        profiler = pybamm.Profiler()
+        with profiler:
+            self.assertTrue(profiler.enabled)
+            with profiler.span("a", size=1) as span_a:
+                with profiler.span("b"):
+                    with profiler.span("b") as span_b:
+                        span_b.set(count=3)
+                with profiler.span("c"):
+                    pass
+            with profiler.span("c"):
+                pass
+        self.assertFalse(profiler.enabled)
+
+        self.assertEqual([span.name for span in profiler.spans], ["a", "c"])
+        self.assertEqual([span.name for span in span_a.children], ["b", "c"])
+        self.assertEqual(span_a.args, {"size": 1})
+        self.assertEqual(span_b.args, {"count": 3})
+        self.assertIs(span_b.parent, span_a.children[0])
+        self.assertGreaterEqual(span_a.duration, span_a.children[0].duration)
+        self.assertAlmostEqual(
+            span_a.self_duration,
+            span_a.duration - sum(child.duration for child in span_a.children),
+        )
+
+        # Summary
+        summary = {entry["name"]: entry for entry in profiler.get_summary()}
+        self.assertEqual(summary["a"]["calls"], 1)
+        self.assertEqual(summary["b"]["calls"], 2)
+        self.assertEqual(summary["c"]["calls"], 2)
+        # recursive spans are not counted twice
+        self.assertEqual(summary["b"]["total"], span_a.children[0].duration)
+        self.assertEqual(summary["a"]["total"], span_a.duration)
+        self.assertEqual(summary["c"]["mean"], summary["c"]["total"] / 2)
+        self.assertEqual(profiler.get_summary()[0]["name"], "a")
+
+        # Print summary
+        output = io.StringIO()
+        profiler.print_summary(file=output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(
+            lines[0].split(), ["name", "calls", "total", "self", "mean", "max"]
+        )
+        self.assertEqual(len(lines), 5)
+
+        # Clear
+        profiler.clear()
+        self.assertEqual(profiler.spans, [])
+        self.assertEqual(profiler.get_summary(), [])
+
+    def test_exception_in_span(self):
+        profiler = pybamm.Profiler()
+        with profiler:
+            with self.assertRaises(ValueError):
+                with profiler.span("a"):
+                    raise ValueError
+            with profiler.span("b"):
+                pass
+        # the span is closed, so "b" is not nested in "a"
+        self.assertEqual([span.name for span in profiler.spans], ["a", "b"])
+
+    def test_save(self):
+        profiler = pybamm.Profiler()
+        with profiler:
+            with profiler.span("a", size=2, label="x", value=1.5, other=[1]):
+                with profiler.span("b"):
+                    pass
+
+        # Chrome trace
+        filename = "test_profile.json"
+        profiler.save(filename)
+        with open(filename, "r") as f:
+            trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["a", "b"])
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(
+            events[0]["args"], {"size": 2, "label": "x", "value": 1.5, "other": "[1]"}
+        )
+        self.assertGreaterEqual(events[0]["dur"], events[1]["dur"])
+        self.assertGreaterEqual(events[1]["ts"], events[0]["ts"])
+
+        # Nested json
+        profiler.save(filename, to_format="json")
+        with open(filename, "r") as f:
+            spans = json.load(f)
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]["name"], "a")
+        self.assertEqual(spans[0]["children"][0]["name"], "b")
+        self.assertEqual(spans[0]["children"][0]["children"], [])
+        os.remove(filename)
+
+        with self.assertRaisesRegex(ValueError, "format 'csv' not recognised"):
+            profiler.save(filename, to_format="csv")
+
+    def test_simulation(self):
+        pybamm.profiler.clear()
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        with pybamm.profiler:
+            sim.solve([0, 600])
+            sim.solution["Terminal voltage [V]"].entries
+        names = {entry["name"] for entry in pybamm.profiler.get_summary()}
+        for name in [
+            "Simulation.build",
+            "ParameterValues.process_model",
+            "ParameterValues.process_symbol",
+            "Discretisation.process_model",
+            "Discretisation.process_symbol",
+            "BaseSolver.set_up",
+            "BaseSolver.process",
+            "BaseSolver._integrate",
+            "BaseSolver.handle_events",
+            "Solution.process_variable",
+        ]:
+            self.assertIn(name, names)
+        build = pybamm.profiler.spans[0]
+        self.assertEqual(build.name, "Simulation.build")
+        self.assertEqual(build.args["states"], sim.built_model.len_rhs_and_alg)
+        pybamm.profiler.clear()
+
+        # nothing is recorded when the profiler is disabled
+        sim.solve([0, 600])
+        self.assertEqual(pybamm.profiler.spans, [])
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
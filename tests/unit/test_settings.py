@@ -14,6 +14,22 @@ class TestSettings(unittest.TestCase):
 
         pybamm.settings.simplify = True
 
+    def test_processing_threads(self):
+        self.assertEqual(pybamm.settings.processing_threads, 1)
+
+        pybamm.settings.processing_threads = 4
+        self.assertEqual(pybamm.settings.processing_threads, 4)
+        pybamm.settings.processing_threads = 1
+
+        with self.assertRaisesRegex(ValueError, "positive integer"):
+            pybamm.settings.processing_threads = 0
+
+    def test_intern_symbols(self):
+        self.assertFalse(pybamm.settings.intern_symbols)
+        pybamm.settings.intern_symbols = True
+        self.assertTrue(pybamm.settings.intern_symbols)
+        pybamm.settings.intern_symbols = False
+
     def test_smoothing_parameters(self):
         self.assertEqual(pybamm.settings.min_smoothing, "exact")
         self.assertEqual(pybamm.settings.max_smoothing, "exact")
@@ -4,6 +4,7 @@ import pandas as pd
 import os
 import subprocess
 import sys
+import tempfile
 import unittest
 import uuid
 
@@ -142,6 +143,94 @@ class TestSimulation(unittest.TestCase):
         sim.solve([0, 600])
         sim.set_parameters()
 
+    def test_update_parameters(self):
+        model = pybamm.lithium_ion.SPM()
+        param = model.default_parameter_values
+        sim = pybamm.Simulation(model, parameter_values=param)
+        # nothing to update before building
+        sim.update_parameters({"Current function [A]": 1})
+        sim.build()
+        mesh = sim.mesh
+        sim.solve([0, 600])
+        built_model = sim.built_model
+
+        # updating a parameter in the equations creates a new built model
+        param.update({"Current function [A]": 2})
+        sim.update_parameters(param)
+        self.assertIs(sim.mesh, mesh)
+        self.assertIsNot(sim.built_model, built_model)
+        self.assertEqual(sim.parameter_values["Current function [A]"], 2)
+        solution = sim.solve([0, 600])
+        sim_new = pybamm.Simulation(model, parameter_values=param)
+        solution_new = sim_new.solve([0, 600])
+        np.testing.assert_array_almost_equal(
+            solution["Terminal voltage [V]"].entries,
+            solution_new["Terminal voltage [V]"].entries,
+        )
+
+        # updating the initial conditions keeps the functions created by the solver
+        built_model = sim.built_model
+        sim.update_parameters(
+            {"Initial concentration in negative electrode [mol.m-3]": 15000}
+        )
+        self.assertIsNot(sim.built_model, built_model)
+        self.assertIs(sim.built_model.rhs_eval, built_model.rhs_eval)
+        self.assertIn(sim.built_model, sim.solver.models_set_up)
+        solution = sim.solve([0, 600])
+        param.update({"Initial concentration in negative electrode [mol.m-3]": 15000})
+        sim_new = pybamm.Simulation(model, parameter_values=param)
+        solution_new = sim_new.solve([0, 600])
+        np.testing.assert_array_almost_equal(
+            solution["Terminal voltage [V]"].entries,
+            solution_new["Terminal voltage [V]"].entries,
+        )
+
+        # same values: nothing changes
+        built_model = sim.built_model
+        sim.update_parameters(param)
+        self.assertIs(sim.built_model, built_model)
+
+        # parameters in the geometry can't be updated
+        with self.assertRaisesRegex(ValueError, "appear in the geometry"):
+            sim.update_parameters({"Negative electrode thickness [m]": 1e-4})
+
+        # experiments are not supported
+        sim = pybamm.Simulation(
+            model, experiment=pybamm.Experiment(["Rest for 1 hour"])
+        )
+        with self.assertRaisesRegex(NotImplementedError, "experiment"):
+            sim.update_parameters({"Current function [A]": 1})
+
+    def test_update_parameters_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = pybamm.ModelCache(directory)
+            model = pybamm.lithium_ion.SPM()
+            pybamm.Simulation(model, cache=cache).build()
+
+            # the model is loaded from the cache, so the parameters are set when
+            # they are updated
+            sim = pybamm.Simulation(model, cache=cache)
+            sim.build()
+            self.assertIsNone(sim.model_with_set_params)
+            built_model = sim.built_model
+            sim.update_parameters({"Current function [A]": 2})
+            self.assertIsNot(sim.built_model, built_model)
+            solution = sim.solve([0, 600])
+            param = model.default_parameter_values
+            param.update({"Current function [A]": 2})
+            sim_new = pybamm.Simulation(model, parameter_values=param)
+            solution_new = sim_new.solve([0, 600])
+            np.testing.assert_array_almost_equal(
+                solution["Terminal voltage [V]"].entries,
+                solution_new["Terminal voltage [V]"].entries,
+            )
+
+            # parameters in the geometry are known
+            sim = pybamm.Simulation(model, cache=cache)
+            sim.build()
+            with self.assertRaisesRegex(ValueError, "appear in the geometry"):
+                sim.update_parameters({"Negative electrode thickness [m]": 1e-4})
+
     def test_set_crate(self):
         model = pybamm.lithium_ion.SPM()
         current_1C = model.default_parameter_values["Current function [A]"]
@@ -295,6 +384,35 @@ class TestSimulation(unittest.TestCase):
         ):
             sim.save("test.pickle")
 
+    def test_save_load_compact(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = os.path.join(tmp_dir, "sim")
+            # before solving
+            sim.save(directory, to_format="compact")
+            sim_load = pybamm.load_sim(directory)
+            self.assertEqual(sim_load.model.name, sim.model.name)
+            self.assertIsNone(sim_load.solution)
+
+            # after solving
+            sim.solve([0, 600])
+            directory = os.path.join(tmp_dir, "sim_solved")
+            sim.save(directory, to_format="compact")
+            self.assertIsNotNone(sim.solution)
+            self.assertTrue(
+                os.path.exists(os.path.join(directory, "solution", "t.npy"))
+            )
+            sim_load = pybamm.load_sim(directory)
+            self.assertIsInstance(sim_load.solution.all_ys[0], np.memmap)
+            np.testing.assert_array_almost_equal(
+                sim_load.solution["Terminal voltage [V]"].entries,
+                sim.solution["Terminal voltage [V]"].entries,
+            )
+
+            with self.assertRaisesRegex(ValueError, "format 'wrong' not recognised"):
+                sim.save(directory, to_format="wrong")
+
     def test_load_param(self):
         # Test load_sim for parameters imports
         filename = f"{uuid.uuid4()}.p"
@@ -0,0 +1,149 @@
+#
+# Tests for the BatchStepper class
+#
+import pybamm
+import numpy as np
+import unittest
+from tests import get_mesh_for_testing
+
+
+def get_decay_model():
+    model = pybamm.BaseModel()
+    domain = ["negative electrode", "separator", "positive electrode"]
+    var = pybamm.Variable("var", domain=domain)
+    var2 = pybamm.Variable("var2", domain=domain)
+    rate = pybamm.InputParameter("rate")
+    model.rhs = {var: -rate * var}
+    model.algebraic = {var2: var2 - pybamm.InputParameter("scale") * var}
+    model.initial_conditions = {var: 1, var2: 2}
+    model.variables = {
+        "var": var,
+        "var2": var2,
+        "Average var": pybamm.x_average(var),
+    }
+    mesh = get_mesh_for_testing()
+    spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+    disc = pybamm.Discretisation(mesh, spatial_methods)
+    disc.process_model(model)
+    return model
+
+
+class TestBatchStepper(unittest.TestCase):
+    def test_step(self):
+        model = get_decay_model()
+        rates = np.array([0.1, 0.2, 0.5])
+        stepper = pybamm.BatchStepper(model, {"rate": rates, "scale": 2})
+        self.assertEqual(stepper.n_cells, 3)
+        self.assertEqual(stepper.get_inputs(1), {"rate": 0.2, "scale": 2})
+        self.assertEqual(stepper.y.shape, (model.len_rhs_and_alg, 3))
+
+        t, y = stepper.step(1, npts=5)
+        np.testing.assert_array_almost_equal(t, np.linspace(0, 1, 5))
+        self.assertEqual(stepper.t, 1)
+        self.assertEqual(y.shape, (model.len_rhs_and_alg, 3, 5))
+        np.testing.assert_array_equal(stepper.y, y[:, :, -1])
+        for i, rate in enumerate(rates):
+            np.testing.assert_allclose(
+                y[: model.len_rhs, i],
+                np.tile(np.exp(-rate * t), (model.len_rhs, 1)),
+                rtol=1e-4,
+            )
+            np.testing.assert_allclose(
+                y[model.len_rhs :, i], 2 * y[: model.len_rhs, i], rtol=1e-6
+            )
+
+        # same result as stepping each cell separately
+        solver = pybamm.CasadiSolver(mode="fast")
+        solution = solver.step(None, model, 1, npts=5, inputs={"rate": 0.5, "scale": 2})
+        np.testing.assert_allclose(solution.y.full(), y[:, 2], rtol=1e-6)
+
+        # update the inputs between steps
+        stepper.set_inputs("rate", 0)
+        stepper.set_inputs("scale", [1, 2, 3])
+        var = stepper.y[: model.len_rhs].copy()
+        t, y = stepper.step(1)
+        np.testing.assert_array_almost_equal(t, [1, 2])
+        np.testing.assert_allclose(stepper.y[: model.len_rhs], var)
+        np.testing.assert_allclose(
+            stepper.y[model.len_rhs :], var * np.array([1, 2, 3]), rtol=1e-6
+        )
+
+        # evaluate variables for all the cells
+        variables = stepper.evaluate(["Average var", "var2"])
+        np.testing.assert_allclose(variables["Average var"], var[0])
+        self.assertEqual(variables["var2"].shape, (model.len_alg, 3))
+        var2 = stepper.evaluate(["var2"])["var2"]
+        np.testing.assert_allclose(var2, variables["var2"])
+
+    def test_y0(self):
+        model = get_decay_model()
+        y0 = np.ones((model.len_rhs_and_alg, 2))
+        y0[:, 1] = 3
+        stepper = pybamm.BatchStepper(model, {"rate": 1, "scale": 1}, n_cells=2, y0=y0)
+        stepper.step(1)
+        np.testing.assert_allclose(
+            stepper.y[: model.len_rhs, 1], 3 * np.exp(-1), rtol=1e-4
+        )
+        np.testing.assert_allclose(stepper.y[: model.len_rhs, 0], np.exp(-1), rtol=1e-4)
+
+        with self.assertRaisesRegex(ValueError, "y0 should have shape"):
+            pybamm.BatchStepper(model, {"rate": 1, "scale": 1}, n_cells=3, y0=y0)
+
+    def test_errors(self):
+        model = get_decay_model()
+        with self.assertRaisesRegex(TypeError, "CasadiSolver"):
+            pybamm.BatchStepper(model, {}, solver=pybamm.ScipySolver())
+        with self.assertRaisesRegex(ValueError, "batch_parallelisation"):
+            pybamm.BatchStepper(model, {}, solver=pybamm.CasadiSolver())
+        with self.assertRaisesRegex(pybamm.ModelError, "discretised"):
+            pybamm.BatchStepper(pybamm.BaseModel(), {})
+
+        stepper = pybamm.BatchStepper(model, {"rate": [1, 2], "scale": 1})
+        with self.assertRaisesRegex(ValueError, "values for 3 cells"):
+            stepper.set_inputs("rate", [1, 2, 3])
+        with self.assertRaisesRegex(KeyError, "not an input"):
+            stepper.set_inputs("bad", 1)
+        with self.assertRaisesRegex(pybamm.SolverError, "Step time must be positive"):
+            stepper.step(0)
+
+    def test_simulation_model(self):
+        model = pybamm.lithium_ion.SPMe()
+        param = model.default_parameter_values
+        param["Current function [A]"] = "[input]"
+        sim = pybamm.Simulation(model, parameter_values=param)
+        sim.build()
+        currents = [0.5, 1, 2]
+        stepper = pybamm.BatchStepper(
+            sim.built_model,
+            {"Current function [A]": currents},
+            solver=pybamm.CasadiSolver(mode="fast", batch_parallelisation="thread"),
+            nproc=2,
+        )
+        for _ in range(3):
+            stepper.step(60)
+        voltages = stepper.evaluate(["Terminal voltage [V]"])["Terminal voltage [V]"]
+        self.assertEqual(voltages.shape, (3,))
+
+        solver = pybamm.CasadiSolver(mode="fast")
+        for current, voltage in zip(currents, voltages):
+            solution = None
+            for _ in range(3):
+                solution = solver.step(
+                    solution,
+                    sim.built_model,
+                    60,
+                    inputs={"Current function [A]": current},
+                )
+            self.assertAlmostEqual(
+                solution["Terminal voltage [V]"].entries[-1], voltage, places=6
+            )
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,107 @@
+#
+# Tests for the CasadiCompiler class
+#
+import pybamm
+
+import casadi
+import numpy as np
+import os
+import shutil
+import tempfile
+import unittest
+
+
+@unittest.skipIf(
+    shutil.which(pybamm.casadi_compiler.compiler) is None, "no C compiler found"
+)
+class TestCasadiCompiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.compiler = pybamm.CasadiCompiler(directory=self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_compile(self):
+        x = casadi.MX.sym("x", 3)
+        p = casadi.MX.sym("p")
+        f = casadi.Function(
+            "f", [x, p], [casadi.vertcat(p * x[0] * x[1], x[2] ** 2, casadi.sin(x[1]))]
+        )
+        f_compiled = self.compiler.compile(f)
+        self.assertEqual(f_compiled.name(), "f")
+        np.testing.assert_array_almost_equal(
+            f_compiled([1, 2, 3], 4).full(), f([1, 2, 3], 4).full()
+        )
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 1)
+
+        # expressions calling the compiled function can be differentiated
+        jac = casadi.Function("jac_f", [x, p], [casadi.jacobian(f_compiled(x, p), x)])
+        jac_expected = casadi.Function("jac_f", [x, p], [casadi.jacobian(f(x, p), x)])
+        np.testing.assert_array_almost_equal(
+            jac([1, 2, 3], 4).full(), jac_expected([1, 2, 3], 4).full()
+        )
+
+        # the same function is loaded from the cache
+        library = os.listdir(self.tmp_dir.name)[0]
+        mtime = os.path.getmtime(os.path.join(self.tmp_dir.name, library))
+        self.compiler.compile(f)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [library])
+        self.assertEqual(
+            os.path.getmtime(os.path.join(self.tmp_dir.name, library)), mtime
+        )
+
+        # functions without derivatives cannot be differentiated
+        f_compiled = self.compiler.compile(f, derivatives=False)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 2)
+        with self.assertRaises(RuntimeError):
+            casadi.jacobian(f_compiled(x, p), x)
+
+        self.compiler.clear()
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_compile_min_max(self):
+        x = casadi.MX.sym("x", 3)
+        f = casadi.Function("f", [x], [casadi.mmin(x), casadi.mmax(x)])
+        f_compiled = self.compiler.compile(f)
+        self.assertEqual(f_compiled([3, 1, 2])[0], 1)
+        self.assertEqual(f_compiled([3, 1, 2])[1], 3)
+
+    def test_compile_error(self):
+        compiler = pybamm.CasadiCompiler(
+            directory=self.tmp_dir.name, compiler="not-a-compiler"
+        )
+        x = casadi.MX.sym("x")
+        with self.assertRaisesRegex(pybamm.SolverError, "Could not compile"):
+            compiler.compile(casadi.Function("f", [x], [2 * x]))
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_compiled_model(self):
+        directory = pybamm.casadi_compiler.directory
+        pybamm.casadi_compiler.directory = self.tmp_dir.name
+        try:
+            solutions = {}
+            for convert_to_format in ["casadi", "compiled"]:
+                model = pybamm.lithium_ion.SPMe()
+                model.convert_to_format = convert_to_format
+                sim = pybamm.Simulation(model)
+                solutions[convert_to_format] = sim.solve([0, 3600])
+            self.assertIsInstance(sim.built_model.rhs_eval._function, casadi.Function)
+            for name in ["Terminal voltage [V]", "Electrolyte concentration"]:
+                np.testing.assert_array_almost_equal(
+                    solutions["casadi"][name].entries,
+                    solutions["compiled"][name].entries,
+                )
+            self.assertGreater(len(os.listdir(self.tmp_dir.name)), 0)
+        finally:
+            pybamm.casadi_compiler.directory = directory
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -369,6 +369,73 @@ class TestCasadiSolver(unittest.TestCase):
             solution.y.full()[0], np.exp(-1.1 * solution.t), rtol=1e-04
         )
 
+    def test_model_solver_multiple_inputs_batch(self):
+        # Create model
+        model = pybamm.BaseModel()
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("var=0.5", pybamm.min(var - 0.5))]
+        # create discretisation
+        mesh = get_mesh_for_testing()
+        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+        disc = pybamm.Discretisation(mesh, spatial_methods)
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 10, 100)
+        inputs_list = [{"rate": 0.1 * (i + 1)} for i in range(4)]
+        for batch_parallelisation in ["serial", "thread", "openmp"]:
+            # Fast mode ignores the event
+            solver = pybamm.CasadiSolver(
+                mode="fast",
+                rtol=1e-8,
+                atol=1e-8,
+                batch_parallelisation=batch_parallelisation,
+            )
+            solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+            for i, solution in enumerate(solutions):
+                with self.subTest(batch_parallelisation=batch_parallelisation, i=i):
+                    self.assertEqual(solution.termination, "final time")
+                    self.assertEqual(solution.all_inputs[0]["rate"], 0.1 * (i + 1))
+                    np.testing.assert_array_equal(solution.t, t_eval)
+                    np.testing.assert_allclose(
+                        solution.y.full()[0],
+                        np.exp(-0.1 * (i + 1) * solution.t),
+                        rtol=1e-04,
+                    )
+
+            # Fast with events mode stops each solution at the event
+            solver = pybamm.CasadiSolver(
+                mode="fast with events",
+                rtol=1e-8,
+                atol=1e-8,
+                batch_parallelisation=batch_parallelisation,
+            )
+            solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+            for i, solution in enumerate(solutions):
+                with self.subTest(batch_parallelisation=batch_parallelisation, i=i):
+                    self.assertEqual(solution.termination, "event: var=0.5")
+                    np.testing.assert_allclose(
+                        solution.t_event, np.log(2) / (0.1 * (i + 1)), rtol=1e-3
+                    )
+                    np.testing.assert_allclose(
+                        solution.y.full()[0],
+                        np.exp(-0.1 * (i + 1) * solution.t),
+                        rtol=1e-04,
+                    )
+
+        # The mapped integrator is reused
+        self.assertEqual(len(solver.mapped_integrators[model]), 1)
+        solver.solve(model, t_eval, inputs=inputs_list)
+        self.assertEqual(len(solver.mapped_integrators[model]), 1)
+
+        # Errors
+        with self.assertRaisesRegex(ValueError, "invalid batch_parallelisation"):
+            pybamm.CasadiSolver(mode="fast", batch_parallelisation="bad")
+        with self.assertRaisesRegex(ValueError, "can only be used in 'fast'"):
+            pybamm.CasadiSolver(mode="safe", batch_parallelisation="serial")
+
     def test_model_solver_dae_inputs_in_initial_conditions(self):
         # Create model
         model = pybamm.BaseModel()
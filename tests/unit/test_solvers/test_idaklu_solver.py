@@ -3,6 +3,7 @@
 #
 import pybamm
 import numpy as np
+import pickle
 import unittest
 
 
@@ -205,6 +206,62 @@ class TestIDAKLUSolver(unittest.TestCase):
         solution = solver.solve(model, t_eval)
         np.testing.assert_array_equal(solution.y, -1)
 
+    def test_casadi_functions(self):
+        if not hasattr(pybamm.solvers.idaklu_solver.idaklu, "solve_casadi"):
+            self.skipTest("idaklu solver was built without casadi")
+        # casadi models are solved by calling the casadi functions from C++
+        model = pybamm.lithium_ion.SPMe()
+        param = model.default_parameter_values
+        param["Current function [A]"] = "[input]"
+        sim = pybamm.Simulation(model, parameter_values=param)
+        sim.build()
+        built_model = sim.built_model
+        self.assertEqual(built_model.convert_to_format, "casadi")
+
+        solver = pybamm.IDAKLUSolver()
+        t_eval = np.linspace(0, 3600, 100)
+        inputs = {"Current function [A]": 0.5}
+        solution = solver.solve(built_model, t_eval, inputs=inputs)
+        self.assertIn(built_model, solver.casadi_functions)
+
+        # the functions are reused for other inputs
+        functions = solver.casadi_functions[built_model]
+        solution_2 = solver.solve(
+            built_model, t_eval, inputs={"Current function [A]": 1}
+        )
+        self.assertIs(solver.casadi_functions[built_model], functions)
+        self.assertLess(solution_2.t[-1], solution.t[-1])
+
+        # compare with the casadi solver
+        casadi_solution = pybamm.CasadiSolver().solve(
+            built_model, t_eval, inputs=inputs
+        )
+        np.testing.assert_allclose(
+            solution["Terminal voltage [V]"].entries,
+            casadi_solution["Terminal voltage [V]"].entries,
+            rtol=1e-4,
+        )
+
+        # sensitivities
+        solution = solver.solve(
+            built_model, t_eval, inputs=inputs, calculate_sensitivities=True
+        )
+        sens = solution.sensitivities["Current function [A]"]
+        h = 1e-4
+        solution_h = solver.solve(
+            built_model, t_eval, inputs={"Current function [A]": 0.5 + h}
+        )
+        np.testing.assert_allclose(
+            sens[:, 0],
+            (solution_h.y - solution.y).reshape(-1, order="F") / h,
+            rtol=1e-2,
+            atol=1e-4,
+        )
+
+        # the functions are not pickled with the solver
+        copied_solver = pickle.loads(pickle.dumps(solver))
+        self.assertEqual(copied_solver.casadi_functions, {})
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
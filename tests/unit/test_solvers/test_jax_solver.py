@@ -1,5 +1,7 @@
 import pybamm
+import gc
 import unittest
+import weakref
 from tests import get_mesh_for_testing
 import sys
 import time
@@ -227,6 +229,118 @@ class TestJaxSolver(unittest.TestCase):
 
         self.assertLess(t_second_solve, t_first_solve)
 
+    def test_model_solver_multiple_inputs(self):
+        # Create model
+        model = pybamm.BaseModel()
+        model.convert_to_format = "jax"
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        # No need to set parameters; can use base discretisation (no spatial
+        # operators)
+
+        # create discretisation
+        mesh = get_mesh_for_testing()
+        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+        disc = pybamm.Discretisation(mesh, spatial_methods)
+        disc.process_model(model)
+
+        rates = 0.01 * np.arange(1, 9)
+        for method in ["RK45", "BDF"]:
+            solver = pybamm.JaxSolver(method=method, rtol=1e-8, atol=1e-8)
+            t_eval = np.linspace(0, 5, 80)
+
+            # list of inputs
+            solutions = solver.solve(
+                model, t_eval, inputs=[{"rate": rate} for rate in rates]
+            )
+            self.assertEqual(len(solutions), len(rates))
+            for rate, solution in zip(rates, solutions):
+                np.testing.assert_allclose(
+                    solution.y[0], np.exp(-rate * solution.t), rtol=1e-6, atol=1e-6
+                )
+                self.assertEqual(solution.all_inputs[0]["rate"], rate)
+
+            # stacked inputs
+            stacked_solutions = solver.solve(model, t_eval, inputs={"rate": rates})
+            for solution, stacked_solution in zip(solutions, stacked_solutions):
+                np.testing.assert_array_equal(solution.y, stacked_solution.y)
+
+            y = solver.get_solve(model, t_eval, batched=True)({"rate": rates})
+            self.assertEqual(y.shape, (len(rates),) + solutions[0].y.shape)
+
+        with self.assertRaisesRegex(ValueError, "same number of sets of inputs"):
+            solver.solve(
+                model, t_eval, inputs={"rate": rates, "other": np.ones(3)}
+            )
+
+    def test_compiled_solve_cache(self):
+        def get_model():
+            model = pybamm.BaseModel()
+            model.convert_to_format = "jax"
+            domain = ["negative electrode", "separator", "positive electrode"]
+            var = pybamm.Variable("var", domain=domain)
+            model.rhs = {var: -pybamm.InputParameter("rate") * var}
+            model.initial_conditions = {var: 1}
+            mesh = get_mesh_for_testing()
+            spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+            disc = pybamm.Discretisation(mesh, spatial_methods)
+            disc.process_model(model)
+            return model
+
+        pybamm.JaxSolver.clear_cache()
+        model = get_model()
+        solver = pybamm.JaxSolver(rtol=1e-8, atol=1e-8)
+
+        # solving with a different horizon (but the same number of points) reuses the
+        # compiled function
+        for t_end in [5, 10]:
+            t_eval = np.linspace(0, t_end, 80)
+            solution = solver.solve(model, t_eval, inputs={"rate": 0.1})
+            np.testing.assert_allclose(
+                solution.y[0], np.exp(-0.1 * t_eval), rtol=1e-6, atol=1e-6
+            )
+        self.assertEqual(len(pybamm.JaxSolver._compiled_solves), 1)
+        compiled_solve = list(pybamm.JaxSolver._compiled_solves.values())[0]
+        self.assertEqual(compiled_solve._cache_size(), 1)
+
+        # another model with the same equations, and another solver with the same
+        # settings, share the compiled function
+        other_solver = pybamm.JaxSolver(rtol=1e-8, atol=1e-8)
+        other_solver.solve(get_model(), t_eval, inputs={"rate": 0.2})
+        self.assertEqual(len(pybamm.JaxSolver._compiled_solves), 1)
+        self.assertEqual(compiled_solve._cache_size(), 1)
+
+        # a different number of times compiles the function again
+        solver.solve(model, np.linspace(0, 10, 50), inputs={"rate": 0.1})
+        self.assertEqual(compiled_solve._cache_size(), 2)
+
+        # different tolerances use a different function
+        pybamm.JaxSolver(rtol=1e-6, atol=1e-6).solve(
+            model, t_eval, inputs={"rate": 0.1}
+        )
+        self.assertEqual(len(pybamm.JaxSolver._compiled_solves), 2)
+
+        # the least recently used functions are removed from the cache
+        max_compiled_solves = pybamm.JaxSolver.max_compiled_solves
+        pybamm.JaxSolver.max_compiled_solves = 2
+        pybamm.JaxSolver(rtol=1e-4, atol=1e-4).solve(
+            model, t_eval, inputs={"rate": 0.1}
+        )
+        self.assertEqual(len(pybamm.JaxSolver._compiled_solves), 2)
+        self.assertNotIn(compiled_solve, pybamm.JaxSolver._compiled_solves.values())
+        pybamm.JaxSolver.max_compiled_solves = max_compiled_solves
+
+        # the cached functions do not keep the models alive
+        model_ref = weakref.ref(model)
+        del model, solver, other_solver, solution
+        gc.collect()
+        self.assertIsNone(model_ref())
+
+        pybamm.JaxSolver.clear_cache()
+        self.assertEqual(len(pybamm.JaxSolver._compiled_solves), 0)
+
     def test_get_solve(self):
         # Create model
         model = pybamm.BaseModel()
@@ -202,6 +202,41 @@ class TestProcessedVariable(unittest.TestCase):
             processed_eqn2.entries, y_sol + x_sol[:, np.newaxis]
         )
 
+    def test_processed_variable_sub_solutions(self):
+        # variables are evaluated for all the time points of each sub-solution at
+        # once, with different inputs for each sub-solution
+        t = pybamm.t
+        var = pybamm.Variable("var", domain=["negative electrode", "separator"])
+        x = pybamm.SpatialVariable("x", domain=["negative electrode", "separator"])
+        a = pybamm.InputParameter("a")
+        eqn = t * var + a * x
+
+        disc = tests.get_discretisation_for_testing()
+        disc.set_variable_slices([var])
+        x_sol = disc.process_symbol(x).entries[:, 0]
+        eqn_sol = disc.process_symbol(eqn)
+        all_ts = [np.linspace(0, 1), np.linspace(1, 2)[1:], np.array([3])]
+        all_ys = [np.ones_like(x_sol)[:, np.newaxis] * ts for ts in all_ts]
+        all_inputs = [{"a": np.array([i])} for i in range(3)]
+        solution = pybamm.Solution(
+            all_ts, all_ys, [pybamm.BaseModel()] * 3, all_inputs
+        )
+
+        eqn_casadi = to_casadi(eqn_sol, all_ys[0], inputs=all_inputs[0])
+        expected = np.hstack(
+            [
+                ts * ys + inputs["a"] * x_sol[:, np.newaxis]
+                for ts, ys, inputs in zip(all_ts, all_ys, all_inputs)
+            ]
+        )
+        for processing_threads in [1, 2]:
+            pybamm.settings.processing_threads = processing_threads
+            processed_eqn = pybamm.ProcessedVariable(
+                [eqn_sol] * 3, [eqn_casadi] * 3, solution, warn=False
+            )
+            np.testing.assert_array_almost_equal(processed_eqn.entries, expected)
+        pybamm.settings.processing_threads = 1
+
     def test_processed_variable_1D_unknown_domain(self):
         x = pybamm.SpatialVariable("x", domain="SEI layer", coord_sys="cartesian")
         geometry = pybamm.Geometry(
@@ -3,8 +3,13 @@
 #
 import pybamm
 import unittest
+import importlib.util
+import json
 import numpy as np
+import os
 import pandas as pd
+import pickle
+import tempfile
 from scipy.io import loadmat
 from tests import get_discretisation_for_testing
 
@@ -155,6 +160,33 @@ class TestSolution(unittest.TestCase):
         self.assertEqual(sol_last_state.solve_time, 0)
         self.assertEqual(sol_last_state.integration_time, 0)
 
+    def test_get_window(self):
+        t1 = [np.linspace(0, 1), np.linspace(1, 2, 5)[1:]]
+        y1 = [np.tile(t1[0], (20, 1)), np.tile(t1[1], (20, 1))]
+        model = pybamm.BaseModel()
+        sol1 = pybamm.Solution(t1, y1, [model, model], [{"a": 1}, {"a": 2}])
+        sol1.set_up_time = 0.5
+        sol1.solve_time = 1.5
+        sol1.integration_time = 0.3
+
+        window = sol1.get_window(0.5, 1.5)
+        t = sol1.t[(sol1.t >= 0.5) & (sol1.t <= 1.5)]
+        np.testing.assert_array_equal(window.t, t)
+        np.testing.assert_array_equal(window.y, np.tile(t, (20, 1)))
+        self.assertEqual(window.all_inputs, sol1.all_inputs)
+        self.assertEqual(window.solve_time, 1.5)
+
+        # windows that only overlap one sub-solution
+        window = sol1.get_window(t_end=0.5)
+        self.assertEqual(len(window.all_ts), 1)
+        self.assertEqual(window.all_inputs, sol1.all_inputs[:1])
+        window = sol1.get_window(t_start=1.6)
+        np.testing.assert_array_equal(window.t, [1.75, 2])
+        self.assertEqual(window.all_inputs, sol1.all_inputs[1:])
+
+        with self.assertRaisesRegex(ValueError, "no time points"):
+            sol1.get_window(3, 4)
+
     def test_cycles(self):
         model = pybamm.lithium_ion.SPM()
         experiment = pybamm.Experiment(
@@ -206,6 +238,27 @@ class TestSolution(unittest.TestCase):
         np.testing.assert_array_equal(twoc_sol.entries, twoc_sol(solution.t))
         np.testing.assert_array_equal(twoc_sol.entries, 2 * c_sol.entries)
 
+    def test_evaluate_variables(self):
+        solution = self.step_spme()
+        names = ["Terminal voltage [V]", "Electrolyte concentration [mol.m-3]"]
+        variables = solution.evaluate_variables(names)
+        self.assertEqual(list(variables.keys()), names)
+        np.testing.assert_array_almost_equal(
+            variables["Terminal voltage [V]"], solution["Terminal voltage [V]"].data
+        )
+        np.testing.assert_array_almost_equal(
+            variables["Electrolyte concentration [mol.m-3]"],
+            solution["Electrolyte concentration [mol.m-3]"].data,
+        )
+
+        # the stacked function is cached with the model
+        model = solution.all_models[0]
+        func = model.get_stacked_variables_casadi(names, solution.y.shape[0], {})
+        self.assertIs(
+            model.get_stacked_variables_casadi(names, solution.y.shape[0], {}), func
+        )
+        self.assertEqual(func.n_out(), 2)
+
     def test_plot(self):
         model = pybamm.BaseModel()
         c = pybamm.Variable("c")
@@ -284,6 +337,163 @@ class TestSolution(unittest.TestCase):
         np.testing.assert_array_equal(solution["c"].entries, solution_load["c"].entries)
         np.testing.assert_array_equal(solution["d"].entries, solution_load["d"].entries)
 
+    def step_spme(self):
+        model = pybamm.lithium_ion.SPMe()
+        var = pybamm.standard_spatial_vars
+        var_pts = {var.x_n: 5, var.x_s: 5, var.x_p: 5, var.r_n: 4, var.r_p: 4}
+        sim = pybamm.Simulation(model, var_pts=var_pts)
+        sim.step(1000, npts=20)
+        return sim.step(1000, npts=20)
+
+    @unittest.skipIf(importlib.util.find_spec("h5py") is None, "h5py not installed")
+    def test_save_data_hdf5(self):
+        import h5py
+
+        solution = self.step_spme()
+        names = [
+            "Terminal voltage [V]",
+            "Electrolyte concentration [mol.m-3]",
+            "Negative particle concentration [mol.m-3]",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "test.h5")
+            solution.save_data(
+                filename,
+                names,
+                to_format="hdf5",
+                short_names={"Terminal voltage [V]": "V"},
+                chunk_size=7,
+            )
+            # variables are not stored in the solution
+            self.assertEqual(len(solution.data), 0)
+            with h5py.File(filename, "r") as f:
+                np.testing.assert_array_almost_equal(
+                    f["t"][...], solution.t * solution.timescale_eval
+                )
+                np.testing.assert_array_almost_equal(
+                    f["V"][...], solution["Terminal voltage [V]"].entries
+                )
+                self.assertEqual(list(f["V"].attrs["dimensions"]), ["t"])
+                self.assertEqual(f["V"].attrs["name"], "Terminal voltage [V]")
+                for name in names[1:]:
+                    var = solution[name]
+                    np.testing.assert_array_almost_equal(f[name][...], var.entries)
+                    self.assertEqual(
+                        list(f[name].attrs["dimensions"]), list(var.grid.keys())
+                    )
+                    np.testing.assert_array_equal(f[name].attrs["x"], var.grid["x"])
+
+            # variables that have already been processed are saved by default
+            solution.save_data(filename, to_format="hdf5", chunk_size=7)
+            with h5py.File(filename, "r") as f:
+                self.assertEqual(set(f.keys()), set(names + ["t"]))
+                np.testing.assert_array_almost_equal(
+                    f["Terminal voltage [V]"][...],
+                    solution["Terminal voltage [V]"].entries,
+                )
+
+    @unittest.skipIf(
+        importlib.util.find_spec("pyarrow") is None, "pyarrow not installed"
+    )
+    def test_save_data_parquet(self):
+        import pyarrow.parquet as pq
+
+        solution = self.step_spme()
+        names = [
+            "Terminal voltage [V]",
+            "Negative particle concentration [mol.m-3]",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "test.parquet")
+            solution.save_data(filename, names, to_format="parquet", chunk_size=7)
+            self.assertEqual(len(solution.data), 0)
+            self.assertGreater(pq.ParquetFile(filename).num_row_groups, 1)
+            table = pq.read_table(filename)
+            np.testing.assert_array_almost_equal(
+                table.column("t").to_numpy(), solution.t * solution.timescale_eval
+            )
+            np.testing.assert_array_almost_equal(
+                table.column(names[0]).to_numpy(), solution[names[0]].entries
+            )
+            # spatial variables are flattened at each time point
+            var = solution[names[1]]
+            metadata = table.schema.field(names[1]).metadata
+            self.assertEqual(json.loads(metadata[b"dimensions"]), ["r", "x", "t"])
+            shape = json.loads(metadata[b"shape"])
+            self.assertEqual(shape, list(var.entries.shape[:-1]))
+            np.testing.assert_array_almost_equal(
+                json.loads(metadata[b"r"]), var.grid["r"]
+            )
+            entries = np.stack(table.column(names[1]).to_numpy(zero_copy_only=False))
+            np.testing.assert_array_almost_equal(
+                np.moveaxis(entries.reshape([-1] + shape), 0, -1), var.entries
+            )
+
+        with self.assertRaisesRegex(ValueError, "Solution does not have any data"):
+            pybamm.Solution(
+                np.array([0]), np.array([[1]]), pybamm.BaseModel(), {}
+            ).save_data("test.h5", to_format="hdf5")
+
+    def test_save_compact(self):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C for 10 minutes", "Rest for 5 minutes")] * 2
+        )
+        sim = pybamm.Simulation(pybamm.lithium_ion.SPM(), experiment=experiment)
+        solution = sim.solve()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = os.path.join(tmp_dir, "solution")
+            solution.save(directory, to_format="compact")
+            # each model is only stored once (the discharge and rest steps share the
+            # same current-controlled model)
+            with open(os.path.join(directory, "solution.pkl"), "rb") as f:
+                self.assertEqual(len(pickle.load(f)["models"]), 1)
+
+            solution_load = pybamm.load(directory)
+            self.assertIsInstance(solution_load.all_ys[0], np.memmap)
+            self.assertEqual(len(solution_load.all_ts), len(solution.all_ts))
+            np.testing.assert_array_equal(solution_load.t, solution.t)
+            self.assertEqual(solution_load.termination, solution.termination)
+            for name in ["Terminal voltage [V]", "Electrolyte concentration"]:
+                np.testing.assert_array_almost_equal(
+                    solution_load[name].entries, solution[name].entries
+                )
+
+            # cycles, steps and summary variables
+            self.assertEqual(len(solution_load.cycles), 2)
+            for cycle_load, cycle in zip(solution_load.cycles, solution.cycles):
+                np.testing.assert_array_equal(cycle_load.t, cycle.t)
+                for step_load, step in zip(cycle_load.steps, cycle.steps):
+                    np.testing.assert_array_equal(step_load.t, step.t)
+                    np.testing.assert_array_almost_equal(
+                        step_load["Terminal voltage [V]"].entries,
+                        step["Terminal voltage [V]"].entries,
+                    )
+            np.testing.assert_array_equal(
+                solution_load.summary_variables["Capacity [A.h]"],
+                solution.summary_variables["Capacity [A.h]"],
+            )
+
+            # the cycles and steps are matched with the sub-solutions when the arrays
+            # have been copied, e.g. for solutions loaded from disk
+            filename = os.path.join(tmp_dir, "solution.pickle")
+            solution.save(filename)
+            for solution_copy in [pybamm.load(filename), solution_load]:
+                directory_copy = os.path.join(tmp_dir, "solution_copy")
+                solution_copy.save(directory_copy, to_format="compact")
+                with open(os.path.join(directory_copy, "solution.pkl"), "rb") as f:
+                    cycles = pickle.load(f)["cycles"]
+                self.assertEqual(len(cycles), 2)
+                # steps after the first one start with a point that was skipped in
+                # the full solution
+                self.assertEqual(cycles[0]["steps"][0][0], ("ref", 0))
+                self.assertEqual(cycles[0]["steps"][1][0][0], "point")
+                self.assertEqual(cycles[0]["steps"][1][1][0], "ref")
+                cycle_load = pybamm.load(directory_copy).cycles[1]
+                np.testing.assert_array_equal(cycle_load.t, solution.cycles[1].t)
+
+        with self.assertRaisesRegex(ValueError, "format 'wrong' not recognised"):
+            solution.save("test.pickle", to_format="wrong")
+
     def test_solution_evals_with_inputs(self):
         model = pybamm.lithium_ion.SPM()
         geometry = model.default_geometry
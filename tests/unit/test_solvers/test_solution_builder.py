@@ -0,0 +1,172 @@
+#
+# Tests for the SolutionBuilder class
+#
+import pybamm
+import numpy as np
+import pickle
+import unittest
+
+
+def get_solution(t, termination="final time"):
+    y = np.tile(t, (3, 1))
+    solution = pybamm.Solution(
+        t, y, pybamm.BaseModel(), {"a": t[0]}, termination=termination
+    )
+    solution.solve_time = 0
+    solution.integration_time = 0
+    return solution
+
+
+class TestSolutionBuilder(unittest.TestCase):
+    def test_append(self):
+        solutions = [
+            get_solution(np.linspace(0, 1)),
+            # repeated first time point is skipped
+            get_solution(np.linspace(1, 2, 11)),
+            get_solution(np.linspace(2.5, 3, 6)),
+            # single repeated time point only updates the termination
+            get_solution(np.array([3.0]), termination="event"),
+        ]
+        for i, solution in enumerate(solutions):
+            solution.solve_time = i + 1
+            solution.integration_time = 2 * (i + 1)
+
+        builder = pybamm.SolutionBuilder()
+        self.assertIsNone(builder.build())
+        expected = None
+        for solution in solutions:
+            builder.append(solution)
+            expected = expected + solution
+            built = builder.build()
+            self.assertEqual(len(builder), len(expected.all_ts))
+            np.testing.assert_array_equal(built.t, expected.t)
+            np.testing.assert_array_equal(built.y, expected.y)
+            self.assertEqual(built.all_models, expected.all_models)
+            self.assertEqual(built.all_inputs, expected.all_inputs)
+            self.assertEqual(len(built.sub_solutions), len(expected.sub_solutions))
+            self.assertEqual(built.termination, expected.termination)
+            self.assertEqual(built.solve_time, expected.solve_time)
+            self.assertEqual(built.integration_time, expected.integration_time)
+        self.assertEqual(built.termination, "event")
+
+        # the solution is cached until the next append
+        self.assertIs(builder.build(), built)
+
+        # solutions that have been built are not changed by later appends
+        builder.append(get_solution(np.linspace(3, 4)))
+        self.assertIsNot(builder.build(), built)
+        self.assertEqual(built.t[-1], 3)
+        self.assertEqual(len(built.all_ts), 3)
+        np.testing.assert_array_equal(
+            builder.build().t, (built + get_solution(np.linspace(3, 4))).t
+        )
+
+        with self.assertRaisesRegex(pybamm.SolverError, "Only a Solution"):
+            builder.append(1)
+
+    def test_t(self):
+        builder = pybamm.SolutionBuilder(get_solution(np.linspace(0, 1)))
+        for i in range(1, 20):
+            builder.append(get_solution(np.linspace(i, i + 1)))
+            # the time vector is not recomputed by the solution
+            t = builder.build().__dict__["_t"]
+            self.assertFalse(t.flags.writeable)
+            np.testing.assert_array_equal(t, np.concatenate(builder.all_ts))
+
+        # times that are not increasing are left to the solution to check
+        builder.append(get_solution(np.linspace(0, 1)))
+        solution = builder.build()
+        self.assertNotIn("_t", solution.__dict__)
+        with self.assertRaisesRegex(ValueError, "Solution time vector"):
+            solution.t
+
+    def test_from_solution(self):
+        builder = pybamm.SolutionBuilder(get_solution(np.linspace(0, 1)))
+        solution = builder.build()
+        self.assertIs(pybamm.SolutionBuilder.from_solution(solution), builder)
+
+        # solutions that are not the latest built solution get a new builder
+        builder.append(get_solution(np.linspace(1, 2)))
+        new_builder = pybamm.SolutionBuilder.from_solution(solution)
+        self.assertIsNot(new_builder, builder)
+        self.assertEqual(len(new_builder), 1)
+        self.assertIsNot(
+            pybamm.SolutionBuilder.from_solution(get_solution(np.linspace(0, 1))),
+            builder,
+        )
+
+        # built solutions can be pickled, without the builder
+        solution = pickle.loads(pickle.dumps(builder.build()))
+        np.testing.assert_array_equal(solution.t, builder.build().t)
+        self.assertNotIn("_builder", solution.__dict__)
+        self.assertIsInstance(solution.all_ts, list)
+        self.assertEqual(len(solution.all_ts), 2)
+
+    def test_views(self):
+        builder = pybamm.SolutionBuilder(get_solution(np.linspace(0, 1)))
+        builder.append(get_solution(np.linspace(2, 3)))
+        solution = builder.build()
+        builder.append(get_solution(np.linspace(4, 5)))
+
+        # the lists of the solution are not copied from the builder
+        all_ts = solution.all_ts
+        self.assertIs(all_ts._items, builder.all_ts)
+        self.assertEqual(len(all_ts), 2)
+        self.assertEqual(list(all_ts), builder.all_ts[:2])
+        self.assertIs(all_ts[-1], builder.all_ts[1])
+        self.assertEqual(all_ts[1:], builder.all_ts[1:2])
+        with self.assertRaises(IndexError):
+            all_ts[2]
+        self.assertEqual(all_ts + [1], builder.all_ts[:2] + [1])
+        self.assertEqual([1] + all_ts, [1] + builder.all_ts[:2])
+
+        # replacing an item does not change the builder
+        ys = builder.all_ys[0]
+        solution.all_ys[0] = 2 * ys
+        self.assertIs(builder.all_ys[0], ys)
+        np.testing.assert_array_equal(solution.all_ys[0], 2 * ys)
+
+    def test_step(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -var}
+        model.initial_conditions = {var: 1}
+        model.variables = {"var": var}
+        solver = pybamm.CasadiSolver()
+
+        solution = None
+        expected = None
+        for _ in range(5):
+            step_solution = solver.step(solution, model, 1, npts=5, save=False)
+            expected = expected + step_solution
+            solution = solver.step(solution, model, 1, npts=5)
+        np.testing.assert_array_almost_equal(solution.t, expected.t)
+        np.testing.assert_array_almost_equal(
+            solution["var"].entries, np.exp(-solution.t), decimal=4
+        )
+        builder = pybamm.SolutionBuilder.from_solution(solution)
+        self.assertIs(builder.build(), solution)
+
+    def test_experiment(self):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C for 5 minutes", "Rest for 5 minutes")] * 3
+        )
+        sim = pybamm.Simulation(pybamm.lithium_ion.SPM(), experiment=experiment)
+        solution = sim.solve()
+        self.assertEqual(len(solution.cycles), 3)
+        expected = None
+        for cycle in solution.cycles:
+            expected = expected + cycle
+        np.testing.assert_array_equal(solution.t, expected.t)
+        np.testing.assert_array_equal(solution.y, expected.y)
+        self.assertEqual(len(solution.all_ts), len(expected.all_ts))
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,132 @@
+#
+# Tests for the SolutionStore class
+#
+import pybamm
+import numpy as np
+import os
+import pickle
+import tempfile
+import unittest
+
+
+class TestSolutionStore(unittest.TestCase):
+    def test_write(self):
+        t = [np.linspace(0, 1), np.linspace(1, 2, 5)[1:]]
+        y = [np.tile(t[0], (20, 1)), np.tile(t[1], (20, 1))]
+        solution = pybamm.Solution(t, y, pybamm.BaseModel(), [{"a": 1}, {"a": 2}])
+        y_full = solution.y
+        self.assertIsNotNone(solution.last_state)
+
+        store = pybamm.SolutionStore()
+        self.assertTrue(os.path.isdir(store.directory))
+        self.assertIs(store.write(solution), solution)
+        self.assertEqual(len(os.listdir(store.directory)), 1)
+        self.assertGreater(store.size, 0)
+        for ys, ys_original in zip(solution.all_ys, y):
+            self.assertIsInstance(ys, np.memmap)
+            np.testing.assert_array_equal(ys, ys_original)
+        # cached states are removed, and recomputed from the stored states
+        self.assertNotIn("_y", solution.__dict__)
+        self.assertNotIn("_last_state", solution.__dict__)
+        np.testing.assert_array_equal(solution.y, y_full)
+        np.testing.assert_array_equal(solution.last_state.all_ys[0], 2)
+
+        # states that have already been written are not written again
+        store.write(solution)
+        self.assertEqual(len(os.listdir(store.directory)), 1)
+
+        # the temporary directory is removed with the store
+        directory = store.directory
+        del store
+        self.assertFalse(os.path.exists(directory))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            directory = os.path.join(tmpdir, "store")
+            store = pybamm.SolutionStore(directory)
+            solution = pybamm.Solution(
+                np.linspace(0, 1), np.ones((3, 50)), pybamm.BaseModel(), {}
+            )
+            store.write(solution)
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            # copies of the store do not remove the files when deleted
+            store_copy = pickle.loads(pickle.dumps(store))
+            del store_copy
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            # the directory is kept when the store is deleted, but clear removes
+            # the files
+            del store
+            self.assertEqual(len(os.listdir(directory)), 1)
+            store = pybamm.SolutionStore(directory)
+            store.write(pybamm.Solution(0, np.ones((3, 1)), pybamm.BaseModel(), {}))
+            store.clear()
+            self.assertEqual(len(os.listdir(directory)), 1)
+            self.assertTrue(os.path.isdir(directory))
+
+    def test_simulation(self):
+        model = pybamm.lithium_ion.SPM()
+        experiment = pybamm.Experiment(
+            [
+                ("Discharge at C/20 for 0.5 hours", "Charge at C/20 for 15 minutes"),
+                ("Discharge at C/20 for 0.5 hours", "Charge at C/20 for 15 minutes"),
+            ]
+        )
+        sim = pybamm.Simulation(model, experiment=experiment)
+        solution = sim.solve()
+
+        store = pybamm.SolutionStore()
+        sim_store = pybamm.Simulation(model, experiment=experiment)
+        solution_store = sim_store.solve(solution_store=store)
+        # one file per step
+        self.assertEqual(len(os.listdir(store.directory)), 4)
+        for sol in [solution_store] + solution_store.cycles:
+            for ys in sol.all_ys:
+                self.assertIsInstance(ys, np.memmap)
+        np.testing.assert_array_almost_equal(
+            solution_store["Terminal voltage [V]"].entries,
+            solution["Terminal voltage [V]"].entries,
+        )
+        np.testing.assert_array_almost_equal(
+            solution_store.cycles[1]["Terminal voltage [V]"].entries,
+            solution.cycles[1]["Terminal voltage [V]"].entries,
+        )
+        np.testing.assert_array_almost_equal(
+            solution_store.summary_variables["Capacity [A.h]"],
+            solution.summary_variables["Capacity [A.h]"],
+        )
+
+        # only read a window of the solution
+        window = solution_store.get_window(1800, 3600)
+        voltage = solution["Terminal voltage [V]"]
+        np.testing.assert_array_almost_equal(
+            window["Terminal voltage [V]"].entries,
+            voltage(window.t * window.timescale_eval),
+        )
+
+        # the solutions keep the store alive
+        for sol in [solution_store, window] + solution_store.cycles:
+            self.assertIs(sol._store, store)
+
+        # without an experiment
+        sim = pybamm.Simulation(model)
+        solution = sim.solve([0, 3600], solution_store=True)
+        self.assertIsInstance(solution.all_ys[0], np.memmap)
+        # the temporary store is not deleted while the solution is in use
+        self.assertIsInstance(solution._store, pybamm.SolutionStore)
+        self.assertTrue(os.path.isdir(solution._store.directory))
+        np.testing.assert_array_almost_equal(
+            solution["Terminal voltage [V]"].entries,
+            sim.solve([0, 3600])["Terminal voltage [V]"].entries,
+        )
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
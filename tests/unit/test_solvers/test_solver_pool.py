@@ -0,0 +1,148 @@
+#
+# Tests for the SolverPool class
+#
+import pybamm
+import numpy as np
+import unittest
+from tests import get_mesh_for_testing
+
+
+def get_exponential_decay_model(convert_to_format="casadi"):
+    model = pybamm.BaseModel()
+    model.convert_to_format = convert_to_format
+    domain = ["negative electrode", "separator", "positive electrode"]
+    var = pybamm.Variable("var", domain=domain)
+    model.rhs = {var: -pybamm.InputParameter("rate") * var}
+    model.initial_conditions = {var: 1}
+    model.variables = {"var": var}
+    mesh = get_mesh_for_testing()
+    spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+    disc = pybamm.Discretisation(mesh, spatial_methods)
+    disc.process_model(model)
+    return model
+
+
+class TestSolverPool(unittest.TestCase):
+    def test_init(self):
+        pool = pybamm.SolverPool(nproc=2, chunksize=3)
+        self.assertEqual(pool.nproc, 2)
+        self.assertEqual(pool.chunksize, 3)
+        self.assertFalse(pool.is_running)
+        with self.assertRaisesRegex(ValueError, "chunksize"):
+            pybamm.SolverPool(chunksize=0)
+
+    def test_solve_multiple_inputs(self):
+        t_eval = np.linspace(0, 10, 100)
+        inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(8)]
+        with pybamm.SolverPool(nproc=2, chunksize=3) as pool:
+            self.assertTrue(pool.is_running)
+            for convert_to_format in ["python", "casadi"]:
+                model = get_exponential_decay_model(convert_to_format)
+                solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
+                # solve twice to check that the pool can be reused
+                for _ in range(2):
+                    solutions = solver.solve(
+                        model, t_eval, inputs=inputs_list, pool=pool
+                    )
+                    for i, solution in enumerate(solutions):
+                        with self.subTest(fmt=convert_to_format, i=i):
+                            self.assertEqual(solution.all_models, [model])
+                            np.testing.assert_array_equal(solution.t, t_eval)
+                            np.testing.assert_allclose(
+                                solution["var"].data[0],
+                                np.exp(-0.01 * (i + 1) * solution.t),
+                                rtol=1e-6,
+                            )
+        self.assertFalse(pool.is_running)
+
+    def test_model_is_sent_once(self):
+        model = get_exponential_decay_model()
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        t_eval = np.linspace(0, 10, 10)
+        inputs_list = [{"rate": 0.1 * (i + 1)} for i in range(4)]
+        with pybamm.SolverPool(nproc=2) as pool:
+            pool.map(solver, model, t_eval, inputs_list)
+            tokens = [worker.tokens.copy() for worker in pool._workers]
+            self.assertEqual(len(pool._resident), 1)
+            pool.map(solver, model, t_eval, inputs_list)
+            self.assertEqual([worker.tokens for worker in pool._workers], tokens)
+
+            # changing the model equations sends the model again
+            model.concatenated_rhs = -model.concatenated_rhs
+            solutions = pool.map(solver, model, t_eval, inputs_list)
+            self.assertNotEqual([worker.tokens for worker in pool._workers], tokens)
+            np.testing.assert_allclose(
+                solutions[0].y[0], np.exp(0.1 * solutions[0].t), rtol=1e-5
+            )
+
+            # clear
+            pool.clear(model)
+            self.assertEqual(pool._resident, {})
+            self.assertEqual([worker.tokens for worker in pool._workers], [set()] * 2)
+
+    def test_imap(self):
+        model = get_exponential_decay_model()
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        t_eval = np.linspace(0, 10, 10)
+        inputs_list = [{"rate": 0.1 * (i + 1)} for i in range(5)]
+        with pybamm.SolverPool(nproc=2) as pool:
+            results = dict(pool.imap(solver, model, t_eval, inputs_list))
+            self.assertEqual(sorted(results.keys()), list(range(5)))
+            for i, solution in results.items():
+                np.testing.assert_allclose(
+                    solution.y[0], np.exp(-0.1 * (i + 1) * solution.t), rtol=1e-5
+                )
+
+            # closing the generator early does not leave results behind
+            generator = pool.imap(solver, model, t_eval, inputs_list)
+            next(generator)
+            generator.close()
+            solutions = pool.map(solver, model, t_eval, inputs_list)
+            self.assertEqual(len(solutions), 5)
+
+    def test_errors_are_raised(self):
+        model = get_exponential_decay_model()
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        t_eval = np.linspace(0, 10, 10)
+        inputs_list = [{"rate": 0.1}, {"wrong input": 0.1}, {"rate": 0.2}]
+        with pybamm.SolverPool(nproc=2) as pool:
+            with self.assertRaisesRegex(pybamm.SolverError, "symbolic inputs"):
+                pool.map(solver, model, t_eval, inputs_list)
+            # pool can still be used after an error
+            solutions = pool.map(solver, model, t_eval, inputs_list[::2])
+            self.assertEqual(len(solutions), 2)
+
+    def test_simulation_and_batch_study(self):
+        model = pybamm.lithium_ion.SPM()
+        param = model.default_parameter_values
+        param["Current function [A]"] = "[input]"
+        inputs_list = [{"Current function [A]": I} for I in [0.5, 1]]
+        with pybamm.SolverPool(nproc=2) as pool:
+            sim = pybamm.Simulation(model, parameter_values=param)
+            solutions = sim.solve([0, 600], inputs=inputs_list, pool=pool)
+            self.assertEqual(len(solutions), 2)
+            for solution, inputs in zip(solutions, inputs_list):
+                np.testing.assert_allclose(
+                    solution["Current [A]"].data, inputs["Current function [A]"]
+                )
+
+            batch_study = pybamm.BatchStudy(
+                models={"SPM": model}, parameter_values={"param": param}
+            )
+            batch_study.solve([0, 600], inputs=inputs_list, pool=pool)
+            self.assertEqual(len(batch_study.sims[0].solution), 2)
+
+            experiment = pybamm.Experiment(["Discharge at 1C for 1 minute"])
+            sim = pybamm.Simulation(model, experiment=experiment)
+            with self.assertRaisesRegex(ValueError, "pool"):
+                sim.solve(pool=pool)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -51,6 +51,43 @@ class TestFiniteVolume(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "method"):
             fin_vol.shift(c, "shift key", "bad method")
 
+    def test_operator_matrices_cached_in_mesh(self):
+        mesh = get_mesh_for_testing()
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        fin_vol = pybamm.FiniteVolume()
+        fin_vol.build(mesh)
+        grad = fin_vol.gradient_matrix(whole_cell, {})
+        div = fin_vol.divergence_matrix({"primary": whole_cell})
+        self.assertIs(fin_vol.gradient_matrix(whole_cell, {}), grad)
+        self.assertIsNot(fin_vol.gradient_matrix(["negative electrode"], {}), grad)
+
+        # shared with other spatial methods using the same mesh
+        other_fin_vol = pybamm.FiniteVolume()
+        other_fin_vol.build(mesh)
+        self.assertIs(other_fin_vol.gradient_matrix(whole_cell, {}), grad)
+        self.assertIs(other_fin_vol.divergence_matrix({"primary": whole_cell}), div)
+
+        # but not with other meshes
+        other_fin_vol.build(get_mesh_for_testing())
+        other_grad = other_fin_vol.gradient_matrix(whole_cell, {})
+        self.assertIsNot(other_grad, grad)
+        np.testing.assert_array_equal(
+            other_grad.entries.toarray(), grad.entries.toarray()
+        )
+
+        # arithmetic mean
+        mean = fin_vol.arithmetic_mean_matrix(
+            ["negative electrode"], {"primary": ["negative electrode"]}, "node to edge"
+        )
+        self.assertIs(
+            fin_vol.arithmetic_mean_matrix(
+                ["negative electrode"],
+                {"primary": ["negative electrode"]},
+                "node to edge",
+            ),
+            mean,
+        )
+
     def test_concatenation(self):
         mesh = get_mesh_for_testing()
         fin_vol = pybamm.FiniteVolume()
@@ -3,6 +3,7 @@
 #
 import numpy as np
 import os
+import pickle
 import pybamm
 import tempfile
 import unittest
@@ -99,6 +100,54 @@ class TestUtil(unittest.TestCase):
         with self.assertRaisesRegex(KeyError, "'test3' not found. Best matches are "):
             d["test3"]
 
+    def test_lazy_fuzzy_dict(self):
+        calls = []
+
+        def double(x):
+            calls.append(x)
+            return 2 * x
+
+        d = pybamm.LazyFuzzyDict({"a": 1, "b": 2, "missing": None}, [double])
+        self.assertEqual(len(d), 3)
+        self.assertIn("a", d)
+        self.assertEqual(list(d.keys()), ["a", "b", "missing"])
+        self.assertEqual(calls, [])
+        self.assertFalse(d.is_processed("a"))
+        self.assertTrue(d.is_processed("missing"))
+
+        # values are processed once, when they are first accessed
+        self.assertEqual(d["a"], 2)
+        self.assertEqual(d["a"], 2)
+        self.assertEqual(calls, [1])
+        self.assertTrue(d.is_processed("a"))
+        self.assertEqual(d.processed_values(), [2, None])
+        self.assertEqual(d.unprocessed_values(), [2])
+        self.assertEqual(d.get("b"), 4)
+        self.assertEqual(d.get("c", 5), 5)
+        with self.assertRaisesRegex(KeyError, "'c' not found. Best matches are "):
+            d["c"]
+
+        # processing can be chained without processing any values
+        d = pybamm.LazyFuzzyDict({"a": 1, "b": 2}, [double])
+        d["c"] = 3
+        d["a"]
+        d2 = pybamm.LazyFuzzyDict.from_processed(d, lambda x: x + 1)
+        calls.clear()
+        self.assertEqual(d2.items(), [("a", 3), ("b", 5), ("c", 4)])
+        self.assertEqual(calls, [2])
+        self.assertFalse(d.is_processed("b"))
+
+        # copies, pops and pickles give processed values
+        d = pybamm.LazyFuzzyDict({"a": 1, "b": 2}, [double])
+        d_copy = d.copy()
+        self.assertIsInstance(d_copy, pybamm.LazyFuzzyDict)
+        self.assertEqual(d_copy.values(), [2, 4])
+        self.assertFalse(d.is_processed("a"))
+        self.assertEqual(d.pop("a"), 2)
+        unpickled = pickle.loads(pickle.dumps(d))
+        self.assertEqual(unpickled, {"b": 4})
+        self.assertIsInstance(unpickled, pybamm.FuzzyDict)
+
     def test_get_parameters_filepath(self):
         tempfile_obj = tempfile.NamedTemporaryFile("w", dir=".")
         self.assertTrue(